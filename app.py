@@ -1,11 +1,49 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
-from news_ai_agent import process_and_send
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, abort, send_from_directory
+from emailer import send_email
+from news_ai_agent import (
+    digest_outcome,
+    parse_recipients,
+    parse_region,
+    parse_sections,
+    parse_sources,
+    process_and_send,
+    process_and_send_combined,
+)
+from article_store import search_articles
+from circuit_breaker import breaker_states
+from metrics import DIGEST_REQUESTS, REQUESTS_IN_FLIGHT, render_metrics
+from news_logging import configure_logging, correlation_scope
+from profiling import PROFILE_DIR, list_profiles
+from scheduler import start_scheduler, subscriptions_enabled
+from sent_history import SENT_HISTORY_PATH
+from subscriptions import confirm_url, get_subscriptions, unsubscribe_url
 from dotenv import load_dotenv
+from datetime import datetime, timezone
+import hmac
 import os
 load_dotenv()  # Only needed locally
+configure_logging()
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "fallback_unsafe_dev_key")
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+start_scheduler()
+
+
+def is_admin():
+    # Admin features are disabled entirely unless ADMIN_TOKEN is set
+    token = request.headers.get("X-Admin-Token") or request.values.get("admin_token")
+    return bool(ADMIN_TOKEN and token and hmac.compare_digest(token, ADMIN_TOKEN))
+
+
+@app.before_request
+def track_in_flight():
+    REQUESTS_IN_FLIGHT.inc()
+
+
+@app.teardown_request
+def untrack_in_flight(exc):
+    REQUESTS_IN_FLIGHT.dec()
 
 
 @app.route("/", methods=["GET", "POST"])
@@ -14,15 +52,208 @@ def index():
         try:
             email = request.form.get("email")
             category = request.form.get("category", "general")
-            region = request.form.get("region")
+            region, error = parse_region(request.form.get("region"))
+            if error:
+                flash(error)
+                return redirect(url_for("index"))
             top_n = int(request.form.get("top_n", 10))
             sources = request.form.getlist("sources")
-            status = process_and_send(email, category, region, top_n, sources)
+            profile = bool(request.form.get("profile")) and is_admin()
+            schedule = request.form.get("schedule")
+            if schedule:
+                subscribed, error = subscribe(email, category, region, sources, top_n, schedule)
+                if error:
+                    flash(error)
+                elif any(not subscription["confirmed"] for subscription in subscribed):
+                    flash(f"\u2705 Check your inbox: follow the link we emailed to start your {schedule} digest")
+                else:
+                    flash(f"\u2705 Already subscribed to this {schedule} digest")
+                return redirect(url_for("index"))
+            with correlation_scope(request.headers.get("X-Request-ID")):
+                status = process_and_send(email, category, region, top_n, sources, profile=profile)
+            DIGEST_REQUESTS.inc(outcome=digest_outcome(status))
             flash(status)
         except Exception as e:
+            DIGEST_REQUESTS.inc(outcome="error")
             flash(f"An error occurred: {str(e)}")
         return redirect(url_for("index"))
-    return render_template("index.html")
+    return render_template("index.html", scheduling=subscriptions_enabled(), sent_history=bool(SENT_HISTORY_PATH))
+
+
+@app.route("/digest", methods=["POST"])
+def combined_digest():
+    """
+    One email per recipient covering several sections, from JSON like
+    {"email": "...", "sections": [{"category": "tech", "region": "Global", "sources": [...]}, ...],
+     "top_n": 10, "rank": "section" | "together"}
+    """
+    values = request.get_json(silent=True) or {}
+    try:
+        top_n = int(values.get("top_n", 10))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    selections, error = parse_sections(values.get("sections"))
+    if error:
+        return jsonify({"error": error}), 400
+    try:
+        with correlation_scope(request.headers.get("X-Request-ID")):
+            status = process_and_send_combined(
+                values.get("email"), selections, top_n, rank_together=values.get("rank") == "together"
+            )
+    except Exception as e:
+        DIGEST_REQUESTS.inc(outcome="error")
+        return jsonify({"error": f"An error occurred: {e}"}), 500
+    DIGEST_REQUESTS.inc(outcome=digest_outcome(status))
+    return jsonify({"status": status})
+
+
+def subscribe(emails, category, region, sources, top_n, schedule):
+    """
+    ([{email, id, next_run, confirmed}], None) for every address in emails, or (None,
+    error message). Addresses whose subscription is new or changed are mailed a link to
+    confirm it, and nothing is sent to them on schedule until they do.
+    """
+    if not subscriptions_enabled():
+        return None, "\u274c Subscriptions are not enabled"
+    store = get_subscriptions()
+    email_list, error = parse_recipients(emails)
+    if error:
+        return None, error
+    try:
+        subscribed = [
+            {"email": email, **store.subscribe(email, category, region, sources, top_n, schedule)}
+            for email in email_list
+        ]
+    except ValueError as e:
+        return None, f"\u274c {e}"
+    unsent = []
+    for subscription in subscribed:
+        token, confirm_token = subscription.pop("token"), subscription.pop("confirm_token")
+        subscription["confirmed"] = confirm_token is None
+        if confirm_token is not None and not send_confirmation(subscription["email"], category, region, schedule, token, confirm_token):
+            unsent.append(subscription["email"])
+    if unsent:
+        return None, f"\u274c Could not send the confirmation email to: {', '.join(unsent)}"
+    return subscribed, None
+
+
+def send_confirmation(email, category, region, schedule, token, confirm_token):
+    digest = f"{schedule} {region} {category.replace('_', ' ')} news digest"
+    body = (
+        f"Someone asked for {email} to get a {digest}.\n\n"
+        f"To start it, confirm here:\n{confirm_url(confirm_token)}\n\n"
+        "If that wasn't you, ignore this email and nothing will be sent.\n"
+        f"To unsubscribe at any time: {unsubscribe_url(token)}"
+    )
+    return send_email(email, f"Confirm your {digest}", body, unsubscribe_url=unsubscribe_url(token))
+
+
+@app.route("/subscriptions", methods=["GET", "POST"])
+def subscriptions():
+    if request.method == "GET":
+        if not is_admin():
+            abort(404)
+        store = get_subscriptions()
+        return jsonify(store.subscriptions(request.args.get("email")) if store is not None else [])
+    values = request.get_json(silent=True) or request.form
+    sources = values.get("sources") if request.is_json else request.form.getlist("sources")
+    try:
+        top_n = int(values.get("top_n", 10))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    category, schedule = values.get("category", "general"), values.get("schedule", "daily")
+    if not isinstance(category, str):
+        return jsonify({"error": "\u274c Please choose a category"}), 400
+    if not isinstance(schedule, str):
+        return jsonify({"error": "\u274c Please choose a schedule"}), 400
+    region, error = parse_region(values.get("region"))
+    if not error:
+        sources, error = parse_sources(sources)
+    if error:
+        return jsonify({"error": error}), 400
+    subscribed, error = subscribe(values.get("email"), category, region, sources or [], top_n, schedule)
+    if error:
+        return jsonify({"error": error}), 400 if subscriptions_enabled() else 503
+    return jsonify(subscribed), 201
+
+
+@app.route("/subscriptions/confirm/<token>")
+def confirm_subscription(token):
+    store = get_subscriptions()
+    if store is None or not store.confirm(token):
+        abort(404)
+    flash("\u2705 Subscription confirmed")
+    return redirect(url_for("index"))
+
+
+@app.route("/unsubscribe/<token>", methods=["GET", "POST"])
+def unsubscribe(token):
+    store = get_subscriptions()
+    if store is None or not store.unsubscribe(token):
+        abort(404)
+    if request.method == "POST":
+        return "", 204
+    flash("\u2705 Unsubscribed")
+    return redirect(url_for("index"))
+
+
+@app.route("/sources/status")
+def sources_status():
+    return jsonify(breaker_states())
+
+
+def parse_time(value):
+    """Epoch seconds or an ISO 8601 date/time (UTC unless it says otherwise); None if absent."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+@app.route("/search")
+def search():
+    try:
+        since = parse_time(request.args.get("since"))
+        until = parse_time(request.args.get("until"))
+        page = int(request.args.get("page", 1))
+        per_page = min(100, int(request.args.get("per_page", 20)))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(search_articles(
+        request.args.get("q", ""),
+        category=request.args.get("category"),
+        region=request.args.get("region"),
+        source=request.args.get("source"),
+        since=since,
+        until=until,
+        page=page,
+        per_page=per_page,
+    ))
+
+
+@app.route("/metrics")
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/admin/profiles")
+def admin_profiles():
+    if not is_admin():
+        abort(404)
+    return jsonify(list_profiles())
+
+
+@app.route("/admin/profiles/<name>")
+def admin_profile(name):
+    if not is_admin():
+        abort(404)
+    return send_from_directory(os.path.abspath(PROFILE_DIR), name, mimetype="text/plain")
 
 
 if __name__ == "__main__":
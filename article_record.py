@@ -0,0 +1,75 @@
+"""
+The article record every scraper produces. A slotted object is a fraction of the
+size of the {"title", "url", "source"} dict it replaces, and being a read-only
+Mapping it still answers article["title"], article.get("source") and dict(article),
+so code written against dicts keeps working.
+
+Source names are interned, so feed-supplied names share one string per outlet the
+way literals already do. The duplicate-detection keys (canonical URL and title key)
+are hashed on first use and cached, so dedupe keeps small ints in its seen-sets and
+never normalizes the same article twice. These are str hashes, randomized per
+process: compare them within one run, never persist them.
+"""
+import sys
+from collections.abc import Mapping
+
+from text_normalization import canonical_url, title_key
+
+_FIELDS = ("title", "url", "source")
+
+
+class Article(Mapping):
+    """
+    title, url and source, plus rarely set extras (a crawl's "categories", a sitemap's
+    "published") kept in one dict that is None for everything else.
+    """
+
+    __slots__ = ("title", "url", "source", "_extra", "_url_hash", "_title_fingerprint")
+
+    def __init__(self, title, url, source=None, **extra):
+        self.title = title
+        self.url = url
+        self.source = sys.intern(source) if source else source
+        self._extra = extra or None
+        self._url_hash = None
+        self._title_fingerprint = None
+
+    @classmethod
+    def of(cls, article):
+        """article itself if it already is one, else an Article with the mapping's fields."""
+        if isinstance(article, cls):
+            return article
+        fields = dict(article)
+        return cls(fields.pop("title", ""), fields.pop("url", ""), fields.pop("source", None), **fields)
+
+    @property
+    def url_hash(self):
+        """Hash of the canonical URL."""
+        if self._url_hash is None:
+            self._url_hash = hash(canonical_url(self.url or ""))
+        return self._url_hash
+
+    @property
+    def title_fingerprint(self):
+        """Hash of the title key; titles without letters or digits all share one."""
+        if self._title_fingerprint is None:
+            self._title_fingerprint = hash(title_key(self.title or ""))
+        return self._title_fingerprint
+
+    def __getitem__(self, key):
+        if key in _FIELDS:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from _FIELDS
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return len(_FIELDS) + (len(self._extra) if self._extra is not None else 0)
+
+    def __repr__(self):
+        return f"Article({dict(self)!r})"
@@ -0,0 +1,798 @@
+"""
+Embedded SQLite store (WAL mode) of every article the scrapers return, so later
+stages can ask for "category X, region Y, last N hours" instead of scraping again.
+
+Scrapers only enqueue: one writer thread applies the queue in batched transactions,
+keeping SQLite off the request path. Readers use a connection per thread, which WAL
+lets run alongside the writer.
+
+Articles are partitioned by when they were first seen, one database file per UTC day
+(2026-10-19.sqlite3). Reads open only the partitions their time window overlaps. Between
+batches the writer folds days older than ARTICLE_STORE_COMPACT_DAYS into one file per ISO
+week (2026-W42.sqlite3), dropping articles the previous week already holds, and enforces
+retention: a category's rows leave a partition once all of it is past that category's
+retention, and a partition past every retention is deleted as a file.
+"""
+import atexit
+import logging
+import math
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import urllib.parse
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+
+try:
+    import fcntl
+except ImportError:  # Windows: maintenance runs unlocked, which is fine for a single process
+    fcntl = None
+
+from metrics import SEARCH_SECONDS, STORE_ARTICLES_WRITTEN, STORE_MAINTENANCE_SECONDS, STORE_PARTITIONS, STORE_WRITE_SECONDS
+from text_normalization import canonical_url
+
+logger = logging.getLogger(__name__)
+
+# Directory of partition files; empty disables the store
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", os.path.join("data", "articles"))
+# Articles per write transaction, and how long the writer waits to fill one
+ARTICLE_STORE_BATCH = int(os.getenv("ARTICLE_STORE_BATCH", "500"))
+ARTICLE_STORE_FLUSH_SECONDS = float(os.getenv("ARTICLE_STORE_FLUSH_SECONDS", "1"))
+# Days of articles kept, and per-category overrides as a comma separated list, e.g. "sports=30,general=14"
+ARTICLE_STORE_RETENTION_DAYS = float(os.getenv("ARTICLE_STORE_RETENTION_DAYS", "90"))
+ARTICLE_STORE_RETENTION = os.getenv("ARTICLE_STORE_RETENTION", "")
+# Daily partitions older than this are merged into weekly ones
+ARTICLE_STORE_COMPACT_DAYS = float(os.getenv("ARTICLE_STORE_COMPACT_DAYS", "7"))
+# How often the writer compacts and applies retention
+ARTICLE_STORE_MAINTENANCE_SECONDS = float(os.getenv("ARTICLE_STORE_MAINTENANCE_SECONDS", "3600"))
+# Matches ranked per search (see ArticleStore.search)
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", "1000"))
+
+# FTS5's bm25() defaults
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_CORPUS_STATS_TTL = 300
+
+_DAY = 86400
+_SUFFIX = ".sqlite3"
+# canonical_url lookups per statement when checking which partition already holds an article
+_LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    canonical_url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    -- search_tags() of every category and region the article was scraped for, indexed
+    -- alongside the title so a filtered search is one index intersection
+    tags TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS articles_source ON articles (source, first_seen);
+CREATE INDEX IF NOT EXISTS articles_first_seen ON articles (first_seen);
+
+-- One row per category and region an article was scraped for
+CREATE TABLE IF NOT EXISTS article_categories (
+    category TEXT NOT NULL,
+    region TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (category, region, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS article_categories_recent ON article_categories (category, region, first_seen);
+CREATE INDEX IF NOT EXISTS article_categories_article ON article_categories (article_id);
+CREATE TRIGGER IF NOT EXISTS article_categories_tag AFTER INSERT ON article_categories BEGIN
+    UPDATE articles SET tags = trim(tags || ' ' || search_tags(new.category, new.region))
+    WHERE id = new.article_id AND instr(' ' || tags || ' ', ' ' || search_tags(new.category, new.region) || ' ') = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS article_categories_untag AFTER DELETE ON article_categories BEGIN
+    UPDATE articles SET tags = coalesce(
+        (SELECT group_concat(search_tags(category, region), ' ') FROM article_categories WHERE article_id = old.article_id), ''
+    )
+    WHERE id = old.article_id;
+END;
+
+-- Inverted index over titles and tags, kept in step with articles by the triggers below.
+-- unicode61 case-folds and strips diacritics, so "Resume" finds "Résumé".
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, tags, content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, tags) VALUES (new.id, new.title, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, tags) VALUES ('delete', old.id, old.title, old.tags);
+END;
+-- Re-scraping an article refreshes last_seen on every run; only a changed title or tags touch the index
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, tags ON articles
+WHEN old.title <> new.title OR old.tags <> new.tags BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, tags) VALUES ('delete', old.id, old.title, old.tags);
+    INSERT INTO articles_fts (rowid, title, tags) VALUES (new.id, new.title, new.tags);
+END;
+-- Documents per indexed term and column, for ranking
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts_vocab USING fts5vocab (articles_fts, 'col');
+"""
+
+# New articles carry their first category's tags; article_categories_tag adds later ones
+_UPSERT_ARTICLE = """
+INSERT INTO articles (canonical_url, url, title, source, first_seen, last_seen, tags)
+VALUES (?, ?, ?, ?, ?, ?, search_tags(?, ?))
+ON CONFLICT (canonical_url) DO UPDATE SET
+    title = excluded.title,
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+_LINK_CATEGORY = """
+INSERT OR IGNORE INTO article_categories (category, region, first_seen, article_id)
+SELECT ?, ?, ?, id FROM articles WHERE canonical_url = ?
+"""
+_RECENT = """
+SELECT a.title, a.url, a.source, c.first_seen
+FROM article_categories c JOIN articles a ON a.id = c.article_id
+WHERE c.category = ? AND c.region = ? AND c.first_seen >= ?
+ORDER BY c.first_seen DESC
+LIMIT ?
+"""
+# Compaction: folds the partition attached as src into this one; the earliest sighting keeps its first_seen.
+# WHERE true keeps SQLite from reading ON CONFLICT as a join constraint.
+_MERGE_ARTICLES = """
+INSERT INTO main.articles (canonical_url, url, title, source, first_seen, last_seen, tags)
+SELECT canonical_url, url, title, source, first_seen, last_seen, tags FROM src.articles WHERE true ORDER BY id
+ON CONFLICT (canonical_url) DO UPDATE SET
+    title = excluded.title,
+    first_seen = min(first_seen, excluded.first_seen),
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+_MERGE_CATEGORIES = """
+INSERT OR IGNORE INTO main.article_categories (category, region, first_seen, article_id)
+SELECT c.category, c.region, c.first_seen, a.id
+FROM src.article_categories c
+JOIN src.articles s ON s.id = c.article_id
+JOIN main.articles a ON a.canonical_url = s.canonical_url
+"""
+# Articles a weekly partition shares with the one before it (attached as prev) keep only the older
+# copy, which takes over their latest sighting and categories
+_FOLD_SIGHTINGS = """
+UPDATE prev.articles SET title = n.title, last_seen = max(prev.articles.last_seen, n.last_seen)
+FROM main.articles n WHERE n.canonical_url = prev.articles.canonical_url
+"""
+_FOLD_CATEGORIES = """
+INSERT OR IGNORE INTO prev.article_categories (category, region, first_seen, article_id)
+SELECT c.category, c.region, c.first_seen, p.id
+FROM main.article_categories c
+JOIN main.articles n ON n.id = c.article_id
+JOIN prev.articles p ON p.canonical_url = n.canonical_url
+"""
+_FOLD_DELETE = "DELETE FROM main.articles WHERE canonical_url IN (SELECT canonical_url FROM prev.articles)"
+# Retention
+_EXPIRE_CATEGORY = "DELETE FROM article_categories WHERE category = ?"
+_DELETE_ORPHANS = "DELETE FROM articles WHERE id NOT IN (SELECT article_id FROM article_categories)"
+
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_QUERY_TERM_RE = re.compile(r"([^\W_]+)(\*?)")
+
+
+def _fold(text):
+    text = text.lower()
+    if text.isascii():
+        return text
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+
+
+def search_tokens(text):
+    """Words of text as the unicode61 tokenizer indexes them: lower-cased, diacritics removed."""
+    return _WORD_RE.findall(_fold(text))
+
+
+def query_terms(text):
+    """
+    [(word, is_prefix)] from user search text: every word must appear, a trailing *
+    matches word prefixes, and nothing else is treated as FTS5 syntax.
+    """
+    return [(word, star == "*") for word, star in _QUERY_TERM_RE.findall(_fold(text or ""))]
+
+
+def _tag(value):
+    return "".join(ch for ch in _fold(value or "") if ch.isalnum())
+
+
+def search_tags(category, region):
+    """
+    The index tokens one (category, region) link gives an article: one each for the
+    category, the region and the pair. Letters and digits only, so each stays one token.
+    """
+    category, region = _tag(category), _tag(region)
+    return f"c{category} r{region} p{category}0{region}"
+
+
+def _tags_filter(category, region):
+    """FTS5 condition on the tags column for a search's category/region filter."""
+    if category and region:
+        token = f"p{_tag(category)}0{_tag(region)}"
+    else:
+        token = f"c{_tag(category)}" if category else f"r{_tag(region)}"
+    return f'tags : "{token}"'
+
+
+def _uri(path, create=False):
+    return f"file:{urllib.parse.quote(os.path.abspath(path))}?mode={'rwc' if create else 'rw'}"
+
+
+def connect(path, create=True):
+    """A connection to path; with create=False a missing file is an error rather than a new empty database."""
+    conn = sqlite3.connect(_uri(path, create), timeout=30, isolation_level=None, check_same_thread=False, uri=True)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps the database consistent on power loss with NORMAL; only the last commits can be lost
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    # The schema's tag triggers call it, so every connection that writes needs it
+    conn.create_function("search_tags", 2, search_tags, deterministic=True)
+    return conn
+
+
+def parse_retention(spec):
+    """{category: days} from "sports=30,general=14"."""
+    retention = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        category, _, days = item.partition("=")
+        retention[category.strip()] = float(days)
+    return retention
+
+
+class Partition:
+    """One database file: the articles first seen in [start, end), epoch seconds."""
+
+    def __init__(self, name, start, end):
+        self.name = name
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Partition({self.name!r})"
+
+    @property
+    def daily(self):
+        return self.end - self.start == _DAY
+
+    @classmethod
+    def parse(cls, name):
+        """The partition a file name (without .sqlite3) stands for: 2026-10-19 or 2026-W42. None otherwise."""
+        for pattern, suffix, days in (("%Y-%m-%d", "", 1), ("%G-W%V-%u", "-1", 7)):
+            try:
+                start = datetime.strptime(name + suffix, pattern).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            return cls(name, start.timestamp(), (start + timedelta(days=days)).timestamp())
+        return None
+
+    @classmethod
+    def day(cls, timestamp):
+        return cls.parse(time.strftime("%Y-%m-%d", time.gmtime(timestamp)))
+
+    @classmethod
+    def week(cls, timestamp):
+        year, week, _ = datetime.fromtimestamp(timestamp, timezone.utc).isocalendar()
+        return cls.parse(f"{year}-W{week:02d}")
+
+
+class ArticleStore:
+    def __init__(
+        self,
+        path,
+        batch_size=ARTICLE_STORE_BATCH,
+        flush_interval=ARTICLE_STORE_FLUSH_SECONDS,
+        retention_days=ARTICLE_STORE_RETENTION_DAYS,
+        retention=None,
+        compact_days=ARTICLE_STORE_COMPACT_DAYS,
+        maintenance_interval=ARTICLE_STORE_MAINTENANCE_SECONDS,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.retention = parse_retention(ARTICLE_STORE_RETENTION) if retention is None else dict(retention)
+        self.compact_days = compact_days
+        self.maintenance_interval = maintenance_interval
+        os.makedirs(path, exist_ok=True)
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        # Owned by whichever thread writes: the writer thread, or a caller using write() directly
+        self._write_connections = {}
+        self._listing = (None, ())
+        self._corpus = None
+
+    def _file(self, partition):
+        return os.path.join(self.path, partition.name + _SUFFIX)
+
+    def partitions(self, since=None, until=None):
+        """Partitions overlapping [since, until), newest first."""
+        stamp = os.stat(self.path).st_mtime_ns
+        listing = self._listing
+        # Directory mtimes are only as fine as the filesystem's clock tick, so a recent one may hide a change
+        if stamp != listing[0] or time.time_ns() - stamp < 2_000_000_000:
+            found = []
+            for entry in os.scandir(self.path):
+                if entry.name.endswith(_SUFFIX) and (partition := Partition.parse(entry.name[:-len(_SUFFIX)])):
+                    found.append(partition)
+            found.sort(key=lambda partition: (partition.start, partition.end), reverse=True)
+            listing = self._listing = (stamp, tuple(found))
+            STORE_PARTITIONS.set(len(found))
+        return [
+            partition for partition in listing[1]
+            if (since is None or partition.end > since) and (until is None or partition.start < until)
+        ]
+
+    def connection(self, partition):
+        """This thread's connection to a partition."""
+        local = self._local
+        listing = self._listing
+        connections = getattr(local, "connections", None)
+        if connections is None:
+            connections = local.connections = {}
+        if getattr(local, "listing", None) is not listing:
+            # Let go of partitions merged or dropped since this thread last looked
+            live = {partition.name for partition in listing[1]}
+            for name in [name for name in connections if name not in live]:
+                connections.pop(name).close()
+            local.listing = listing
+        conn = connections.get(partition.name)
+        if conn is None:
+            conn = connections[partition.name] = connect(self._file(partition), create=False)
+        return conn
+
+    def _rows(self, partition, sql, params=()):
+        try:
+            return self.connection(partition).execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            if os.path.exists(self._file(partition)):
+                raise
+            # Merged or dropped between listing the directory and opening it
+            return []
+
+    def add(self, articles, category, region, seen_at=None):
+        """Queues articles scraped for a category and region; returns immediately."""
+        if not articles:
+            return
+        self._ensure_writer()
+        self._queue.put((list(articles), category, region, seen_at or time.time()))
+
+    def flush(self, timeout=None):
+        """Blocks until everything queued so far is written."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(timeout=10)
+
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="article-store", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _run_writer(self):
+        stopping = False
+        next_maintenance = time.monotonic()
+        while not stopping:
+            if time.monotonic() >= next_maintenance:
+                try:
+                    self.maintain()
+                except Exception as e:
+                    logger.warning("Article store maintenance failed: %s", e)
+                next_maintenance = time.monotonic() + self.maintenance_interval
+            try:
+                item = self._queue.get(timeout=max(0.0, next_maintenance - time.monotonic()))
+            except queue.Empty:
+                continue
+            batch, waiters = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stopping or waiters or sum(len(entry[0]) for entry in batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception as e:
+                    logger.warning("Article store write of %s batches failed: %s", len(batch), e)
+            for waiter in waiters:
+                waiter.set()
+        for conn in self._write_connections.values():
+            conn.close()
+        self._write_connections.clear()
+
+    def _write_connection(self, partition):
+        conn = self._write_connections.get(partition.name)
+        if conn is None:
+            path = self._file(partition)
+            if not os.path.exists(path):
+                # Built under another name so readers never list a partition without its tables
+                building = connect(path + ".new")
+                building.executescript(SCHEMA)
+                building.close()
+                os.replace(path + ".new", path)
+            conn = self._write_connections[partition.name] = connect(path)
+            conn.executescript(SCHEMA)
+        return conn
+
+    def write(self, batch):
+        """
+        Applies [(articles, category, region, seen_at)], one transaction per partition touched.
+        An article goes to the daily partition of its sighting unless a daily partition from the
+        last compact_days already holds it, so re-scraping a headline doesn't make it new again.
+        """
+        by_day = {}
+        for articles, category, region, seen_at in batch:
+            partition = Partition.day(seen_at)
+            _, entries = by_day.setdefault(partition.name, (partition, []))
+            for article in articles:
+                url, title = article.get("url"), article.get("title")
+                if not url or not title:
+                    continue
+                entries.append((canonical_url(url), url, title, article.get("source") or "", seen_at, category, region))
+        written = 0
+        with STORE_WRITE_SECONDS.time():
+            placed = {}
+            for partition, pending in by_day.values():
+                for older in self.partitions(since=partition.start - self.compact_days * _DAY, until=partition.start):
+                    if not pending:
+                        break
+                    if not older.daily:
+                        continue
+                    known = self._known(older, {entry[0] for entry in pending})
+                    if known:
+                        placed.setdefault(older.name, (older, []))[1].extend(entry for entry in pending if entry[0] in known)
+                        pending = [entry for entry in pending if entry[0] not in known]
+                placed.setdefault(partition.name, (partition, []))[1].extend(pending)
+            for partition, entries in placed.values():
+                if entries:
+                    written += self._apply(partition, entries)
+        STORE_ARTICLES_WRITTEN.inc(written)
+        return written
+
+    def _known(self, partition, keys):
+        """The canonical URLs among keys that partition already holds."""
+        conn = self._write_connection(partition)
+        keys = list(keys)
+        known = set()
+        for offset in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[offset:offset + _LOOKUP_CHUNK]
+            known.update(key for key, in conn.execute(
+                f"SELECT canonical_url FROM articles WHERE canonical_url IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return known
+
+    def _apply(self, partition, entries):
+        conn = self._write_connection(partition)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_UPSERT_ARTICLE, [
+                (key, url, title, source, seen_at, seen_at, category, region)
+                for key, url, title, source, seen_at, category, region in entries
+            ])
+            conn.executemany(_LINK_CATEGORY, [
+                (category, region, seen_at, key) for key, _, _, _, seen_at, category, region in entries
+            ])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(entries)
+
+    def maintain(self, now=None):
+        """
+        Merges daily partitions older than compact_days into weekly ones, then applies retention.
+        Called by the writer between batches; processes sharing the directory take turns.
+        """
+        now = time.time() if now is None else now
+        with self._maintenance_lock() as locked:
+            if not locked:
+                return
+            with STORE_MAINTENANCE_SECONDS.time():
+                self._compact(now)
+                self._expire(now)
+
+    @contextmanager
+    def _maintenance_lock(self):
+        if fcntl is None:
+            yield True
+            return
+        with open(os.path.join(self.path, ".maintenance.lock"), "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            yield True
+
+    @contextmanager
+    def _attached(self, conn, partition, alias):
+        conn.execute(f"ATTACH DATABASE ? AS {alias}", (_uri(self._file(partition)),))
+        try:
+            yield conn
+        finally:
+            conn.execute(f"DETACH DATABASE {alias}")
+
+    def _transaction(self, conn, *statements):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _compact(self, now):
+        cutoff = now - self.compact_days * _DAY
+        cold = [
+            partition for partition in reversed(self.partitions(until=cutoff))
+            if partition.daily and partition.end <= cutoff
+        ]
+        for _, days in groupby(cold, key=lambda partition: Partition.week(partition.start).name):
+            days = list(days)
+            week = Partition.week(days[0].start)
+            conn = self._write_connection(week)
+            for day in days:
+                with self._attached(conn, day, "src"):
+                    self._transaction(conn, (_MERGE_ARTICLES, ()), (_MERGE_CATEGORIES, ()))
+                self._remove(day)
+            previous = next((partition for partition in self.partitions(until=week.start) if not partition.daily), None)
+            if previous is not None:
+                with self._attached(conn, previous, "prev"):
+                    self._transaction(conn, (_FOLD_SIGHTINGS, ()), (_FOLD_CATEGORIES, ()), (_FOLD_DELETE, ()))
+            logger.info("Compacted %s daily partitions into %s", len(days), week.name)
+
+    def _expire(self, now):
+        longest = max([self.retention_days, *self.retention.values()])
+        for partition in self.partitions(until=now):
+            age = now - partition.end
+            if age >= longest * _DAY:
+                self._remove(partition)
+                logger.info("Dropped expired partition %s", partition.name)
+                continue
+            if age <= 0:
+                continue
+            conn = self._write_connection(partition)
+            expired = [
+                category for category, in conn.execute("SELECT DISTINCT category FROM article_categories")
+                if age >= self.retention.get(category, self.retention_days) * _DAY
+            ]
+            if expired:
+                self._transaction(conn, *((_EXPIRE_CATEGORY, (category,)) for category in expired), (_DELETE_ORPHANS, ()))
+                # Hand the freed pages back to the filesystem; partitions this old see no other writes
+                conn.execute("VACUUM")
+                logger.info("Expired %s from partition %s", ", ".join(expired), partition.name)
+
+    def _remove(self, partition):
+        conn = self._write_connections.pop(partition.name, None)
+        if conn is not None:
+            conn.close()
+        path = self._file(partition)
+        for name in (path, path + "-wal", path + "-shm"):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+    def recent(self, category, region, hours=24, limit=None):
+        """Articles first seen for the category and region in the last `hours`, newest first."""
+        since = time.time() - hours * 3600
+        found = []
+        for partition in self.partitions(since=since):
+            found += self._rows(partition, _RECENT, (category, region, since, -1 if limit is None else limit - len(found)))
+            if limit is not None and len(found) >= limit:
+                break
+        found.sort(key=lambda row: row[3], reverse=True)
+        return [
+            {"title": title, "url": url, "source": source, "first_seen": first_seen}
+            for title, url, source, first_seen in found
+        ]
+
+    def search(self, query, category=None, region=None, source=None, since=None, until=None, page=1, per_page=20):
+        """
+        Titles matching every word of query, best BM25 match first, optionally limited to a
+        category/region, a source and a first-seen window (epoch seconds). One page at a time;
+        has_more says whether another page exists.
+
+        Only the SEARCH_CANDIDATES most recent matches that pass the filters are ranked
+        (candidates_capped says when that cut in): scoring every title containing a common
+        word costs hundreds of milliseconds at a million headlines, while walking the newest
+        partitions' indexes newest first and stopping early stays in single digits.
+        """
+        page, per_page = max(1, int(page)), max(1, int(per_page))
+        result = {
+            "query": query, "page": page, "per_page": per_page, "results": [], "has_more": False, "candidates_capped": False,
+        }
+        terms = query_terms(query)
+        if not terms:
+            return result
+        match = "title : (" + " ".join(f'"{term}"*' if prefix else f'"{term}"' for term, prefix in terms) + ")"
+        if category or region:
+            # Intersected inside FTS5 with the title terms, rather than checked row by row after
+            match += " AND " + _tags_filter(category, region)
+        sql = [
+            "SELECT a.title, a.url, a.source, a.first_seen",
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid",
+            "WHERE articles_fts MATCH ?",
+        ]
+        params = [match]
+        if source:
+            sql.append("AND a.source = ?")
+            params.append(source)
+        if since is not None:
+            # Also as a rowid floor the index walk stops at: within a partition ids follow first-seen
+            # order (compaction merges days oldest first), so the first article seen since then has the smallest
+            sql.append(
+                "AND articles_fts.rowid >= coalesce("
+                "(SELECT id FROM articles WHERE first_seen >= ? ORDER BY first_seen LIMIT 1), 1 << 62)"
+            )
+            sql.append("AND a.first_seen >= ?")
+            params += [since, since]
+        if until is not None:
+            sql.append("AND a.first_seen < ?")
+            params.append(until)
+        sql.append("ORDER BY articles_fts.rowid DESC LIMIT ?")
+        sql = "\n".join(sql)
+        with SEARCH_SECONDS.time():
+            rows = []
+            for partition in self.partitions(since=since, until=until):
+                rows += self._rows(partition, sql, params + [SEARCH_CANDIDATES - len(rows)])
+                if len(rows) >= SEARCH_CANDIDATES:
+                    break
+            scores = self._bm25(terms, [title for title, _, _, _ in rows])
+        ranked = sorted(zip(scores, rows), key=lambda pair: (-pair[0], -pair[1][3]))
+        offset = (page - 1) * per_page
+        result["has_more"] = len(ranked) > offset + per_page
+        result["candidates_capped"] = len(rows) == SEARCH_CANDIDATES
+        result["results"] = [
+            {"title": title, "url": url, "source": source, "first_seen": first_seen, "score": round(score, 4)}
+            for score, (title, url, source, first_seen) in ranked[offset:offset + per_page]
+        ]
+        return result
+
+    def _corpus_stats(self):
+        """(documents, average title length in tokens, document frequency cache), refreshed every few minutes."""
+        stats = self._corpus
+        if stats is None or time.monotonic() - stats[0] > _CORPUS_STATS_TTL:
+            partitions = self.partitions()
+            # max(id) rather than count(*): a rowid lookup instead of a full index scan, and idf barely notices
+            documents = sum(
+                count or 0 for partition in partitions for count, in self._rows(partition, "SELECT max(id) FROM articles")
+            )
+            sample = []
+            for partition in partitions:
+                sample += self._rows(partition, "SELECT title FROM articles ORDER BY id DESC LIMIT ?", (5000 - len(sample),))
+                if len(sample) >= 5000:
+                    break
+            average = sum(len(search_tokens(title)) for title, in sample) / len(sample) if sample else 1.0
+            stats = self._corpus = (time.monotonic(), documents, average or 1.0, {})
+        return stats[1:]
+
+    def _document_frequency(self, term, prefix, cache):
+        """Titles containing term (any word starting with it, for a prefix), cached with the corpus stats."""
+        key = (term, prefix)
+        if key not in cache:
+            # Reading the doclist is ~6 ms for a word in a fifth of a million titles, so it's worth keeping
+            if prefix:
+                sql = "SELECT sum(doc) FROM articles_fts_vocab WHERE term >= ? AND term < ? AND col = 'title'"
+                params = (term, term + "\U0010ffff")
+            else:
+                sql, params = "SELECT doc FROM articles_fts_vocab WHERE term = ? AND col = 'title'", (term,)
+            cache[key] = sum(count or 0 for partition in self.partitions() for count, in self._rows(partition, sql, params))
+        return cache[key]
+
+    def _bm25(self, terms, titles):
+        """
+        The score FTS5's bm25() gives each title for terms (k1 1.2, b 0.75), higher is better.
+        A prefix term counts every word it matches; its document frequency sums over them.
+        """
+        if not titles:
+            return []
+        documents, average_length, frequencies = self._corpus_stats()
+        weights = []
+        for term, prefix in terms:
+            frequency = min(documents, self._document_frequency(term, prefix, frequencies))
+            weights.append((term, prefix, max(1e-6, math.log((documents - frequency + 0.5) / (frequency + 0.5)))))
+        scores = []
+        for title in titles:
+            tokens = search_tokens(title)
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * len(tokens) / average_length)
+            score = 0.0
+            for term, prefix, idf in weights:
+                tf = sum(1 for token in tokens if token.startswith(term)) if prefix else tokens.count(term)
+                score += idf * tf * (_BM25_K1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def stats(self):
+        totals = {"articles": 0, "oldest": None, "newest": None}
+        by_category = {}
+        partitions = []
+        for partition in self.partitions():
+            try:
+                size = os.path.getsize(self._file(partition))
+            except FileNotFoundError:
+                continue
+            for articles, oldest, newest in self._rows(
+                partition, "SELECT count(*), min(first_seen), max(first_seen) FROM articles"
+            ):
+                totals["articles"] += articles
+                if oldest is not None:
+                    totals["oldest"] = min(oldest, totals["oldest"] or oldest)
+                    totals["newest"] = max(newest, totals["newest"] or newest)
+                partitions.append({"name": partition.name, "articles": articles, "bytes": size})
+            for category, region, count in self._rows(
+                partition, "SELECT category, region, count(*) FROM article_categories GROUP BY category, region"
+            ):
+                by_category[(category, region)] = by_category.get((category, region), 0) + count
+        return {
+            "path": self.path,
+            **totals,
+            "by_category": [{"category": c, "region": r, "articles": n} for (c, r), n in sorted(by_category.items())],
+            "partitions": partitions,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide store, or None when ARTICLE_STORE_PATH is empty."""
+    global _store
+    if _store is None and ARTICLE_STORE_PATH:
+        with _store_lock:
+            if _store is None:
+                _store = ArticleStore(ARTICLE_STORE_PATH)
+    return _store
+
+
+def store_articles(articles, category, region):
+    try:
+        store = get_store()
+    except (OSError, sqlite3.Error) as e:
+        # Storing is a side effect of scraping; never let it fail a digest
+        logger.warning("Article store unavailable: %s", e, extra={"sample_every": 100})
+        return
+    if store is not None:
+        store.add(articles, category, region)
+
+
+def recent_articles(category, region, hours=24, limit=None):
+    store = get_store()
+    return store.recent(category, region, hours=hours, limit=limit) if store is not None else []
+
+
+def search_articles(query, **filters):
+    store = get_store()
+    if store is None:
+        return {"query": query, "page": 1, "per_page": 0, "results": [], "has_more": False, "candidates_capped": False}
+    return store.search(query, **filters)
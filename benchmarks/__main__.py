@@ -0,0 +1,68 @@
+"""
+Digest pipeline benchmarks, run from the repository root:
+
+    python cassettes.py record                  # once, with network access
+    python -m benchmarks all --iterations 3     # offline: replayed pages, mock ranker, local SMTP sink
+    python -m benchmarks synthetic --sizes 100 1000 10000 --noise 2
+    python -m benchmarks crawl                  # upstream requests per refresh, with and without the crawl
+    python -m benchmarks search --corpus 1000000
+    python -m benchmarks memory --corpus 1000000  # bytes per headline, dict vs Article
+
+Results are written as JSON to benchmarks/results/ (or --output) for comparison across changes.
+"""
+import argparse
+import os
+
+from benchmarks.harness import CATEGORIES, REGIONS, prepare_environment, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Digest pipeline benchmarks")
+    parser.add_argument("suite", nargs="?", default="all", choices=["all", "pipeline", "micro", "synthetic", "crawl", "search", "memory"])
+    parser.add_argument("--cassettes", help="cassette directory to replay (default HTTP_CASSETTE_DIR or ./cassettes)")
+    parser.add_argument("--latency", help='injected replay latency: seconds, "low-high" or "recorded"')
+    parser.add_argument("--categories", nargs="*", default=list(CATEGORIES))
+    parser.add_argument("--regions", nargs="*", default=list(REGIONS))
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--recipients", type=int, default=5)
+    parser.add_argument("--sizes", nargs="*", type=int, default=[100, 1000, 5000], help="synthetic page sizes, in articles")
+    parser.add_argument("--noise", type=float, default=1.0, help="synthetic noise blocks per article")
+    parser.add_argument("--corpus", type=int, default=1_000_000, help="synthetic headlines for the search and memory suites")
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args()
+
+    prepare_environment(cassette_dir=args.cassettes, latency=args.latency)
+    from news_logging import configure_logging
+    configure_logging()
+    from benchmarks.smtp_sink import SmtpSink
+
+    results = {}
+    if args.suite in ("all", "micro"):
+        from benchmarks.micro import run_micro
+        results["micro"] = run_micro(args.cassettes)
+    if args.suite in ("all", "synthetic"):
+        from benchmarks.synthetic_pages import bench_synthetic
+        results["synthetic"] = bench_synthetic(sizes=args.sizes, noise=args.noise)
+    if args.suite in ("all", "crawl"):
+        from benchmarks.crawl import bench_crawl
+        results["crawl"] = bench_crawl(regions=args.regions)
+    if args.suite in ("all", "search"):
+        from benchmarks.search import bench_search
+        results["search"] = bench_search(size=args.corpus)
+    if args.suite in ("all", "memory"):
+        from benchmarks.memory import bench_memory
+        results["memory"] = bench_memory(count=args.corpus)
+    if args.suite in ("all", "pipeline"):
+        from benchmarks.pipeline import run_pipeline
+        with SmtpSink() as sink:
+            os.environ["SMTP_HOST"] = "127.0.0.1"
+            os.environ["SMTP_PORT"] = str(sink.port)
+            results["pipeline"] = run_pipeline(
+                sink, categories=args.categories, regions=args.regions,
+                iterations=args.iterations, recipients=args.recipients,
+            )
+    print(f"Results written to {write_results(results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
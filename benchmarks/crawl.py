@@ -0,0 +1,95 @@
+"""
+Upstream requests for a refresh cycle in which every category and region is
+requested `digests` times: each digest scraping all of its sources, against one
+crawl per region (shared for CRAWL_TTL_SECONDS) plus each digest scraping only
+the sources the crawl does not stand in for.
+"""
+import time
+
+from benchmarks.harness import REGIONS, histogram_delta
+
+
+def _dispatchers():
+    from business_and_finance import scrape_business_finance_news
+    from entertainment import scrape_entertainment_news
+    from environment import scrape_environment_news
+    from health import scrape_health_news
+    from higher_ed import scrape_higher_ed_news
+    from industry import scrape_industry_news
+    from news_sources import scrape_news
+    from sports import scrape_sports_news
+    from technology import scrape_technology_news
+
+    return {
+        "general": lambda region, exclude: scrape_news(region, exclude=exclude)[0],
+        "higher_ed": lambda region, exclude: scrape_higher_ed_news(region=region, exclude=exclude),
+        "entertainment": lambda region, exclude: scrape_entertainment_news(region=region, exclude=exclude),
+        "sports": lambda region, exclude: scrape_sports_news(region=region, exclude=exclude),
+        "business_and_finance": lambda region, exclude: scrape_business_finance_news(region=region, exclude=exclude),
+        "tech": lambda region, exclude: scrape_technology_news(region=region, exclude=exclude),
+        "environment": lambda region, exclude: scrape_environment_news(region=region, exclude=exclude),
+        "industry": lambda region, exclude: scrape_industry_news(region=region, exclude=exclude),
+        "health": lambda region, exclude: scrape_health_news(region=region, exclude=exclude),
+    }
+
+
+def _measure(fn):
+    from metrics import HTTP_REQUEST_SECONDS
+
+    before = HTTP_REQUEST_SECONDS.totals()
+    start = time.perf_counter()
+    articles = fn()
+    seconds = time.perf_counter() - start
+    by_host = {key[0]: count for key, (count, _) in histogram_delta(before, HTTP_REQUEST_SECONDS.totals()).items()}
+    return {
+        "requests": sum(by_host.values()),
+        "seconds": round(seconds, 3),
+        "articles": articles,
+        "requests_by_host": dict(sorted(by_host.items(), key=lambda item: -item[1])),
+    }
+
+
+def bench_crawl(regions=REGIONS, digests=10):
+    import crawl
+
+    dispatchers = _dispatchers()
+
+    def covered(category, region):
+        return tuple(
+            key for key, outlet in crawl.CRAWLED_SOURCES.get(category, {}).items()
+            if crawl.OUTLETS[outlet][1] == region
+        )
+
+    def independent():
+        return sum(len(dispatch(region, ())) for dispatch in dispatchers.values() for region in regions)
+
+    def crawl_pass():
+        articles = 0
+        for region in regions:
+            try:
+                _, pools = crawl._crawl(region)
+            except RuntimeError:
+                continue
+            articles += sum(len(a) for by_outlet in pools.values() for a in by_outlet.values())
+        return articles
+
+    def remaining():
+        return sum(
+            len(dispatch(region, covered(category, region)))
+            for category, dispatch in dispatchers.items() for region in regions
+        )
+
+    results = {"independent": _measure(independent), "crawl": _measure(crawl_pass), "remaining": _measure(remaining)}
+    for name in ("independent", "crawl", "remaining"):
+        result = results[name]
+        print(f"{name:12} {result['requests']:5} requests  {result['seconds']:7.2f}s  {result['articles']:6} articles")
+    before = digests * results["independent"]["requests"]
+    after = results["crawl"]["requests"] + digests * results["remaining"]["requests"]
+    results["cycle"] = {
+        "digests_per_category": digests,
+        "requests_independent": before,
+        "requests_with_crawl": after,
+        "requests_saved": round(1 - after / before, 3) if before else None,
+    }
+    print(f"{digests} digests per category and region: {before} requests -> {after} with the crawl")
+    return results
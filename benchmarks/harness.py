@@ -0,0 +1,106 @@
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+CATEGORIES = (
+    "general", "higher_ed", "entertainment", "sports", "business_and_finance",
+    "tech", "environment", "industry", "health",
+)
+REGIONS = ("India", "Global")
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def prepare_environment(cassette_dir=None, latency=None):
+    """
+    Must run before any project module is imported: most tunables are read from the
+    environment at import time. Pins everything that would otherwise make runs differ.
+    """
+    defaults = {
+        "HTTP_CASSETTE_MODE": "replay",
+        "HTTP_CASSETTE_LATENCY": "0",
+        "RANKING_BACKEND": "mock",
+        # Every iteration should do its own work instead of sharing the previous one's results
+        "SINGLE_FLIGHT_LINGER": "0",
+        # Missing cassettes must not trip breakers and skip sources in later iterations
+        "BREAKER_FAILURE_THRESHOLD": "1000000000",
+        # Recipients repeat across iterations; with history on, later ones would have nothing to send
+        "SENT_HISTORY_PATH": "",
+        "LOG_LEVEL": "ERROR",
+        "EMAIL": "bench@example.com",
+        "PASS": "",
+        "SMTP_SSL": "0",
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+    if cassette_dir:
+        os.environ["HTTP_CASSETTE_DIR"] = cassette_dir
+    if latency is not None:
+        os.environ["HTTP_CASSETTE_LATENCY"] = str(latency)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def bench(fn, number=1, repeat=5):
+    """Seconds per call of fn(): best and median of `repeat` rounds of `number` calls."""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return {"best": min(rounds), "median": statistics.median(rounds), "number": number, "repeat": repeat}
+
+
+def histogram_delta(before, after):
+    """{label values: (count, seconds)} observed between two Histogram.totals() snapshots."""
+    delta = {}
+    for key, (count, total) in after.items():
+        prev_count, prev_total = before.get(key, (0, 0.0))
+        if count != prev_count:
+            delta[key] = (count - prev_count, total - prev_total)
+    return delta
+
+
+def counter_delta(before, after):
+    return {key: value - before.get(key, 0) for key, value in after.items() if value != before.get(key, 0)}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results, output=None):
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "env": {name: os.environ.get(name) for name in ("HTTP_CASSETTE_DIR", "HTTP_CASSETTE_LATENCY", "RANKING_BACKEND", "RANKING_MOCK_LATENCY")},
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        **results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, time.strftime("%Y%m%dT%H%M%S.json", time.gmtime()))
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return output
@@ -0,0 +1,256 @@
+"""
+Load test for the Flask front end, run from the repository root:
+
+    python -m benchmarks.loadtest --concurrency 8 --duration 30
+
+By default the app runs in-process behind a threaded WSGI server, with stub publishers,
+the mock ranker and a local SMTP sink. To size a real deployment, start it with the
+environment printed by --print-env (for example under gunicorn -w 4) and pass --target.
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import threading
+import time
+
+from benchmarks.harness import CATEGORIES, REGIONS, write_results
+
+_METRIC_LINE = re.compile(r'^(\w+)(?:\{([^}]*)\})? (\S+)$')
+_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "index.html")
+
+
+def form_sources(template=_TEMPLATE):
+    """{(category, region): [source values]} as offered by the checkboxes in index.html."""
+    offered = {}
+    category = region = None
+    with open(template, encoding="utf-8") as f:
+        for line in f:
+            if match := re.match(r"^    (\w+): \{", line):
+                category = match.group(1)
+            elif match := re.match(r"^        (India|Global): \[", line):
+                region = match.group(1)
+                offered[(category, region)] = []
+            elif (match := re.search(r"value: '(\w+)'", line)) and (category, region) in offered:
+                offered[(category, region)].append(match.group(1))
+    return offered
+
+
+def stand_in_environment(upstream_url, smtp_port, ranking_latency="0"):
+    return {
+        "HTTP_UPSTREAM_OVERRIDE": upstream_url,
+        "HTTP_CASSETTE_MODE": "",
+        "RANKING_BACKEND": "mock",
+        "RANKING_MOCK_LATENCY": str(ranking_latency),
+        # Each worker mails the same recipients over and over
+        "SENT_HISTORY_PATH": "",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(smtp_port),
+        "SMTP_SSL": "0",
+        "EMAIL": "loadtest@example.com",
+        "PASS": "",
+        "SECRET_KEY": "loadtest",
+        "LOG_LEVEL": "ERROR",
+    }
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def scrape_metrics(session, target):
+    """{(name, labels): value} from the target's /metrics page."""
+    values = {}
+    response = session.get(f"{target}/metrics", timeout=5)
+    for line in response.text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            values[(match.group(1), match.group(2) or "")] = float(match.group(3))
+    return values
+
+
+def _digest_outcomes(metrics):
+    return {
+        labels.split('"')[1]: value
+        for (name, labels), value in metrics.items()
+        if name == "news_digest_requests_total"
+    }
+
+
+class LoadRun:
+    def __init__(self, target, concurrency, duration, recipients, categories, regions):
+        import requests
+
+        self.target = target
+        self.concurrency = concurrency
+        self.duration = duration
+        self.recipients = recipients
+        self.categories = categories
+        self.regions = regions
+        self.latencies = []
+        self.status_codes = {}
+        self.client_errors = 0
+        self.in_flight_samples = []
+        self.offered = form_sources()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._requests = requests
+
+    def _worker(self, index):
+        session = self._requests.Session()
+        rng = random.Random(index)
+        emails = ",".join(f"user{index}-{i}@example.com" for i in range(self.recipients))
+        while not self._stop.is_set():
+            category, region = rng.choice(self.categories), rng.choice(self.regions)
+            # Like a user who ticks every source offered for the category and region
+            form = {
+                "email": emails,
+                "category": category,
+                "region": region,
+                "top_n": "10",
+                "sources": self.offered.get((category, region), []),
+            }
+            start = time.perf_counter()
+            try:
+                response = session.post(f"{self.target}/", data=form, allow_redirects=False, timeout=120)
+                code = response.status_code
+            except self._requests.RequestException:
+                code = "exception"
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies.append(elapsed)
+                self.status_codes[code] = self.status_codes.get(code, 0) + 1
+                if code == "exception" or (isinstance(code, int) and code >= 400):
+                    self.client_errors += 1
+
+    def _sample_in_flight(self):
+        session = self._requests.Session()
+        while not self._stop.wait(0.5):
+            try:
+                metrics = scrape_metrics(session, self.target)
+            except self._requests.RequestException:
+                continue
+            # The /metrics request itself is one of the in-flight requests
+            self.in_flight_samples.append(max(0.0, metrics.get(("news_requests_in_flight", ""), 1.0) - 1))
+
+    def run(self):
+        session = self._requests.Session()
+        before = _digest_outcomes(scrape_metrics(session, self.target))
+        threads = [threading.Thread(target=self._worker, args=(i,), daemon=True) for i in range(self.concurrency)]
+        sampler = threading.Thread(target=self._sample_in_flight, daemon=True)
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        sampler.start()
+        time.sleep(self.duration)
+        self._stop.set()
+        for thread in threads:
+            thread.join()
+        sampler.join()
+        elapsed = time.perf_counter() - started
+        after = _digest_outcomes(scrape_metrics(session, self.target))
+        outcomes = {name: after.get(name, 0) - before.get(name, 0) for name in after}
+        return self.summary(elapsed, outcomes)
+
+    def summary(self, elapsed, outcomes):
+        total = len(self.latencies)
+        server_errors = outcomes.get("error", 0) + outcomes.get("failed", 0)
+        return {
+            "target": self.target,
+            "concurrency": self.concurrency,
+            "duration_seconds": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+            "latency_seconds": {
+                "p50": percentile(self.latencies, 0.50),
+                "p90": percentile(self.latencies, 0.90),
+                "p95": percentile(self.latencies, 0.95),
+                "p99": percentile(self.latencies, 0.99),
+                "max": max(self.latencies) if self.latencies else None,
+                "mean": statistics.mean(self.latencies) if self.latencies else None,
+            },
+            "status_codes": {str(code): count for code, count in self.status_codes.items()},
+            "digest_outcomes": outcomes,
+            "error_rate": round((self.client_errors + server_errors) / total, 4) if total else None,
+            "in_flight": {
+                "mean": round(statistics.mean(self.in_flight_samples), 2) if self.in_flight_samples else None,
+                "max": max(self.in_flight_samples) if self.in_flight_samples else None,
+            },
+        }
+
+
+def _serve_app_in_process():
+    from werkzeug.serving import make_server
+
+    from app import app
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="app", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test POST / with local stand-ins for publishers, Gemini and SMTP")
+    parser.add_argument("--target", help="base URL of an already running app (default: run it in-process)")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[4], help="one run per value")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per run")
+    parser.add_argument("--workers", type=int, help="server worker slots, to report saturation (in-flight / workers)")
+    parser.add_argument("--recipients", type=int, default=2)
+    parser.add_argument("--categories", nargs="*", default=list(CATEGORIES))
+    parser.add_argument("--regions", nargs="*", default=list(REGIONS))
+    parser.add_argument("--upstream-latency", default="0.05-0.3", help='stub publisher latency: seconds or "low-high"')
+    parser.add_argument("--ranking-latency", default="0.5", help="mock LLM latency in seconds")
+    parser.add_argument("--items", type=int, default=40, help="articles per stub page")
+    parser.add_argument("--print-env", action="store_true", help="print the environment an external app needs, then wait")
+    parser.add_argument("--output", help="JSON results path")
+    args = parser.parse_args()
+
+    from benchmarks.smtp_sink import SmtpSink
+    from benchmarks.stub_publishers import StubPublishers
+
+    with StubPublishers(items=args.items, latency=args.upstream_latency) as publishers, SmtpSink() as sink:
+        env = stand_in_environment(publishers.url, sink.port, args.ranking_latency)
+        if args.print_env:
+            print(" ".join(f"{name}={value!r}" for name, value in env.items()))
+            print("Stand-ins running; Ctrl-C to stop.")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                return
+
+        server = None
+        target = args.target
+        if target is None:
+            os.environ.update(env)
+            from news_logging import configure_logging
+            configure_logging()
+            server, target = _serve_app_in_process()
+
+        runs = []
+        try:
+            for concurrency in args.concurrency:
+                result = LoadRun(target, concurrency, args.duration, args.recipients, args.categories, args.regions).run()
+                if args.workers and result["in_flight"]["mean"] is not None:
+                    result["saturation"] = round(result["in_flight"]["mean"] / args.workers, 2)
+                result["emails_delivered_total"] = sink.messages
+                runs.append(result)
+                latency = result["latency_seconds"]
+                print(
+                    f"c={concurrency:3}  {result['requests']:5} req  {result['throughput_rps']:7.2f} rps  "
+                    f"p50 {latency['p50'] or 0:6.2f}s  p95 {latency['p95'] or 0:6.2f}s  p99 {latency['p99'] or 0:6.2f}s  "
+                    f"errors {result['error_rate'] or 0:6.2%}  in-flight mean {result['in_flight']['mean']} max {result['in_flight']['max']}"
+                )
+        finally:
+            if server is not None:
+                server.shutdown()
+    print(f"Results written to {write_results({'loadtest': runs}, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Memory per headline: the {"title", "url", "source"} dicts scrapers used to build
+against article_record.Article. Titles and URLs are built before measuring, so the
+figures are the record itself plus its source string; "feed" sources are built
+fresh per article, as a parsed feed or sitemap yields them.
+"""
+import gc
+import random
+import time
+import tracemalloc
+
+_SOURCES = ("Times of India", "Hindustan Times", "Indian Express", "The Hindu", "NDTV", "BBC", "The Guardian", "Reuters")
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, size, elapsed
+
+
+def bench_memory(count=1_000_000, seed=11):
+    from article_record import Article
+
+    rng = random.Random(seed)
+    titles = [f"Board exam results {i} announced for {rng.randrange(10**6)} students" for i in range(count)]
+    urls = [f"https://example.com/news/{rng.randrange(10**9)}/{i}" for i in range(count)]
+    picks = [rng.randrange(len(_SOURCES)) for _ in range(count)]
+    encoded = [source.encode() for source in _SOURCES]
+
+    variants = {
+        "dict": lambda: [
+            {"title": titles[i], "url": urls[i], "source": _SOURCES[picks[i]]} for i in range(count)
+        ],
+        "dict_feed_source": lambda: [
+            {"title": titles[i], "url": urls[i], "source": encoded[picks[i]].decode()} for i in range(count)
+        ],
+        "article": lambda: [Article(titles[i], urls[i], _SOURCES[picks[i]]) for i in range(count)],
+        "article_feed_source": lambda: [Article(titles[i], urls[i], encoded[picks[i]].decode()) for i in range(count)],
+    }
+    results = {}
+    for name, build in variants.items():
+        records, size, elapsed = _measure(build)
+        results[name] = {
+            "bytes_per_article": round(size / count, 1),
+            "total_mb": round(size / 1e6, 1),
+            "build_seconds": round(elapsed, 3),
+        }
+        if name == "article":
+            # Duplicate-detection keys are computed on first use and kept; timed untraced
+            sample = [Article(titles[i], urls[i]) for i in range(min(count, 100_000))]
+            started = time.perf_counter()
+            for record in sample:
+                record.url_hash, record.title_fingerprint
+            per_article = (time.perf_counter() - started) / len(sample)
+            gc.collect()
+            tracemalloc.start()
+            for record in records:
+                record.url_hash, record.title_fingerprint
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results["article_hashed_extra"] = {
+                "bytes_per_article": round(size / count, 1),
+                "hash_microseconds": round(per_article * 1e6, 2),
+            }
+        del records
+    results["saving_vs_dict"] = round(
+        1 - results["article"]["bytes_per_article"] / results["dict"]["bytes_per_article"], 3
+    )
+    results["articles"] = count
+    for name, result in results.items():
+        print(f"{name:22} {result}")
+    return results
@@ -0,0 +1,129 @@
+import random
+
+from benchmarks.harness import bench
+
+
+def _synthetic_articles(count, duplicate_ratio=0.3, seed=7):
+    rng = random.Random(seed)
+    words = ["exam", "board", "results", "university", "policy", "market", "cricket", "budget", "climate", "startup"]
+    articles = []
+    for i in range(count):
+        if articles and rng.random() < duplicate_ratio:
+            original = rng.choice(articles)
+            articles.append({"title": original["title"] + "!", "url": original["url"] + "?utm_source=x", "source": original["source"]})
+            continue
+        title = " ".join(rng.choice(words) for _ in range(8)).capitalize() + f" {i}"
+        articles.append({"title": title, "url": f"https://example.com/news/{i}", "source": rng.choice(["TOI", "HT", "FE"])})
+    return articles
+
+
+def bench_parser(cassette_dir=None, max_pages=200):
+    import cassettes
+    from http_client import parse_html
+
+    responses = []
+    for entry in cassettes.iter_cassettes(cassette_dir):
+        if "html" in entry["headers"].get("Content-Type", entry["headers"].get("content-type", "")):
+            responses.append(cassettes.build_response(entry))
+        if len(responses) >= max_pages:
+            break
+    if not responses:
+        return {"skipped": "no recorded HTML pages; run `python cassettes.py record` first"}
+    total_bytes = sum(len(r.content) for r in responses)
+    timing = bench(lambda: [parse_html(r) for r in responses], number=1, repeat=3)
+    return {
+        "pages": len(responses),
+        "bytes": total_bytes,
+        "seconds_per_pass": timing,
+        "pages_per_second": round(len(responses) / timing["median"], 1),
+        "mb_per_second": round(total_bytes / timing["median"] / 1e6, 2),
+    }
+
+
+def bench_dedupe(count=5000):
+    from news_sources import dedupe_articles
+
+    articles = _synthetic_articles(count)
+    timing = bench(lambda: dedupe_articles(articles), number=5, repeat=5)
+    return {
+        "articles": count,
+        "unique": len(dedupe_articles(articles)),
+        "seconds_per_call": timing,
+        "articles_per_second": round(count / timing["median"]),
+    }
+
+
+def bench_render(top_n=10, variants=200):
+    """One digest rendered repeatedly, cold (no cached article rows) and warm, then many personalized variants."""
+    from emailer import _article_html, build_html_email
+    from news_ai_agent import format_email
+
+    articles = _synthetic_articles(top_n, duplicate_ratio=0)
+    pool = _synthetic_articles(top_n * 5, duplicate_ratio=0)
+    rng = random.Random(3)
+    personalized = [(f"Topic {i % 9}", rng.sample(pool, top_n)) for i in range(variants)]
+
+    def render():
+        format_email(articles)
+        build_html_email(articles, topic="India Education")
+
+    def render_cold():
+        _article_html.cache_clear()
+        render()
+
+    def render_variants():
+        for topic, picked in personalized:
+            format_email(picked)
+            build_html_email(picked, topic=topic)
+
+    cold = bench(render_cold, number=200, repeat=5)
+    timing = bench(render, number=200, repeat=5)
+    variant_timing = bench(render_variants, number=1, repeat=5)
+    return {
+        "articles": top_n,
+        "seconds_per_render": timing,
+        "renders_per_second": round(1 / timing["median"]),
+        "cold_renders_per_second": round(1 / cold["median"]),
+        "variants": variants,
+        "variant_renders_per_second": round(variants / variant_timing["median"]),
+    }
+
+
+def bench_store(count=20000, batch=500):
+    """Bulk write rate into a scratch article store and latency of the recent-articles query."""
+    import shutil
+    import tempfile
+    import time
+
+    from article_store import ArticleStore
+
+    directory = tempfile.mkdtemp(prefix="article-store-")
+    try:
+        store = ArticleStore(f"{directory}/articles")
+        articles = _synthetic_articles(count, duplicate_ratio=0)
+        categories = ["general", "sports", "health", "tech"]
+        start = time.perf_counter()
+        for offset in range(0, count, batch):
+            store.write([(articles[offset:offset + batch], categories[(offset // batch) % len(categories)], "India", time.time())])
+        write_seconds = time.perf_counter() - start
+        timing = bench(lambda: store.recent("sports", "India", hours=24, limit=55), number=50, repeat=5)
+        return {
+            "articles": count,
+            "batch": batch,
+            "articles_written_per_second": round(count / write_seconds),
+            "recent_query_ms": round(timing["median"] * 1000, 3),
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_micro(cassette_dir=None):
+    from benchmarks.text import bench_keywords, bench_text
+
+    results = {
+        "parser": bench_parser(cassette_dir), "dedupe": bench_dedupe(), "render": bench_render(),
+        "text": bench_text(), "keywords": bench_keywords(), "store": bench_store(),
+    }
+    for name, result in results.items():
+        print(f"{name:8} {result}")
+    return results
@@ -0,0 +1,81 @@
+import statistics
+import time
+
+from benchmarks.harness import CATEGORIES, REGIONS, counter_delta, histogram_delta, peak_rss_mb
+
+
+def _per_second(count, seconds):
+    return round(count / seconds, 2) if seconds else None
+
+
+def run_case(sink, category, region, iterations=3, recipients=5, top_n=10):
+    """Runs process_and_send `iterations` times for one category/region and summarises the stage metrics."""
+    from metrics import HTML_PARSE_SECONDS, SOURCE_ARTICLES, STAGE_SECONDS
+    from news_ai_agent import process_and_send
+
+    emails = ",".join(f"reader{i}@example.com" for i in range(recipients))
+    stages_before = STAGE_SECONDS.totals()
+    articles_before = SOURCE_ARTICLES.totals()
+    parse_before = HTML_PARSE_SECONDS.totals()
+    sent_before = sink.messages
+
+    walls = []
+    status = ""
+    for _ in range(iterations):
+        start = time.perf_counter()
+        status = process_and_send(emails, category, region, top_n=top_n)
+        walls.append(time.perf_counter() - start)
+
+    stages = {
+        key[0]: {"count": count, "seconds": round(seconds, 4), "mean": round(seconds / count, 4)}
+        for key, (count, seconds) in histogram_delta(stages_before, STAGE_SECONDS.totals()).items()
+    }
+    articles = sum(
+        value for key, value in counter_delta(articles_before, SOURCE_ARTICLES.totals()).items()
+        if key[0] == category and key[1] == region
+    )
+    parse = histogram_delta(parse_before, HTML_PARSE_SECONDS.totals()).values()
+    pages_parsed = sum(count for count, _ in parse)
+    parse_seconds = sum(seconds for _, seconds in parse)
+    emails_sent = sink.messages - sent_before
+    scrape_seconds = stages.get("scrape", {}).get("seconds", 0)
+    send_seconds = stages.get("send", {}).get("seconds", 0)
+
+    return {
+        "category": category,
+        "region": region,
+        "iterations": iterations,
+        "recipients": recipients,
+        "wall_seconds": {
+            "mean": round(statistics.mean(walls), 4),
+            "median": round(statistics.median(walls), 4),
+            "min": round(min(walls), 4),
+            "max": round(max(walls), 4),
+        },
+        "stages": stages,
+        "articles_scraped": articles,
+        "articles_per_second": _per_second(articles, scrape_seconds),
+        "pages_parsed": pages_parsed,
+        "html_parse_seconds": round(parse_seconds, 4),
+        "pages_per_second": _per_second(pages_parsed, parse_seconds),
+        "emails_sent": emails_sent,
+        "emails_per_second": _per_second(emails_sent, send_seconds),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "last_status": status,
+    }
+
+
+def run_pipeline(sink, categories=CATEGORIES, regions=REGIONS, iterations=3, recipients=5):
+    results = []
+    print(f"{'category':22} {'region':7} {'wall(s)':>8} {'scrape':>8} {'rank':>7} {'render':>7} {'send':>7} {'art/s':>8} {'mail/s':>7} {'rss MB':>7}")
+    for category in categories:
+        for region in regions:
+            result = run_case(sink, category, region, iterations=iterations, recipients=recipients)
+            results.append(result)
+            stage = lambda name: result["stages"].get(name, {}).get("mean", 0)
+            print(
+                f"{category:22} {region:7} {result['wall_seconds']['median']:8.3f} {stage('scrape'):8.3f} "
+                f"{stage('rank'):7.3f} {stage('render'):7.3f} {stage('send'):7.3f} "
+                f"{result['articles_per_second'] or 0:8.1f} {result['emails_per_second'] or 0:7.1f} {result['peak_rss_mb']:7.1f}"
+            )
+    return results
@@ -0,0 +1,104 @@
+"""
+Full-text search latency over a synthetic archive: a scratch article store filled
+with `size` generated headlines (Zipf-distributed vocabulary, so some words are in
+a large share of titles), then a mix of queries with and without filters.
+"""
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.harness import CATEGORIES, REGIONS
+
+_COMMON = "india news exam market cricket budget climate health startup policy".split()
+_SOURCES = ["Times of India", "Hindustan Times", "Indian Express", "The Hindu", "NDTV", "BBC", "The Guardian"]
+
+
+def _vocabulary(size=20000, seed=3):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set(_COMMON)
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+    return _COMMON + sorted(words - set(_COMMON))
+
+
+def build_corpus(store, size, batch=5000, days=90, seed=5):
+    rng = random.Random(seed)
+    vocabulary = _vocabulary()
+    # Zipf-like: word k is drawn with weight 1/(k+1)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    now = time.time()
+    for offset in range(0, size, batch):
+        count = min(batch, size - offset)
+        words = rng.choices(vocabulary, weights=weights, k=count * 9)
+        articles = [
+            {
+                "title": " ".join(words[i * 9:i * 9 + rng.randint(5, 9)]).capitalize() + f" {offset + i}",
+                "url": f"https://example.com/{offset + i}",
+                "source": rng.choice(_SOURCES),
+            }
+            for i in range(count)
+        ]
+        # Every category and region gets some of each batch, as every digest is scraped every day.
+        # Oldest first, as the crawler fills a real archive.
+        seen_at = now - (1 - offset / size) * days * 86400
+        pairs = [(category, region) for category in CATEGORIES for region in REGIONS]
+        store.write([
+            (articles[i::len(pairs)], category, region, seen_at) for i, (category, region) in enumerate(pairs)
+        ])
+    return vocabulary
+
+
+def bench_search(size=1_000_000, repeat=50):
+    from article_store import ArticleStore
+
+    directory = tempfile.mkdtemp(prefix="search-corpus-")
+    try:
+        store = ArticleStore(f"{directory}/articles")
+        start = time.perf_counter()
+        vocabulary = build_corpus(store, size)
+        build_seconds = time.perf_counter() - start
+        # Searched as a running store would hold it: recent days, then whole weeks
+        start = time.perf_counter()
+        store.maintain()
+        compact_seconds = time.perf_counter() - start
+        rare, mid = vocabulary[5000], vocabulary[200]
+        week_ago = time.time() - 7 * 86400
+        queries = {
+            "rare_word": (rare, {}),
+            "mid_word": (mid, {}),
+            "common_word": ("exam", {}),
+            "two_common_words": ("india market", {}),
+            "prefix": ("crick*", {}),
+            "common_word_category_region": ("exam", {"category": "general", "region": "India"}),
+            "two_common_words_category_region": ("india market", {"category": "sports", "region": "Global"}),
+            "common_word_category": ("exam", {"category": "general"}),
+            "common_word_source_last_week": ("exam", {"source": "NDTV", "since": week_ago}),
+            "common_word_page_5": ("exam", {"page": 5}),
+        }
+        results = {
+            "corpus": size,
+            "build_seconds": round(build_seconds, 1),
+            "compact_seconds": round(compact_seconds, 1),
+            "partitions": len(store.partitions()),
+        }
+        for name, (query, filters) in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                found = store.search(query, **filters)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            results[name] = {
+                "query": query,
+                "filters": {k: v for k, v in filters.items() if k != "since"},
+                "median_ms": round(statistics.median(timings), 2),
+                "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 2),
+                "results": len(found["results"]),
+            }
+            print(f"{name:30} {results[name]['median_ms']:8.2f} ms median {results[name]['p95_ms']:8.2f} ms p95")
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
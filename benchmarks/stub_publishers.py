@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic_pages import PROFILES, generate_page
+
+
+def generic_section_page(items=40, seed=0):
+    """One page carrying every structure the synthetic profiles know plus plain h2/h3 links, so most scrapers find articles."""
+    parts = [generate_page(profile, items // len(PROFILES) + 1, noise=0.5, seed=seed) for profile in PROFILES]
+    rng = random.Random(seed)
+    links = "".join(
+        f'<h3><a href="/2026/10/19/story-{seed}-{i}" aria-label="Synthetic headline number {i} about '
+        f'{rng.choice(["exams", "markets", "cricket", "climate"])} today">Synthetic headline number {i} about the news today</a></h3>'
+        for i in range(items)
+    )
+    return "<html><body>" + links + "".join(parts) + "</body></html>"
+
+
+def news_sitemap(items=40, host="example.com"):
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    entries = "".join(
+        f"<url><loc>https://{host}/education/story-{i}.html</loc><news:news><news:publication_date>{now}</news:publication_date>"
+        f"<news:title>Synthetic sitemap headline number {i}</news:title></news:news></url>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+        f"{entries}</urlset>"
+    )
+
+
+class _PublisherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.wait()
+        # Paths arrive as /<original host>/<original path> (see HTTP_UPSTREAM_OVERRIDE)
+        host, _, rest = self.path.lstrip("/").partition("/")
+        if "sitemap" in rest:
+            body, content_type = news_sitemap(stub.items, host), "application/xml"
+        else:
+            body, content_type = stub.page_for(self.path), "text/html; charset=utf-8"
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubPublishers:
+    """
+    Local HTTP server standing in for every publisher when the app runs with
+    HTTP_UPSTREAM_OVERRIDE pointing at it. Each path gets a deterministic synthetic
+    page; latency is a fixed or "low-high" number of seconds per response.
+    """
+
+    def __init__(self, items=40, latency="0", port=0):
+        self.items = items
+        self.latency = str(latency)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _PublisherHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-publishers", daemon=True)
+
+    def wait(self):
+        if "-" in self.latency:
+            low, high = (float(part) for part in self.latency.split("-", 1))
+            time.sleep(random.uniform(low, high))
+        elif float(self.latency):
+            time.sleep(float(self.latency))
+
+    def page_for(self, path):
+        with self._lock:
+            page = self._pages.get(path)
+            if page is None:
+                page = self._pages[path] = generic_section_page(self.items, seed=len(self._pages))
+            return page
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
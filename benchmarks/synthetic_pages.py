@@ -0,0 +1,182 @@
+"""
+Synthetic section pages shaped like the markup the scrapers target, with as many
+items and as much unrelated noise markup as a stress test needs.
+"""
+import base64
+import gc
+import importlib
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from html import escape
+
+_WORDS = (
+    "board exam results university admission policy students teachers scholarship campus "
+    "ministry reform budget hostel entrance counselling syllabus semester faculty research"
+).split()
+
+
+def _headline(rng, index):
+    return f"{' '.join(rng.choice(_WORDS) for _ in range(rng.randint(6, 12))).capitalize()} {index}"
+
+
+def _toi_item(rng, index):
+    href = f"/education/news/{_headline(rng, index).lower().replace(' ', '-')}/articleshow/{10_000_000 + index}.cms"
+    return (
+        '<div class="lSIdy col_l_6 col_m_6">'
+        f'<a class="linktype1" href="{href}?from=mdr"><figure><img src="/photo/{index}.jpg" alt=""></figure>'
+        f"<span>{escape(_headline(rng, index))}</span></a></div>"
+    )
+
+
+def _ht_item(rng, index):
+    slug = _headline(rng, index).lower().replace(" ", "-")
+    return (
+        '<div class="cartHolder listView track" data-vars-story-id="{0}">'
+        '<a class="storyLink articleClick" href="/lifestyle/health/{1}-101{0}.html"></a>'
+        '<h3 class="hdg3"><a href="/lifestyle/health/{1}-101{0}.html">{2}</a></h3>'
+        '<div class="storyShortDetail"><span class="dateTime">Updated on Oct 19, 2026</span></div>'
+        "</div>"
+    ).format(index, slug, escape(_headline(rng, index)))
+
+
+def _fe_item(rng, index):
+    slug = _headline(rng, index).lower().replace(" ", "-")
+    return (
+        '<article><div class="entry-wrapper">'
+        f'<div class="entry-title"><a href="https://www.financialexpress.com/jobs-career/education-{slug}-{index}/">'
+        f"{escape(_headline(rng, index))}</a></div>"
+        '<div class="entry-meta"><span class="author">FE Online</span></div>'
+        "</div></article>"
+    )
+
+
+_NOISE_BLOCKS = (
+    lambda rng: '<div class="ad-slot" data-ad="{0}"><iframe src="https://ads.example.com/{0}"></iframe></div>'.format(rng.randint(1, 10**6)),
+    lambda rng: "<script>window.dataLayer=window.dataLayer||[];dataLayer.push({{'id':{0}}});</script>".format(rng.randint(1, 10**6)),
+    lambda rng: "<ul class=\"nav\">" + "".join(f'<li><a href="/section/{w}">{w}</a></li>' for w in rng.sample(_WORDS, 6)) + "</ul>",
+    lambda rng: '<div class="wrap"><div class="inner"><div class="row"><span style="color:#333">{0}</span></div></div></div>'.format(" ".join(rng.sample(_WORDS, 8))),
+    lambda rng: '<svg width="24" height="24"><path d="M{0} {1}L{1} {0}Z"/></svg>'.format(rng.randint(0, 99), rng.randint(0, 99)),
+)
+
+# name -> (scraper module, scraper function, page URLs, item template)
+PROFILES = {
+    "times_of_india": (
+        "news_sources", "scrape_times_of_india",
+        ["https://timesofindia.indiatimes.com/education"],
+        _toi_item,
+    ),
+    "hindustan_times": (
+        "health", "scrape_hindustan_times_health",
+        [f"https://www.hindustantimes.com/lifestyle/health/page-{page}" for page in range(1, 5)],
+        _ht_item,
+    ),
+    "financial_express": (
+        "news_sources", "scrape_financial_express_education",
+        ["https://www.financialexpress.com/about/education/"]
+        + [f"https://www.financialexpress.com/about/education/page/{page}/" for page in range(2, 6)],
+        _fe_item,
+    ),
+}
+
+
+def generate_page(profile, items, noise=1.0, seed=0, first_index=0):
+    """HTML with `items` articles in the profile's markup and about `noise` noise blocks per article."""
+    rng = random.Random(seed)
+    item_template = PROFILES[profile][3]
+    parts = ["<!DOCTYPE html><html><head><title>Section</title>", "<style>.x{color:red}</style></head><body>"]
+    parts.append(_NOISE_BLOCKS[2](rng))
+    for index in range(first_index, first_index + items):
+        parts.append(item_template(rng, index))
+        budget = noise
+        while budget > 0 and rng.random() < budget:
+            parts.append(rng.choice(_NOISE_BLOCKS)(rng))
+            budget -= 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def write_profile_cassettes(directory, profile, items, noise=1.0, seed=0):
+    """Writes one synthetic page per URL the profile's scraper requests; returns total bytes."""
+    import cassettes
+
+    total = 0
+    cassettes.configure(directory=directory)
+    for page, url in enumerate(PROFILES[profile][2]):
+        html = generate_page(profile, items, noise=noise, seed=seed + page, first_index=page * items)
+        total += len(html.encode("utf-8"))
+        cassettes.write_cassette(url, html)
+    return total
+
+
+def _measure_parse(html):
+    import cassettes
+    from http_client import parse_html
+
+    response = cassettes.build_response({
+        "status": 200, "headers": {"Content-Type": "text/html; charset=utf-8"},
+        "url": "https://synthetic.example/", "body": base64.b64encode(html.encode("utf-8")).decode("ascii"),
+    })
+    gc.collect()
+    start = time.perf_counter()
+    soup = parse_html(response)
+    seconds = time.perf_counter() - start
+    del soup
+    gc.collect()
+    tracemalloc.start()
+    soup = parse_html(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del soup
+    return seconds, peak
+
+
+def bench_synthetic(sizes=(100, 1000, 5000), noise=1.0, profiles=None):
+    """
+    For each profile and page size: raw parse throughput and peak traced memory of one
+    page, plus the wall time of the real scraper replaying synthetic pages for every URL it asks for.
+    """
+    import cassettes
+
+    previous = (cassettes.config.mode, cassettes.config.directory, cassettes.config.latency)
+    results = []
+    try:
+        for profile in profiles or PROFILES:
+            module, function, _, _ = PROFILES[profile]
+            scraper = getattr(importlib.import_module(module), function)
+            for items in sizes:
+                directory = tempfile.mkdtemp(prefix=f"synthetic-{profile}-")
+                try:
+                    html = generate_page(profile, items, noise=noise)
+                    parse_seconds, parse_peak = _measure_parse(html)
+                    write_profile_cassettes(directory, profile, items, noise=noise)
+                    cassettes.configure(mode=cassettes.REPLAY, directory=directory, latency=0)
+                    start = time.perf_counter()
+                    articles = scraper()
+                    scrape_seconds = time.perf_counter() - start
+                finally:
+                    shutil.rmtree(directory, ignore_errors=True)
+                size = len(html.encode("utf-8"))
+                result = {
+                    "profile": profile,
+                    "items": items,
+                    "noise": noise,
+                    "page_bytes": size,
+                    "parse_seconds": round(parse_seconds, 4),
+                    "items_per_second": round(items / parse_seconds),
+                    "mb_per_second": round(size / parse_seconds / 1e6, 2),
+                    "parse_peak_mb": round(parse_peak / 1e6, 1),
+                    "scrape_seconds": round(scrape_seconds, 4),
+                    "articles_returned": len(articles),
+                }
+                results.append(result)
+                print(
+                    f"{profile:18} {items:6} items {size / 1e6:7.2f} MB  parse {parse_seconds:7.3f}s "
+                    f"({result['items_per_second']:>7} items/s, {result['mb_per_second']:5.2f} MB/s)  "
+                    f"peak {result['parse_peak_mb']:7.1f} MB  scrape {scrape_seconds:7.3f}s -> {len(articles)} articles"
+                )
+    finally:
+        cassettes.configure(mode=previous[0], directory=previous[1], latency=previous[2])
+    return results
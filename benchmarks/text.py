@@ -0,0 +1,118 @@
+"""
+Title normalization: the per-module cleaners that text_normalization replaced,
+copied here as baselines, against clean_title() and the batch clean_titles();
+and the regex title_key() against the bytes.translate one.
+Keyword filtering: the substring any() scans against keywords.KeywordMatcher.
+"""
+import random
+import re
+import unicodedata
+
+from benchmarks.harness import bench
+
+_SKIP_WORDS = ['subscribe', 'login', 'register', 'advertisement', 'menu', 'search', 'newsletter']
+
+
+def legacy_news_sources_clean_title(title):
+    if not title:
+        return None
+    title = re.sub(r'\s+', ' ', title.strip())
+    if len(title) < 10 or len(title) > 200:
+        return None
+    if any(word in title.lower() for word in _SKIP_WORDS):
+        return None
+    return title
+
+
+def legacy_emailer_clean_title(title):
+    if not title:
+        return None
+    replacements = {
+        '—': '-', '–': '-', '…': '...', ' ': ' ', '′': "'", '″': '"',
+    }
+    for unicode_char, ascii_char in replacements.items():
+        title = title.replace(unicode_char, ascii_char)
+    title = unicodedata.normalize('NFKD', title)
+    title = title.encode('ascii', 'ignore').decode('ascii')
+    title = re.sub(r' +', ' ', title.strip())
+    if len(title) < 10 or len(title) > 200:
+        return None
+    if any(word in title.lower() for word in _SKIP_WORDS):
+        return None
+    return title
+
+
+def legacy_clean_text(text):
+    return ' '.join(text.strip().split())
+
+
+_LEGACY_TITLE_KEY_RE = re.compile(r"[^a-z0-9]+")
+
+
+def legacy_title_key(title, length=60):
+    return _LEGACY_TITLE_KEY_RE.sub("", title.lower())[:length]
+
+
+def synthetic_titles(count=5000, seed=11):
+    """Headlines with the mess scrapers see: NBSP, newlines, curly quotes, accents, nav text."""
+    rng = random.Random(seed)
+    words = ["Exam", "board", "results", "university", "policy", "Sensex", "cricket", "budget", "café", "résumé"]
+    decorations = ["“{}”", "{} — live", "{}…", "  {}\n", "{} updates", "{} Subscribe now", "{}"]
+    titles = []
+    for i in range(count):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(2, 14)))
+        titles.append(rng.choice(decorations).format(f"{text} {i}"))
+    return titles
+
+
+def bench_text(count=5000):
+    from text_normalization import clean_text, clean_title, clean_titles, title_key
+
+    titles = synthetic_titles(count)
+    cases = {
+        "legacy_news_sources": lambda: [legacy_news_sources_clean_title(t) for t in titles],
+        "clean_title": lambda: [clean_title(t) for t in titles],
+        "clean_titles": lambda: clean_titles(titles),
+        "legacy_emailer": lambda: [legacy_emailer_clean_title(t) for t in titles],
+        "clean_title_ascii": lambda: [clean_title(t, ascii_only=True) for t in titles],
+        "clean_titles_ascii": lambda: clean_titles(titles, ascii_only=True),
+        "legacy_clean_text": lambda: [legacy_clean_text(t) for t in titles],
+        "clean_text": lambda: [clean_text(t) for t in titles],
+        "legacy_title_key": lambda: [legacy_title_key(t) for t in titles],
+        "title_key": lambda: [title_key(t) for t in titles],
+    }
+    results = {"titles": count, "kept": sum(1 for t in clean_titles(titles) if t)}
+    results["title_keys_match"] = all(title_key(t) == legacy_title_key(t) for t in titles)
+    for name, fn in cases.items():
+        timing = bench(fn, number=5, repeat=5)
+        results[name] = {"seconds_per_batch": timing, "titles_per_second": round(count / timing["median"])}
+    return results
+
+
+def bench_keywords(count=5000):
+    """Substring any() against the token automaton, per category list, plus how many verdicts differ."""
+    from environment import environment_keywords, environment_matcher
+    from health import health_keywords, health_matcher
+    from higher_ed import higher_ed_keywords, higher_ed_matcher
+    from technology import technology_keywords, technology_matcher
+
+    titles = [title for title in synthetic_titles(count) if title]
+    results = {"titles": len(titles)}
+    for name, terms, matcher in (
+        ("higher_ed", higher_ed_keywords, higher_ed_matcher),
+        ("health", health_keywords, health_matcher),
+        ("technology", technology_keywords, technology_matcher),
+        ("environment", environment_keywords, environment_matcher),
+    ):
+        substring = lambda: [any(kw in t.lower() for kw in terms) for t in titles]
+        tokens = lambda: [matcher.matches(t) for t in titles]
+        weighted = lambda: [matcher.match(t) for t in titles]
+        results[name] = {
+            "keywords": len(terms),
+            "verdicts_changed": sum(a != b for a, b in zip(substring(), tokens())),
+            **{
+                case: round(len(titles) / bench(fn, number=3, repeat=5)["median"])
+                for case, fn in (("substring_per_second", substring), ("matches_per_second", tokens), ("match_per_second", weighted))
+            },
+        }
+    return results
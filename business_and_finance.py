@@ -1,8 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
+from article_record import Article
+from http_client import NewsSession, parse_html
+from keywords import KeywordMatcher
 from news_sources import get_session, clean_title
+from metrics import time_stage
+from source_runner import run_source
 import time
 
+logger = logging.getLogger(__name__)
+
 business_finance_keywords = [
     "business", "finance", "economy", "market", "stock", "investment", "banking",
     "corporate", "company", "industry", "trade", "commerce", "financial", "economic",
@@ -16,13 +22,14 @@ business_finance_keywords = [
     "exports", "imports", "fdi", "forex", "commodity", "gold", "silver",
     "crypto", "blockchain", "fintech", "digital payment", "upi", "bank"
 ]
+business_finance_matcher = KeywordMatcher(business_finance_keywords)
 
 def scrape_economic_times_business():
     try:
         session = get_session()
         url = "https://economictimes.indiatimes.com/news/economy/policy"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['.eachStory h3 a', '.story-box h4 a', 'h3 a', 'h2 a', '.contentSec h3 a']
         seen_titles = set()
@@ -35,11 +42,11 @@ def scrape_economic_times_business():
                         href = "https://economictimes.indiatimes.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Economic Times"})
+                    articles.append(Article(title, href, "Economic Times"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Economic Times Business: {e}")
+        logger.warning("Error scraping Economic Times Business: %s", e)
         return []
 
 def scrape_business_standard_finance():
@@ -47,7 +54,7 @@ def scrape_business_standard_finance():
         session = get_session()
         url = "https://www.business-standard.com/economy"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['.headline a', '.cardlist h2 a', 'h3 a', '.listing-news h4 a']
         seen_titles = set()
@@ -60,11 +67,11 @@ def scrape_business_standard_finance():
                         href = "https://www.business-standard.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Business Standard"})
+                    articles.append(Article(title, href, "Business Standard"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Business Standard Finance: {e}")
+        logger.warning("Error scraping Business Standard Finance: %s", e)
         return []
 
 def scrape_moneycontrol_business():
@@ -72,7 +79,7 @@ def scrape_moneycontrol_business():
         session = get_session()
         url = "https://www.moneycontrol.com/news/business/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['.news_title a', '.FL h2 a', 'h3 a', '.news-item h4 a']
         seen_titles = set()
@@ -85,11 +92,11 @@ def scrape_moneycontrol_business():
                         href = "https://www.moneycontrol.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "MoneyControl"})
+                    articles.append(Article(title, href, "MoneyControl"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping MoneyControl Business: {e}")
+        logger.warning("Error scraping MoneyControl Business: %s", e)
         return []
 
 def scrape_financial_express_business():
@@ -97,7 +104,7 @@ def scrape_financial_express_business():
         session = get_session()
         url = "https://www.financialexpress.com/economy/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['.entry-title a', '.listitembx h3 a', 'h2 a', '.title a', '.main-story h3 a']
         seen_titles = set()
@@ -113,11 +120,11 @@ def scrape_financial_express_business():
                         href = "https://www.financialexpress.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Financial Express"})
+                    articles.append(Article(title, href, "Financial Express"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Financial Express Business: {e}")
+        logger.warning("Error scraping Financial Express Business: %s", e)
         return []
 
 def scrape_mint_business():
@@ -125,7 +132,7 @@ def scrape_mint_business():
         session = get_session()
         url = "https://www.livemint.com/economy"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['h2 a', 'h3 a', '.headline a', '.listView h4 a']
         seen_titles = set()
@@ -138,11 +145,11 @@ def scrape_mint_business():
                         href = "https://www.livemint.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Mint"})
+                    articles.append(Article(title, href, "Mint"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Mint Business: {e}")
+        logger.warning("Error scraping Mint Business: %s", e)
         return []
 
 def scrape_hindustan_times_business():
@@ -150,7 +157,7 @@ def scrape_hindustan_times_business():
         session = get_session()
         url = "https://www.hindustantimes.com/business"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['.hdg3 a', 'h3 a', 'h2 a', '.media-heading a', '.story-title a']
         seen_titles = set()
@@ -163,11 +170,11 @@ def scrape_hindustan_times_business():
                         href = "https://www.hindustantimes.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Hindustan Times"})
+                    articles.append(Article(title, href, "Hindustan Times"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Hindustan Times Business: {e}")
+        logger.warning("Error scraping Hindustan Times Business: %s", e)
         return []
 
 def scrape_ndtv_business():
@@ -175,7 +182,7 @@ def scrape_ndtv_business():
         session = get_session()
         url = "https://www.ndtv.com/business"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['.newsHdng a', '.SrchLstPg_ttl-lnk a', 'h2 a', 'h3 a', '.story-title a']
         seen_titles = set()
@@ -188,11 +195,11 @@ def scrape_ndtv_business():
                         href = "https://www.ndtv.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "NDTV"})
+                    articles.append(Article(title, href, "NDTV"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping NDTV Business: {e}")
+        logger.warning("Error scraping NDTV Business: %s", e)
         return []
 
 def scrape_deccan_herald_business():
@@ -200,7 +207,7 @@ def scrape_deccan_herald_business():
         session = get_session()
         url = "https://www.deccanherald.com/business"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['a .headline', '.article-title a', 'h2 a', 'h3 a', '.story-title a']
         seen_titles = set()
@@ -216,11 +223,11 @@ def scrape_deccan_herald_business():
                         href = "https://www.deccanherald.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Deccan Herald"})
+                    articles.append(Article(title, href, "Deccan Herald"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Deccan Herald Business: {e}")
+        logger.warning("Error scraping Deccan Herald Business: %s", e)
         return []
 
 def scrape_indian_express_business():
@@ -228,7 +235,7 @@ def scrape_indian_express_business():
         session = get_session()
         url = "https://indianexpress.com/section/business/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         selectors = ['h3 a', 'h2 a', '.story-title a']
         seen_titles = set()
@@ -241,20 +248,20 @@ def scrape_indian_express_business():
                         href = "https://indianexpress.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Indian Express"})
+                    articles.append(Article(title, href, "Indian Express"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Indian Express Business: {e}")
+        logger.warning("Error scraping Indian Express Business: %s", e)
         return []
 
 def scrape_times_of_india_business():
     try:
-        session = requests.Session()
+        session = NewsSession()
         session.headers.update({"User-Agent": "Mozilla/5.0"})
         url = "https://timesofindia.indiatimes.com/business"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -268,7 +275,7 @@ def scrape_times_of_india_business():
                     if title and title not in seen_titles and href:
                         if href.startswith('/'):
                             href = "https://timesofindia.indiatimes.com" + href
-                        articles.append({"title": title, "url": href, "source": "Times of India"})
+                        articles.append(Article(title, href, "Times of India"))
                         seen_titles.add(title)
 
         # Structure 2: div.col_l_2.col_m_3 with figure.zxvyz a > figcaption
@@ -283,12 +290,12 @@ def scrape_times_of_india_business():
                         if title and title not in seen_titles and href:
                             if href.startswith('/'):
                                 href = "https://timesofindia.indiatimes.com" + href
-                            articles.append({"title": title, "url": href, "source": "Times of India"})
+                            articles.append(Article(title, href, "Times of India"))
                             seen_titles.add(title)
-        print(f"scrape_times_of_india_business: {len(articles)} articles")
+        logger.debug("scrape_times_of_india_business: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Times of India Business: {e}")
+        logger.warning("Error scraping Times of India Business: %s", e)
         return []
 
 
@@ -299,7 +306,7 @@ def scrape_reuters_business_global():
         session = get_session()
         url = "https://www.reuters.com/business/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -312,12 +319,12 @@ def scrape_reuters_business_global():
                 if href.startswith('/'):
                     href = "https://www.reuters.com" + href
                 
-                articles.append({"title": title, "url": href, "source": "Reuters"})
+                articles.append(Article(title, href, "Reuters"))
                 seen_titles.add(title)
                 
         return articles
     except Exception as e:
-        print(f"Error scraping Reuters Business: {e}")
+        logger.warning("Error scraping Reuters Business: %s", e)
         return []
 
 def scrape_bloomberg_business_global():
@@ -332,9 +339,9 @@ def scrape_bloomberg_business_global():
         ]
 
         for url in urls:
-            print(f"Scraping Bloomberg page: {url}")
+            logger.debug("Scraping Bloomberg page: %s", url)
             response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = parse_html(response)
 
             # Bloomberg story headlines
             for tag in soup.select('a[href*="/news/articles/"]'):
@@ -345,14 +352,14 @@ def scrape_bloomberg_business_global():
                     if href.startswith('/'):
                         href = "https://www.bloomberg.com" + href
                     
-                    articles.append({"title": title, "url": href, "source": "Bloomberg"})
+                    articles.append(Article(title, href, "Bloomberg"))
                     seen_titles.add(title)
             
             time.sleep(1) # Be polite to the server
 
         return articles
     except Exception as e:
-        print(f"Error scraping Bloomberg Business: {e}")
+        logger.warning("Error scraping Bloomberg Business: %s", e)
         return []
 
 def scrape_financial_times_global():
@@ -360,7 +367,7 @@ def scrape_financial_times_global():
         session = get_session()
         url = "https://www.ft.com/companies"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -373,12 +380,12 @@ def scrape_financial_times_global():
                 if href.startswith('/'):
                     href = "https://www.ft.com" + href
                 
-                articles.append({"title": title, "url": href, "source": "Financial Times"})
+                articles.append(Article(title, href, "Financial Times"))
                 seen_titles.add(title)
                 
         return articles
     except Exception as e:
-        print(f"Error scraping Financial Times: {e}")
+        logger.warning("Error scraping Financial Times: %s", e)
         return []
 
 def scrape_cnbc_business_global():
@@ -386,7 +393,7 @@ def scrape_cnbc_business_global():
         session = get_session()
         url = "https://www.cnbc.com/business/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -401,12 +408,12 @@ def scrape_cnbc_business_global():
                     if href.startswith('/'):
                         href = "https://www.cnbc.com" + href
                     
-                    articles.append({"title": title, "url": href, "source": "CNBC"})
+                    articles.append(Article(title, href, "CNBC"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping CNBC Business: {e}")
+        logger.warning("Error scraping CNBC Business: %s", e)
         return []
 
 def scrape_wall_street_journal_global():
@@ -414,7 +421,7 @@ def scrape_wall_street_journal_global():
         session = get_session()
         url = "https://www.wsj.com/news/business"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -428,12 +435,12 @@ def scrape_wall_street_journal_global():
                 if href.startswith('/'):
                     href = "https://www.wsj.com" + href
                 
-                articles.append({"title": title, "url": href, "source": "Wall Street Journal"})
+                articles.append(Article(title, href, "Wall Street Journal"))
                 seen_titles.add(title)
                 
         return articles
     except Exception as e:
-        print(f"Error scraping Wall Street Journal: {e}")
+        logger.warning("Error scraping Wall Street Journal: %s", e)
         return []
 
 def scrape_times_higher_education_business_global():
@@ -441,7 +448,7 @@ def scrape_times_higher_education_business_global():
         session = get_session()
         url = "https://www.timeshighereducation.com/news/business"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -458,12 +465,12 @@ def scrape_times_higher_education_business_global():
                 if not href.startswith('http'):
                     href = "https://www.timeshighereducation.com" + href
                 
-                articles.append({"title": title, "url": href, "source": "Times Higher Education"})
+                articles.append(Article(title, href, "Times Higher Education"))
                 seen_titles.add(title)
                 
         return articles
     except Exception as e:
-        print(f"Error scraping Times Higher Education Business: {e}")
+        logger.warning("Error scraping Times Higher Education Business: %s", e)
         return []
 
 def scrape_guardian_business_global():
@@ -471,7 +478,7 @@ def scrape_guardian_business_global():
         session = get_session()
         url = "https://www.theguardian.com/business"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -485,16 +492,16 @@ def scrape_guardian_business_global():
                 if not href.startswith('http'):
                     href = "https://www.theguardian.com" + href
                 
-                articles.append({"title": title, "url": href, "source": "The Guardian"})
+                articles.append(Article(title, href, "The Guardian"))
                 seen_titles.add(title)
                 
         return articles
     except Exception as e:
-        print(f"Error scraping Guardian Business: {e}")
+        logger.warning("Error scraping Guardian Business: %s", e)
         return []
 
 
-def scrape_business_finance_news(region="India", sources=None):
+def scrape_business_finance_news(region="India", sources=None, exclude=()):
     all_articles = []
     
     india_source_map = {
@@ -528,25 +535,27 @@ def scrape_business_finance_news(region="India", sources=None):
     if sources is None:
         sources = list(source_map.keys())
 
+    sources = [src for src in sources if src not in exclude]
+
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                src_articles = func()
-                print(f"Business & Finance ({region} - {src}): {len(src_articles)} articles")
+                src_articles = run_source("business_and_finance", region, src, func)
+                logger.info("Business & Finance (%s - %s): %s articles", region, src, len(src_articles))
                 all_articles.extend(src_articles)
-                time.sleep(1)  # Be polite between source requests
             except Exception as e:
-                print(f"Error in scrape_business_finance_news for source {src}: {e}")
+                logger.warning("Error in scrape_business_finance_news for source %s: %s", src, e)
 
     # Remove duplicates based on title
     unique_articles = []
     seen_titles = set()
-    for article in all_articles:
-        title_lower = article['title'].lower()
-        if title_lower not in seen_titles:
-            unique_articles.append(article)
-            seen_titles.add(title_lower)
+    with time_stage("dedupe"):
+        for article in all_articles:
+            title_lower = article['title'].lower()
+            if title_lower not in seen_titles:
+                unique_articles.append(article)
+                seen_titles.add(title_lower)
     
     return unique_articles
 
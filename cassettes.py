@@ -0,0 +1,229 @@
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+OFF = ""
+RECORD = "record"
+REPLAY = "replay"
+
+# Headers that describe the wire encoding; cassettes store the decoded body
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+class CassetteConfig:
+    """
+    HTTP_CASSETTE_MODE: "record" saves every response NewsSession receives, "replay" serves
+    them from disk and never touches the network. HTTP_CASSETTE_LATENCY is the injected
+    replay delay: seconds ("0.3"), a uniform range ("0.1-0.8", fixed per URL so runs are
+    repeatable) or "recorded" for the latency observed while recording.
+    """
+
+    def __init__(self):
+        self.mode = os.getenv("HTTP_CASSETTE_MODE", OFF).lower()
+        self.directory = os.getenv("HTTP_CASSETTE_DIR", "cassettes")
+        self.latency = os.getenv("HTTP_CASSETTE_LATENCY", "0")
+
+
+config = CassetteConfig()
+
+
+def configure(mode=None, directory=None, latency=None):
+    if mode is not None:
+        config.mode = mode
+    if directory is not None:
+        config.directory = directory
+    if latency is not None:
+        config.latency = str(latency)
+
+
+def cassette_key(method, url, params=None):
+    full_url = requests.Request(method.upper(), url, params=params).prepare().url
+    return full_url, hashlib.sha256(f"{method.upper()} {full_url}".encode()).hexdigest()
+
+
+def cassette_path(method, url, params=None):
+    full_url, digest = cassette_key(method, url, params)
+    host = requests.utils.urlparse(full_url).netloc.lower().replace(":", "_") or "unknown"
+    return os.path.join(config.directory, host, f"{digest[:24]}.json.gz")
+
+
+def record(method, url, kwargs, response):
+    # A 304 only makes sense next to the cached body it refers to, which we don't have on replay
+    if response.status_code == 304:
+        return
+    entry = {
+        "method": method.upper(),
+        "url": url,
+        "final_url": response.url,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+        "elapsed": response.elapsed.total_seconds(),
+        "recorded_at": time.time(),
+        "body": base64.b64encode(response.content).decode("ascii"),
+    }
+    path = _save(entry, kwargs.get("params"))
+    logger.debug("Recorded %s %s -> %s", method.upper(), url, path)
+
+
+def write_cassette(url, body, status=200, headers=None, method="GET"):
+    """Stores a hand-made response for url, e.g. a synthetic page for the parser benchmarks."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    entry = {
+        "method": method.upper(),
+        "url": url,
+        "final_url": url,
+        "status": status,
+        "reason": "OK" if status == 200 else "",
+        "headers": headers or {"Content-Type": "text/html; charset=utf-8"},
+        "elapsed": 0.0,
+        "recorded_at": time.time(),
+        "body": base64.b64encode(body).decode("ascii"),
+    }
+    return _save(entry)
+
+
+def _save(entry, params=None):
+    path = cassette_path(entry["method"], entry["url"], params)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load(method, url, params=None):
+    path = cassette_path(method, url, params)
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _latency_for(entry):
+    setting = config.latency.strip().lower()
+    if setting == "recorded":
+        return entry.get("elapsed", 0.0)
+    if "-" in setting:
+        low, high = (float(part) for part in setting.split("-", 1))
+        return random.Random(entry["url"]).uniform(low, high)
+    return float(setting or 0)
+
+
+def _read_timeout(timeout):
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+def replay(session, method, url, kwargs):
+    """Builds the recorded requests.Response for url, after sleeping the injected latency."""
+    entry = load(method, url, kwargs.get("params"))
+    if entry is None:
+        raise requests.exceptions.ConnectionError(f"No cassette for {method.upper()} {url} in {config.directory}")
+
+    latency = _latency_for(entry)
+    timeout = _read_timeout(kwargs.get("timeout"))
+    if timeout is not None and latency > timeout:
+        time.sleep(timeout)
+        raise requests.exceptions.ReadTimeout(f"Replayed latency {latency:.2f}s exceeds timeout {timeout}s for {url}")
+    if latency > 0:
+        time.sleep(latency)
+
+    response = build_response(entry, latency)
+    response.request = session.prepare_request(requests.Request(method.upper(), url, params=kwargs.get("params")))
+    return response
+
+
+def build_response(entry, latency=0.0):
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason") or ""
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.url = entry.get("final_url") or entry["url"]
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.elapsed = timedelta(seconds=latency)
+    # Fully buffered, so iter_content() works for stream=True callers too
+    response._content = base64.b64decode(entry["body"])
+    response._content_consumed = True
+    return response
+
+
+def iter_cassettes(directory=None):
+    """Every recorded entry under directory (default: the configured cassette directory)."""
+    for root, _, names in os.walk(directory or config.directory):
+        for name in sorted(names):
+            if name.endswith(".json.gz"):
+                with gzip.open(os.path.join(root, name), "rt", encoding="utf-8") as f:
+                    yield json.load(f)
+
+
+def _run_all_sources():
+    from business_and_finance import scrape_business_finance_news
+    from entertainment import scrape_entertainment_news
+    from environment import scrape_environment_news
+    from health import scrape_health_news
+    from higher_ed import scrape_higher_ed_news
+    from industry import scrape_industry_news
+    from news_sources import scrape_news
+    from sports import scrape_sports_news
+    from technology import scrape_technology_news
+
+    dispatchers = {
+        "general": lambda region: scrape_news(region)[0],
+        "higher_ed": lambda region: scrape_higher_ed_news(region=region),
+        "entertainment": lambda region: scrape_entertainment_news(region=region),
+        "sports": lambda region: scrape_sports_news(region=region),
+        "business_and_finance": lambda region: scrape_business_finance_news(region=region),
+        "tech": lambda region: scrape_technology_news(region=region),
+        "environment": lambda region: scrape_environment_news(region=region),
+        "industry": lambda region: scrape_industry_news(region=region),
+        "health": lambda region: scrape_health_news(region=region),
+    }
+    for category, dispatcher in dispatchers.items():
+        for region in ("India", "Global"):
+            started = time.perf_counter()
+            articles = dispatcher(region)
+            print(f"{category:22} {region:7} {len(articles):4} articles  {time.perf_counter() - started:6.2f}s")
+    # The pages SCRAPE_MODE=crawl requests, most of which no source scraper asks for
+    from crawl import crawl
+
+    for region in ("India", "Global"):
+        started = time.perf_counter()
+        try:
+            _, pools = crawl(region)
+        except RuntimeError as e:
+            print(f"{'crawl':22} {region:7} failed: {e}")
+            continue
+        headlines = sum(len(articles) for by_outlet in pools.values() for articles in by_outlet.values())
+        print(f"{'crawl':22} {region:7} {headlines:4} routed   {time.perf_counter() - started:6.2f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record or replay every category/region source map and the crawl through the cassette layer.")
+    parser.add_argument("mode", choices=[RECORD, REPLAY])
+    parser.add_argument("--dir", default=None, help="cassette directory (default HTTP_CASSETTE_DIR or ./cassettes)")
+    parser.add_argument("--latency", default=None, help='replay latency: seconds, "low-high" or "recorded"')
+    args = parser.parse_args()
+    # NewsSession reads the imported module's config, not this __main__ copy
+    import cassettes
+    cassettes.configure(mode=args.mode, directory=args.dir, latency=args.latency)
+    cassettes._run_all_sources()
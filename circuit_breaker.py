@@ -0,0 +1,111 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures or empty runs before a source is short-circuited
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+# Cool-down before the first background probe; doubles after each failed probe
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "300"))
+BREAKER_MAX_COOLDOWN_SECONDS = float(os.getenv("BREAKER_MAX_COOLDOWN_SECONDS", "3600"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures (exceptions or zero-article runs) for one source. Once
+    the threshold is hit the breaker opens and callers skip the source; after the
+    cool-down a single background probe decides whether it closes again.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = ""
+        self.last_yield = None
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, count):
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+            self.opened_at = None
+            self.last_yield = count
+
+    def record_failure(self, reason):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = reason
+            if self.state == HALF_OPEN:
+                # Failed probe: stay open and back off further
+                self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN_SECONDS)
+                self._open()
+            elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        logger.warning("[circuit_breaker] %s open for %.0fs: %s", self.name, self.cooldown, self.last_error)
+
+    def maybe_probe(self, probe):
+        """Starts probe() in a background thread if the cool-down has elapsed and no probe is running."""
+        with self._lock:
+            if self.state != OPEN or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = HALF_OPEN
+        threading.Thread(target=probe, name=f"probe-{self.name}", daemon=True).start()
+        return True
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            return {
+                "source": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "last_error": self.last_error,
+                "last_yield": self.last_yield,
+                "short_circuited": self.short_circuited,
+                "retry_in_seconds": retry_in,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name)
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_states():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
@@ -0,0 +1,279 @@
+"""
+Fetch-once crawl of the outlets several categories scrape. Each outlet's homepage
+and section pages are fetched once per cycle; every headline goes to the category
+of the section it was found on plus every category whose keywords it matches.
+The resulting per-category pools are shared by all requests for CRAWL_TTL_SECONDS.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+from article_record import Article
+from article_store import store_articles
+from business_and_finance import business_finance_matcher
+from entertainment import entertainment_matcher
+from environment import environment_matcher
+from health import health_matcher
+from higher_ed import higher_ed_matcher
+from http_client import MAX_CONNECTIONS_PER_HOST, get_session, parse_html, submit_with_context
+from industry import industry_matcher
+from news_sources import education_matcher
+from singleflight import SingleFlight
+from source_runner import run_source
+from sports import sports_matcher
+from technology import technology_matcher
+from text_normalization import clean_title
+
+logger = logging.getLogger(__name__)
+
+CRAWL_TTL_SECONDS = float(os.getenv("CRAWL_TTL_SECONDS", "600"))
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "8"))
+# Headlines with fewer words are section links and teasers, not stories
+MIN_HEADLINE_WORDS = 4
+
+CATEGORY_MATCHERS = {
+    "general": education_matcher,
+    "higher_ed": higher_ed_matcher,
+    "entertainment": entertainment_matcher,
+    "sports": sports_matcher,
+    "business_and_finance": business_finance_matcher,
+    "tech": technology_matcher,
+    "environment": environment_matcher,
+    "industry": industry_matcher,
+    "health": health_matcher,
+}
+
+# outlet -> (display name, region, domain, [(page URL, category of the section or None)])
+OUTLETS = {
+    "times_of_india": ("Times of India", "India", "timesofindia.indiatimes.com", [
+        ("https://timesofindia.indiatimes.com/", None),
+        ("https://timesofindia.indiatimes.com/education", "general"),
+        ("https://timesofindia.indiatimes.com/entertainment", "entertainment"),
+        ("https://timesofindia.indiatimes.com/sports", "sports"),
+        ("https://timesofindia.indiatimes.com/technology", "tech"),
+        ("https://timesofindia.indiatimes.com/business", "business_and_finance"),
+        ("https://timesofindia.indiatimes.com/home/environment", "environment"),
+        ("https://timesofindia.indiatimes.com/life-style/health-fitness/health-news", "health"),
+    ]),
+    "hindustan_times": ("Hindustan Times", "India", "hindustantimes.com", [
+        ("https://www.hindustantimes.com/", None),
+        ("https://www.hindustantimes.com/education", "general"),
+        ("https://www.hindustantimes.com/entertainment", "entertainment"),
+        ("https://www.hindustantimes.com/technology", "tech"),
+        ("https://www.hindustantimes.com/business", "business_and_finance"),
+        ("https://www.hindustantimes.com/topic/environment", "environment"),
+        ("https://www.hindustantimes.com/lifestyle/health", "health"),
+    ]),
+    "indian_express": ("Indian Express", "India", "indianexpress.com", [
+        ("https://indianexpress.com/", None),
+        ("https://indianexpress.com/section/education/", "general"),
+        ("https://indianexpress.com/about/higher-education/", "higher_ed"),
+        ("https://indianexpress.com/section/entertainment/", "entertainment"),
+        ("https://indianexpress.com/section/sports/", "sports"),
+        ("https://indianexpress.com/section/technology/", "tech"),
+        ("https://indianexpress.com/section/business/", "business_and_finance"),
+        ("https://indianexpress.com/about/environment/", "environment"),
+        ("https://indianexpress.com/section/lifestyle/health/", "health"),
+    ]),
+    "the_hindu": ("The Hindu", "India", "thehindu.com", [
+        ("https://www.thehindu.com/", None),
+        ("https://www.thehindu.com/education/", "general"),
+        ("https://www.thehindu.com/entertainment/", "entertainment"),
+        ("https://www.thehindu.com/sport/", "sports"),
+        ("https://www.thehindu.com/business/Industry/", "industry"),
+    ]),
+    "ndtv": ("NDTV", "India", "ndtv.com", [
+        ("https://www.ndtv.com/", None),
+        ("https://www.ndtv.com/education", "general"),
+        ("https://www.ndtv.com/topic/entertainment-news", "entertainment"),
+        ("https://sports.ndtv.com/", "sports"),
+        ("https://www.ndtv.com/business", "business_and_finance"),
+        ("https://www.ndtv.com/topic/environment", "environment"),
+    ]),
+    "guardian": ("The Guardian", "Global", "theguardian.com", [
+        ("https://www.theguardian.com/international", None),
+        ("https://www.theguardian.com/education", "general"),
+        ("https://www.theguardian.com/education/higher-education", "higher_ed"),
+        ("https://www.theguardian.com/film", "entertainment"),
+        ("https://www.theguardian.com/sport", "sports"),
+        ("https://www.theguardian.com/technology", "tech"),
+        ("https://www.theguardian.com/business", "business_and_finance"),
+        ("https://www.theguardian.com/environment", "environment"),
+        ("https://www.theguardian.com/business/manufacturing-sector", "industry"),
+        ("https://www.theguardian.com/society/health", "health"),
+    ]),
+    "bbc": ("BBC", "Global", "bbc.com", [
+        ("https://www.bbc.com/news", None),
+        ("https://www.bbc.com/news/education", "general"),
+        ("https://www.bbc.com/news/entertainment_and_arts", "entertainment"),
+        ("https://www.bbc.com/sport", "sports"),
+        ("https://www.bbc.com/news/topics/c0repy5vn95t", "industry"),
+        ("https://www.bbc.com/news/health", "health"),
+    ]),
+}
+
+# category -> {dispatcher source key: outlet}; the crawl pool stands in for these sources
+CRAWLED_SOURCES = {
+    "general": {
+        "times_of_india": "times_of_india", "hindustan_times": "hindustan_times",
+        "indian_express": "indian_express", "the_hindu": "the_hindu", "ndtv": "ndtv",
+        "bbc": "bbc", "guardian": "guardian",
+    },
+    "higher_ed": {"toi": "times_of_india", "indian_express": "indian_express", "guardian": "guardian"},
+    "entertainment": {
+        "times_of_india_entertainment": "times_of_india", "hindustan_times_entertainment": "hindustan_times",
+        "indian_express_entertainment": "indian_express", "the_hindu_entertainment": "the_hindu",
+        "ndtv_entertainment": "ndtv", "guardian_film": "guardian", "bbc_entertainment": "bbc",
+    },
+    "sports": {
+        "times_of_india_sports": "times_of_india", "indian_express_sports": "indian_express",
+        "the_hindu": "the_hindu", "ndtv_sports": "ndtv", "guardian_sports": "guardian", "bbc_sport": "bbc",
+    },
+    "tech": {
+        "times_of_india": "times_of_india", "hindustan_times": "hindustan_times",
+        "indian_express": "indian_express", "guardian": "guardian",
+    },
+    "business_and_finance": {
+        "times_of_india": "times_of_india", "hindustan_times": "hindustan_times",
+        "indian_express": "indian_express", "ndtv": "ndtv", "guardian": "guardian",
+    },
+    "environment": {
+        "times_of_india": "times_of_india", "hindustan_times": "hindustan_times",
+        "indian_express": "indian_express", "ndtv": "ndtv", "guardian": "guardian",
+    },
+    "industry": {"the_hindu": "the_hindu", "guardian": "guardian", "bbc": "bbc"},
+    "health": {
+        "times_of_india": "times_of_india", "hindustan_times": "hindustan_times",
+        "indian_express": "indian_express", "guardian": "guardian", "bbc": "bbc",
+    },
+}
+
+_crawls = SingleFlight(linger=CRAWL_TTL_SECONDS)
+
+
+def extract_headlines(soup, page_url, domain):
+    """(title, url) for every link on the page that looks like one of the outlet's stories."""
+    seen = set()
+    for tag in soup.find_all("a", href=True):
+        title = clean_title(tag.get_text(" ") or tag.get("aria-label"))
+        if not title or len(title.split()) < MIN_HEADLINE_WORDS:
+            continue
+        # Relative to the page as requested, not the upstream it was served from
+        parsed = urlparse(urljoin(page_url, tag["href"]))
+        host = parsed.netloc.lower()
+        if not (host == domain or host.endswith("." + domain)) or parsed.path.count("/") < 2:
+            continue
+        url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        if url in seen:
+            continue
+        seen.add(url)
+        yield title, url
+
+
+def route(title, section=None):
+    """Every category a headline belongs to: its section's, plus each whose keywords it contains."""
+    categories = {section} if section else set()
+    categories.update(category for category, matcher in CATEGORY_MATCHERS.items() if matcher.matches(title))
+    return categories
+
+
+def _crawl_page(session, outlet, url, section):
+    name, _, domain, _ = OUTLETS[outlet]
+    response = session.get(url, timeout=15)
+    response.raise_for_status()
+    return [
+        Article(title, link, name, categories=route(title, section))
+        for title, link in extract_headlines(parse_html(response), url, domain)
+    ]
+
+
+def _crawl_outlet(outlet):
+    session = get_session(
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+    pages = OUTLETS[outlet][3]
+    by_url = {}
+    categories = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_CONNECTIONS_PER_HOST, len(pages))) as pool:
+        futures = [(url, submit_with_context(pool, _crawl_page, session, outlet, url, section)) for url, section in pages]
+        for url, future in futures:
+            try:
+                page_articles = future.result()
+            except Exception as e:
+                logger.warning("Crawl of %s failed: %s", url, e)
+                continue
+            for article in page_articles:
+                if article.url in by_url:
+                    # Same story on the homepage and a section page: it belongs to both
+                    categories[article.url] |= article["categories"]
+                else:
+                    by_url[article.url] = article
+                    categories[article.url] = set(article["categories"])
+    # Articles are read-only, so only a story found on several pages is rebuilt
+    return [
+        article if categories[url] == article["categories"] else Article(article.title, url, article.source, categories=categories[url])
+        for url, article in by_url.items()
+    ]
+
+
+def _crawl(region):
+    outlets = [outlet for outlet, (_, outlet_region, _, _) in OUTLETS.items() if outlet_region == region]
+    pools = {category: {} for category in CATEGORY_MATCHERS}
+    crawled = set()
+    with ThreadPoolExecutor(max_workers=max(1, min(CRAWL_WORKERS, len(outlets)))) as pool:
+        futures = {
+            outlet: submit_with_context(pool, run_source, "crawl", region, outlet, lambda outlet=outlet: _crawl_outlet(outlet))
+            for outlet in outlets
+        }
+        for outlet, future in futures.items():
+            try:
+                articles = future.result()
+            except Exception as e:
+                logger.warning("Crawl of %s failed: %s", outlet, e)
+                continue
+            if articles:
+                crawled.add(outlet)
+            for article in articles:
+                for category in article["categories"]:
+                    pools[category].setdefault(outlet, []).append(
+                        Article(article["title"], article["url"], article["source"])
+                    )
+    if not crawled:
+        # Raised rather than returned so the empty cycle is not shared for CRAWL_TTL_SECONDS
+        raise RuntimeError(f"crawl ({region}) found no articles")
+    for category, by_outlet in pools.items():
+        store_articles([article for articles in by_outlet.values() for article in articles], category, region)
+    logger.info(
+        "Crawl (%s): %s", region,
+        ", ".join(f"{category} {sum(map(len, by_outlet.values()))}" for category, by_outlet in pools.items()),
+    )
+    return crawled, pools
+
+
+def crawl(region):
+    """(outlets crawled successfully, {category: {outlet: [articles]}}) from the region's current crawl cycle."""
+    return _crawls.do(region, lambda: _crawl(region))
+
+
+def crawled_articles(category, region, sources=None):
+    """
+    (articles, covered source keys) for a category request: the crawl pool's articles
+    from the selected sources it stands in for, and the keys the dispatcher should skip.
+    Sources whose outlet failed in this cycle are left to the dispatcher.
+    """
+    stand_ins = {
+        key: outlet for key, outlet in CRAWLED_SOURCES.get(category, {}).items()
+        if OUTLETS[outlet][1] == region and (sources is None or key in sources)
+    }
+    if not stand_ins:
+        return [], ()
+    try:
+        crawled, pools = crawl(region)
+    except Exception as e:
+        logger.warning("Crawl unavailable, scraping sources individually: %s", e)
+        return [], ()
+    stand_ins = {key: outlet for key, outlet in stand_ins.items() if outlet in crawled}
+    pool = pools.get(category, {})
+    articles = [article for outlet in dict.fromkeys(stand_ins.values()) for article in pool.get(outlet, [])]
+    return articles, tuple(stand_ins)
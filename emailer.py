@@ -1,253 +1,146 @@
+import logging
 import os
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from functools import lru_cache
+import time
 
+from html import escape
 
-import re
-import unicodedata
-
-def clean_title(title):
-    if not title:
-        return None
-    
-    # First, clean Unicode characters
-    # Replace common problematic Unicode characters
-    replacements = {
-        '"': '"',  # Left double quotation mark
-        '"': '"',  # Right double quotation mark
-        ''': "'",  # Left single quotation mark
-        ''': "'",  # Right single quotation mark
-        '—': '-',  # Em dash
-        '–': '-',  # En dash
-        '…': '...',  # Horizontal ellipsis
-        ' ': ' ',  # Non-breaking space
-        '′': "'",  # Prime
-        '″': '"',  # Double prime
-    }
-    
-    for unicode_char, ascii_char in replacements.items():
-        title = title.replace(unicode_char, ascii_char)
-    
-    # Normalize Unicode and convert to ASCII
-    title = unicodedata.normalize('NFKD', title)
-    title = title.encode('ascii', 'ignore').decode('ascii')
-    
-    # Clean whitespace more carefully - preserve single spaces between words
-    # Replace multiple spaces with single space, but don't remove spaces between words
-    title = re.sub(r' +', ' ', title.strip())
-    
-    if len(title) < 10 or len(title) > 200:
-        return None
-    
-    # Filter out navigation items and ads
-    skip_words = ['subscribe', 'login', 'register', 'advertisement', 'menu', 'search', 'newsletter']
-    if any(word in title.lower() for word in skip_words):
-        return None
-    
-    return title
-
-def build_html_email(articles, topic="News"):
-    html_body = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Newsletter</title>
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-            body {{
-                font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                line-height: 1.6;
-                color: #1a1a1a;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                padding: 20px;
-            }}
-            .container {{
-                max-width: 680px;
-                margin: 0 auto;
-                background: #ffffff;
-                border-radius: 16px;
-                box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-                overflow: hidden;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%);
-                padding: 40px 30px;
-                text-align: center;
-                position: relative;
-                overflow: hidden;
-            }}
-            .header h1 {{
-                color: white;
-                font-size: 28px;
-                font-weight: 700;
-                margin-bottom: 8px;
-                position: relative;
-                z-index: 1;
-            }}
-            .header p {{
-                color: rgba(255,255,255,0.9);
-                font-size: 16px;
-                font-weight: 400;
-                position: relative;
-                z-index: 1;
-            }}
-            .content {{
-                padding: 40px 30px;
-            }}
-            .article {{
-                background: #f3f4f6;
-                border-radius: 12px;
-                margin-bottom: 30px;
-                border: 1px solid #e5e7eb;
-                transition: all 0.3s ease;
-                overflow: hidden;
-            }}
-            .article-content {{
-                padding: 24px;
-            }}
-            .article-title {{
-                color: #1a1a1a;
-                font-size: 20px;
-                font-weight: 600;
-                margin-bottom: 18px;
-                line-height: 1.4;
-            }}
-            .read-more {{
-                display: inline-block;
-                background: #22223b;
-                color: #fff !important;
-                text-decoration: none;
-                padding: 12px 22px;
-                border-radius: 8px;
-                font-weight: 500;
-                font-size: 15px;
-                transition: background 0.2s;
-            }}
-            .read-more:hover {{
-                background: #4f46e5;
-            }}
-            .footer {{
-                background: #f8fafc;
-                padding: 30px;
-                text-align: center;
-                border-top: 1px solid #e5e7eb;
-            }}
-            .footer p {{
-                color: #6b7280;
-                font-size: 14px;
-                margin-bottom: 8px;
-            }}
-            .footer .timestamp {{
-                color: #9ca3af;
-                font-size: 12px;
-            }}
-            .divider {{
-                height: 1px;
-                background: linear-gradient(90deg, transparent, #e5e7eb, transparent);
-                margin: 20px 0;
-            }}
-            @media (max-width: 600px) {{
-                .container {{
-                    margin: 10px;
-                    border-radius: 12px;
-                }}
-                .header {{
-                    padding: 30px 20px;
-                }}
-                .header h1 {{
-                    font-size: 24px;
-                }}
-                .content {{
-                    padding: 30px 20px;
-                }}
-                .article-content {{
-                    padding: 20px;
-                }}
-                .article-title {{
-                    font-size: 18px;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>Top {len(articles)} {topic.title()} Articles</h1>
-                <p>Your curated news digest, delivered fresh</p>
-            </div>
-            <div class="content">
+from metrics import EMAILS, SMTP_SEND_SECONDS
+from text_normalization import clean_title
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "email")
+
+
+def _template(name):
+    with open(os.path.join(TEMPLATE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# Read once at import. head.html (doctype, head, stylesheet) has no placeholders and is
+# sent verbatim; the others are str.format templates filled with escaped values
+_HEAD = _template("head.html")
+_DIGEST_HTML = _template("digest.html")
+_SECTION_HTML = _template("section.html")
+_ARTICLE_HTML = _template("article.html")
+_UNSUBSCRIBE_HTML = _template("unsubscribe.html")
+_DIVIDER = '<div class="divider"></div>'
+
+_TEXT_HEADER = "🎓 Your Education News Digest 🎓\n" + "=" * 50 + "\n\n"
+_TEXT_FOOTER = "\n" + "=" * 50 + "\nThis digest was automatically generated.\nStay informed, stay educated! 🌟"
+
+
+@lru_cache(maxsize=4096)
+def _article_html(title, url, source):
+    """
+    One article's block, or "" if it has no usable title or link. Cached: digests for
+    different recipients or topics mostly reuse the same articles.
     """
+    title = clean_title(title, ascii_only=True)
+    if not title or not url:
+        return ""
+    return _ARTICLE_HTML.format(title=escape(title), url=escape(url), source=escape(source or "Unknown Source"))
 
-    for i, article in enumerate(articles):
-        title = clean_title(article.get("title", "Untitled"))
-        if not title:
-            continue  # Skip if title is empty or filtered out
-        link = article.get("url", "#")
-        source = article.get("source") or "Unknown Source"
-        if not link:
-            continue  # Skip articles without a URL
-
-        html_body += f"""
-            <div class="article">
-                <div class="article-content">
-                    <h2 class="article-title">{title} <span style='font-size:0.8em; color:#6b7280;'>({source})</span></h2>
-                    <a href="{link}" class="read-more">Read Full Article</a>
-                </div>
-            </div>
-        """
-        if i < len(articles) - 1:
-            html_body += '<div class="divider"></div>'
-        
-    from datetime import datetime
-    current_time = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-
-    html_body += f"""
-            </div>
-            <div class="footer">
-                <p>Thank you for reading our newsletter!</p>
-                <p class="timestamp">Sent on {current_time}</p>
-            </div>
-        </div>
-    </body>
-    </html>
+
+def _articles_html(articles):
+    rows = [_article_html(article.get("title"), article.get("url", "#"), article.get("source")) for article in articles]
+    return _DIVIDER.join(row for row in rows if row)
+
+
+@lru_cache(maxsize=1)
+def _sent_on(minute):
+    return datetime.fromtimestamp(minute * 60).strftime("%B %d, %Y at %I:%M %p")
+
+
+def build_html_email(articles, topic="News", sections=None, unsubscribe_url=None):
     """
-    return html_body
+    The digest as HTML. With sections, a list of (topic, articles) that together hold
+    articles, each topic gets its own headed block and topic is ignored. A subscriber's
+    unsubscribe_url goes in the footer.
+    """
+    if sections:
+        heading = f"Top {len(articles)} Articles"
+        subheading = " \u00b7 ".join(section_topic for section_topic, _ in sections)
+        content = "".join(
+            _SECTION_HTML.format(topic=escape(section_topic), articles=_articles_html(section_articles))
+            for section_topic, section_articles in sections
+        )
+    else:
+        heading = f"Top {len(articles)} {topic.title()} Articles"
+        subheading = "Your curated news digest, delivered fresh"
+        content = _articles_html(articles)
+    return _HEAD + _DIGEST_HTML.format(
+        heading=escape(heading),
+        subheading=escape(subheading),
+        content=content,
+        sent_on=_sent_on(int(time.time() // 60)),
+        unsubscribe=_UNSUBSCRIBE_HTML.format(url=escape(unsubscribe_url)) if unsubscribe_url else "",
+    )
+
+
+def build_text_email(articles, sections=None, unsubscribe_url=None):
+    """The plain-text part of the digest; sections and unsubscribe_url as for build_html_email."""
+    if not articles:
+        return "No education news articles found for your preferences today.\n\nPlease try again later."
+    parts = [_TEXT_HEADER]
+    for topic, section_articles in sections or [(None, articles)]:
+        if topic:
+            parts.append(f"{topic}\n{'-' * len(topic)}\n\n")
+        parts.extend(
+            f"{i}. {article['title']}\n   🔗 Full link: {article['url']}\n\n" for i, article in enumerate(section_articles, 1)
+        )
+    parts.append(_TEXT_FOOTER)
+    if unsubscribe_url:
+        parts.append(f"\n\nUnsubscribe: {unsubscribe_url}")
+    return "".join(parts)
 
-def send_email(to, subject, body, html_body=None, gemini_failed=False):
+
+def send_email(to, subject, body, html_body=None, gemini_failed=False, unsubscribe_url=None):
     from_email = os.getenv("EMAIL")
     password = os.getenv("PASS")
+    smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+    smtp_port = int(os.getenv("SMTP_PORT", "465"))
+    # SMTP_SSL=0 for a plain local relay or test sink
+    use_ssl = os.getenv("SMTP_SSL", "1") != "0"
 
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
     msg["From"] = from_email
     msg["To"] = to
+    if unsubscribe_url:
+        # RFC 8058 one-click: mail clients POST to the link, which /unsubscribe/<token> accepts
+        msg["List-Unsubscribe"] = f"<{unsubscribe_url}>"
+        msg["List-Unsubscribe-Post"] = "List-Unsubscribe=One-Click"
 
     msg.attach(MIMEText(body, 'plain', 'utf-8'))
     if html_body:
         msg.attach(MIMEText(html_body, "html", "utf-8"))
 
-    # Debug prints
-    print("[send_email] : Function called ")
-    print("Subject repr:", repr(subject))
-    print("From repr:", repr(from_email))
-    print("To repr:", repr(to))
-    print("Body length:", len(body))
-    if html_body:
-        print("HTML body length:", len(html_body))
+    logger.debug(
+        "[send_email] subject=%r from=%r to=%r body_length=%s html_length=%s",
+        subject, from_email, to, len(body), len(html_body) if html_body else 0,
+    )
+    start = time.perf_counter()
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=10) as server:
-            server.login(from_email, password)
+        smtp_class = smtplib.SMTP_SSL if use_ssl else smtplib.SMTP
+        with smtp_class(smtp_host, smtp_port, timeout=10) as server:
+            if password:
+                server.login(from_email, password)
             server.send_message(msg)
+        SMTP_SEND_SECONDS.observe(time.perf_counter() - start, status="sent")
+        EMAILS.inc(status="sent")
         if gemini_failed:
-            print(f"✅ Email sent successfully to {to} | ⚠️ Gemini key exhausted, Please renew.")
+            logger.warning("✅ Email sent successfully to %s | ⚠️ Gemini key exhausted, Please renew.", to)
         else:
-            print(f"✅ Email sent successfully to {to}")
+            logger.info("✅ Email sent successfully to %s", to)
         return True
     except Exception as e:
-        print(f"❌ Failed to send email to {to}: {e}")
+        SMTP_SEND_SECONDS.observe(time.perf_counter() - start, status="failed")
+        EMAILS.inc(status="failed")
+        logger.warning("❌ Failed to send email to %s: %s", to, e)
         return False
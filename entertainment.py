@@ -1,7 +1,21 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
+from article_record import Article
+from http_client import parse_html
+from keywords import KeywordMatcher
 from news_sources import get_session, clean_title
-import time
+from news_sitemaps import scrape_news_sitemap
+from pagination import paginate
+from source_runner import run_source
+
+logger = logging.getLogger(__name__)
+
+entertainment_keywords = [
+    "entertainment", "film", "movie", "cinema", "bollywood", "hollywood", "tollywood",
+    "box office", "trailer", "actor", "actress", "director", "celebrity", "web series",
+    "netflix", "ott", "streaming", "television", "tv", "music", "album", "song", "singer",
+    "concert", "oscar", "grammy", "emmy", "bafta", "filmfare", "k-pop", "theatre"
+]
+entertainment_matcher = KeywordMatcher(entertainment_keywords)
 
 # --- Indian Entertainment Sources (Placeholders) ---
 
@@ -10,7 +24,7 @@ def scrape_india_today_entertainment_india():
         session = get_session()
         url = "https://www.indiatoday.in/entertainment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -23,13 +37,13 @@ def scrape_india_today_entertainment_india():
                 if href.startswith('/'):
                     href = "https://www.indiatoday.in" + href
 
-                articles.append({"title": title, "url": href, "source": "India Today"})
+                articles.append(Article(title, href, "India Today"))
                 seen_titles.add(title)
-        print(f"scrape_india_today_entertainment_india: {len(articles)} articles")
+        logger.debug("scrape_india_today_entertainment_india: %s articles", len(articles))
 
         return articles
     except Exception as e:
-        print(f"Error scraping India Today Entertainment: {e}")
+        logger.warning("Error scraping India Today Entertainment: %s", e)
         return []
 
 def scrape_financial_express_entertainment_india():
@@ -37,7 +51,7 @@ def scrape_financial_express_entertainment_india():
         session = get_session()
         url = "https://www.financialexpress.com/life/entertainment/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -59,12 +73,12 @@ def scrape_financial_express_entertainment_india():
 
             if title and href and title not in seen_titles:
                 # URLs are absolute
-                articles.append({"title": title, "url": href, "source": "Financial Express"})
+                articles.append(Article(title, href, "Financial Express"))
                 seen_titles.add(title)
-        print(f"scrape_financial_express_entertainment_india: {len(articles)} articles")
+        logger.debug("scrape_financial_express_entertainment_india: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Financial Express Entertainment: {e}")
+        logger.warning("Error scraping Financial Express Entertainment: %s", e)
         return []
 
 def scrape_ndtv_entertainment_india():
@@ -72,7 +86,7 @@ def scrape_ndtv_entertainment_india():
         session = get_session()
         url = "https://www.ndtv.com/topic/entertainment-news"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -87,12 +101,12 @@ def scrape_ndtv_entertainment_india():
 
             if title and href and title not in seen_titles:
                 # URLs are already absolute
-                articles.append({"title": title, "url": href, "source": "NDTV"})
+                articles.append(Article(title, href, "NDTV"))
                 seen_titles.add(title)
-        print(f"scrape_ndtv_entertainment_india: {len(articles)} articles")
+        logger.debug("scrape_ndtv_entertainment_india: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping NDTV Entertainment: {e}")
+        logger.warning("Error scraping NDTV Entertainment: %s", e)
         return []
 
 def scrape_deccan_herald_entertainment_india():
@@ -100,7 +114,7 @@ def scrape_deccan_herald_entertainment_india():
         session = get_session()
         url = "https://www.deccanherald.com/entertainment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -117,12 +131,12 @@ def scrape_deccan_herald_entertainment_india():
                 if href.startswith('/'):
                     href = "https://www.deccanherald.com" + href
 
-                articles.append({"title": title, "url": href, "source": "Deccan Herald"})
+                articles.append(Article(title, href, "Deccan Herald"))
                 seen_titles.add(title)
-        print(f"scrape_deccan_herald_entertainment_india: {len(articles)} articles")
+        logger.debug("scrape_deccan_herald_entertainment_india: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Deccan Herald Entertainment: {e}")
+        logger.warning("Error scraping Deccan Herald Entertainment: %s", e)
         return []
 
 def scrape_hindustan_times_entertainment_india():
@@ -130,7 +144,7 @@ def scrape_hindustan_times_entertainment_india():
         session = get_session()
         url = "https://www.hindustantimes.com/entertainment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -141,12 +155,12 @@ def scrape_hindustan_times_entertainment_india():
             if title and href and title not in seen_titles:
                 if href.startswith('/'):
                     href = "https://www.hindustantimes.com" + href
-                articles.append({"title": title, "url": href, "source": "Hindustan Times"})
+                articles.append(Article(title, href, "Hindustan Times"))
                 seen_titles.add(title)
-        print(f"scrape_hindustan_times_entertainment_india: {len(articles)} articles")
+        logger.debug("scrape_hindustan_times_entertainment_india: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Hindustan Times Entertainment: {e}")
+        logger.warning("Error scraping Hindustan Times Entertainment: %s", e)
         return []
 
 def scrape_times_of_india_entertainment_india():
@@ -154,7 +168,7 @@ def scrape_times_of_india_entertainment_india():
         session = get_session()
         url = "https://timesofindia.indiatimes.com/entertainment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -167,12 +181,12 @@ def scrape_times_of_india_entertainment_india():
             if title and href and title not in seen_titles:
                 if not href.startswith('http'):
                     href = "https://timesofindia.indiatimes.com" + href
-                articles.append({"title": title, "url": href, "source": "Times of India"})
+                articles.append(Article(title, href, "Times of India"))
                 seen_titles.add(title)
-        print(f"scrape_times_of_india_entertainment_india: {len(articles)} articles")
+        logger.debug("scrape_times_of_india_entertainment_india: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Times of India Entertainment: {e}")
+        logger.warning("Error scraping Times of India Entertainment: %s", e)
         return []
 
 def scrape_indian_express_entertainment_india():
@@ -180,7 +194,7 @@ def scrape_indian_express_entertainment_india():
         session = get_session()
         url = "https://indianexpress.com/section/entertainment/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -189,48 +203,48 @@ def scrape_indian_express_entertainment_india():
             href = link.get('href', '')
 
             if title and href and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "Indian Express"})
+                articles.append(Article(title, href, "Indian Express"))
                 seen_titles.add(title)
-        print(f"scrape_indian_express_entertainment_india: {len(articles)} articles")
+        logger.debug("scrape_indian_express_entertainment_india: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Indian Express Entertainment: {e}")
+        logger.warning("Error scraping Indian Express Entertainment: %s", e)
         return []
 
 def scrape_the_hindu_entertainment_india():
-    articles = []
     seen_titles = set()
     session = get_session()
 
-    try:
-        for page in range(1, 5):
-            url = f"https://www.thehindu.com/entertainment/?page={page}"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            for link in soup.select('h3.title > a, h2.title > a'):
-                title = clean_title(link.get_text())
-                href = link.get('href', '')
-
-                if title and href and title not in seen_titles:
-                    articles.append({"title": title, "url": href, "source": "The Hindu"})
-                    seen_titles.add(title)
-        print(f"scrape_the_hindu_entertainment_india: {len(articles)} articles")
+    def parse_page(response):
+        articles = []
+        soup = parse_html(response)
+
+        for link in soup.select('h3.title > a, h2.title > a'):
+            title = clean_title(link.get_text())
+            href = link.get('href', '')
+
+            if title and href and title not in seen_titles:
+                articles.append(Article(title, href, "The Hindu"))
+                seen_titles.add(title)
         return articles
+
+    try:
+        page_urls = [f"https://www.thehindu.com/entertainment/?page={page}" for page in range(1, 5)]
+        return paginate(session, page_urls, parse_page, "scrape_the_hindu_entertainment_india")
     except Exception as e:
-        print(f"Error scraping The Hindu Entertainment: {e}")
+        logger.warning("Error scraping The Hindu Entertainment: %s", e)
         return []
 
 # --- Global Entertainment Sources (Placeholders) ---
 
 def scrape_bbc_entertainment_global():
-    print("Scraping function missing for BBC Entertainment (Global)")
+    logger.warning("Scraping function missing for BBC Entertainment (Global)")
     # To-do: Add scraping logic here
     
     return []
 
 def scrape_guardian_film_global():
-    print("Scraping function missing for The Guardian Film (Global)...")
+    logger.warning("Scraping function missing for The Guardian Film (Global)...")
     # To-do: Add scraping logic here
     return []
 
@@ -239,7 +253,7 @@ def scrape_washington_post_entertainment_global():
         session = get_session()
         url = "https://www.washingtonpost.com/entertainment/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -250,20 +264,25 @@ def scrape_washington_post_entertainment_global():
             title = clean_title(p_tag.get_text())
             href = a_tag.get('href', '')
             if title and href and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "Washington Post"})
+                articles.append(Article(title, href, "Washington Post"))
                 seen_titles.add(title)
-        print(f"scrape_washington_post_entertainment_global: {len(articles)} articles")
+        logger.debug("scrape_washington_post_entertainment_global: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Washington Post Entertainment: {e}")
+        logger.warning("Error scraping Washington Post Entertainment: %s", e)
         return []
 
+def scrape_washington_post_entertainment_sitemap_global():
+    return scrape_news_sitemap(
+        "https://www.washingtonpost.com/arcio/news-sitemap/", "Washington Post", path_filter="/entertainment/"
+    )
+
 def scrape_cnn_entertainment_global():
     try:
         session = get_session()
         url = "https://edition.cnn.com/entertainment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         # Both structures use a.container__link--type-article
@@ -276,15 +295,15 @@ def scrape_cnn_entertainment_global():
             if title and href and title not in seen_titles:
                 if href.startswith('/'):
                     href = 'https://edition.cnn.com' + href
-                articles.append({"title": title, "url": href, "source": "CNN Entertainment"})
+                articles.append(Article(title, href, "CNN Entertainment"))
                 seen_titles.add(title)
-        print(f"scrape_cnn_entertainment_global: {len(articles)} articles")
+        logger.debug("scrape_cnn_entertainment_global: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping CNN Entertainment: {e}")
+        logger.warning("Error scraping CNN Entertainment: %s", e)
         return []
 
-def scrape_entertainment_news(region="India", sources=None):
+def scrape_entertainment_news(region="India", sources=None, exclude=()):
     """
     Scrapes entertainment news from various sources based on the selected region.
     """
@@ -304,6 +323,7 @@ def scrape_entertainment_news(region="India", sources=None):
         "bbc_entertainment": scrape_bbc_entertainment_global,
         "guardian_film": scrape_guardian_film_global,
         "washington_post_entertainment": scrape_washington_post_entertainment_global,
+        "washington_post_entertainment_sitemap": scrape_washington_post_entertainment_sitemap_global,
         "cnn_entertainment": scrape_cnn_entertainment_global,
     }
 
@@ -315,16 +335,17 @@ def scrape_entertainment_news(region="India", sources=None):
     if sources is None:
         sources = list(source_map.keys())
 
+    sources = [src for src in sources if src not in exclude]
+
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                src_articles = func()
-                print(f"Entertainment ({region} - {src}): {len(src_articles)} articles")
+                src_articles = run_source("entertainment", region, src, func)
+                logger.info("Entertainment (%s - %s): %s articles", region, src, len(src_articles))
                 all_articles.extend(src_articles)
-                time.sleep(1) # Be polite
             except Exception as e:
-                print(f"Error in scrape_entertainment_news for source {src}: {e}")
+                logger.warning("Error in scrape_entertainment_news for source %s: %s", src, e)
 
     return all_articles
 
@@ -1,13 +1,17 @@
-import time
+import logging
+from article_record import Article
 import requests
-from time import sleep
-from bs4 import BeautifulSoup
+from urllib.parse import urlencode
+from http_client import NewsSession, parse_html
+from pagination import paginate
+from source_runner import run_source
+from keywords import KeywordMatcher
+from text_normalization import clean_text
 
-def clean_text(text: str) -> str:
-    return ' '.join(text.strip().split())
+logger = logging.getLogger(__name__)
 
 def get_http_session() -> requests.Session:
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     return session
 
@@ -30,6 +34,7 @@ environment_keywords = [
     "nature", "natural disaster", "sanctuary", "project tiger", "plastic ban",
     "pollution control board", "jal shakti", "climate action", "unfccc", "paris agreement"
 ]
+environment_matcher = KeywordMatcher(environment_keywords)
 
 #--------INDIAN NEWS-------------------
 
@@ -38,7 +43,7 @@ def scrape_deccan_herald():
         session = get_http_session()
         url = "https://www.deccanherald.com/specials/environment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         for card in soup.find_all('div', class_='story-card-15'):
@@ -46,7 +51,7 @@ def scrape_deccan_herald():
             if not headline:
                 continue
             title = normalize_title(headline.text)
-            if not any(keyword in title.lower() for keyword in environment_keywords):
+            if not environment_matcher.matches(title):
                 continue
             a_tag = headline.find_parent('a')
             if not a_tag:
@@ -54,7 +59,7 @@ def scrape_deccan_herald():
             href = a_tag.get('href', '')
             full_url = f"https://www.deccanherald.com{href}" if href.startswith('/') else href
             if title not in seen_titles:
-                articles.append({"title": title, "url": full_url, "source": "Deccan Herald"})
+                articles.append(Article(title, full_url, "Deccan Herald"))
                 seen_titles.add(title)
         return articles
     except Exception:
@@ -66,7 +71,7 @@ def scrape_indian_express():
         session = get_http_session()
         url = "https://indianexpress.com/about/environment/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         for h3 in soup.find_all('h3'):
@@ -79,9 +84,9 @@ def scrape_indian_express():
             if '/environment/' not in href:
                 continue
             if title and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "Indian Express"})
+                articles.append(Article(title, href, "Indian Express"))
                 seen_titles.add(title)
-        print(f"scrape_indian_express: {len(articles)} articles")
+        logger.debug("scrape_indian_express: %s articles", len(articles))
         return articles
     except Exception:
         return []
@@ -91,22 +96,22 @@ def scrape_ndtv():
         session = get_http_session()
         url = "https://www.ndtv.com/topic/environment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         for tag in soup.select("h2 a, h3 a"):
             title = normalize_title(tag.get_text())
             href = tag.get("href", "")
-            if not any(kw in title.lower() for kw in environment_keywords):
+            if not environment_matcher.matches(title):
                 continue
             if title and title not in seen_titles and href:
                 if href.startswith("/"):
                     href = "https://www.ndtv.com" + href
                 elif not href.startswith("http"):
                     continue
-                articles.append({"title": title, "url": href, "source": "NDTV"})
+                articles.append(Article(title, href, "NDTV"))
                 seen_titles.add(title)
-        print(f"scrape_ndtv: {len(articles)} articles")
+        logger.debug("scrape_ndtv: %s articles", len(articles))
         return articles
     except Exception:
         return []
@@ -118,7 +123,7 @@ def scrape_hindustan_times():
     try:
         url = "https://www.hindustantimes.com/topic/environment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         # Find all article containers with the new class
         for div in soup.find_all('div', class_='cartHolder'):
             h2 = div.find('h2', class_='hdg3')
@@ -131,14 +136,14 @@ def scrape_hindustan_times():
             href = a_tag['href']
             if not href.startswith('http'):
                 href = f"https://www.hindustantimes.com{href}" if href.startswith('/') else f"https://www.hindustantimes.com/{href}"
-            if title and title not in seen_titles and any(kw in title.lower() for kw in environment_keywords):
-                articles.append({"title": title, "url": href, "source": "Hindustan Times"})
+            if title and title not in seen_titles and environment_matcher.matches(title):
+                articles.append(Article(title, href, "Hindustan Times"))
                 seen_titles.add(title)
             if len(articles) >= 10:
                 break
         return articles
     except Exception as e:
-        print(f"scrape_hindustan_times error: {e}")
+        logger.warning("scrape_hindustan_times error: %s", e)
         return []
 
 def scrape_times_of_india_environment():
@@ -147,7 +152,7 @@ def scrape_times_of_india_environment():
         session = get_http_session()
         url = "https://timesofindia.indiatimes.com/home/environment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         # First structure: <ul class="list5 clearfix">
@@ -163,8 +168,8 @@ def scrape_times_of_india_environment():
                 href = a_tag["href"]
                 if not href.startswith("http"):
                     href = f"https://timesofindia.indiatimes.com{href}"
-                if title and title not in seen_titles and any(kw in title.lower() for kw in environment_keywords):
-                    articles.append({"title": title, "url": href, "source": "Times of India"})
+                if title and title not in seen_titles and environment_matcher.matches(title):
+                    articles.append(Article(title, href, "Times of India"))
                     seen_titles.add(title)
         # Second structure: <ul id="content" class="top-newslist clearfix">
         content_ul = soup.find("ul", id="content", class_="top-newslist clearfix")
@@ -180,12 +185,12 @@ def scrape_times_of_india_environment():
                 href = a_tag["href"]
                 if not href.startswith("http"):
                     href = f"https://timesofindia.indiatimes.com{href}"
-                if title and title not in seen_titles and any(kw in title.lower() for kw in environment_keywords):
-                    articles.append({"title": title, "url": href, "source": "Times of India"})
+                if title and title not in seen_titles and environment_matcher.matches(title):
+                    articles.append(Article(title, href, "Times of India"))
                     seen_titles.add(title)
         return articles
     except Exception as e:
-        print(f"scrape_times_of_india_environment error: {e}")
+        logger.warning("scrape_times_of_india_environment error: %s", e)
         return []
 
 #--------GLOBAL NEWS-------------------
@@ -195,9 +200,9 @@ def scrape_cnbc():
     url = "https://www.cnbc.com/environment/"
     headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         for card in soup.find_all("div", attrs={"data-test": "Card"}):
@@ -206,42 +211,40 @@ def scrape_cnbc():
                 title = clean_text(title_tag.text)
                 href = title_tag['href']
                 if title not in seen_titles:
-                    articles.append({"title": title, "url": href, "source": "CNBC"})
+                    articles.append(Article(title, href, "CNBC"))
                     seen_titles.add(title)
-        print(f"scrape_cnbc: {len(articles)} articles")
+        logger.debug("scrape_cnbc: %s articles", len(articles))
         return articles
     except Exception:
         return []
 
-def scrape_euronews(query="environment", max_pages=3, delay=0.3):
+def scrape_euronews(query="environment", max_pages=3):
     api_url = "https://www.euronews.com/api/search"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    articles = []
-    for page in range(1, max_pages + 1):
-        params = {"query": query, "page": page, "size": 10}
+
+    def parse_page(res):
+        articles = []
         try:
-            res = requests.get(api_url, headers=headers, params=params, timeout=15)
-            res.raise_for_status()
             results = res.json()
-            if not isinstance(results, list) or not results:
-                break
-        except Exception:
-            break
+        except ValueError:
+            return articles
+        if not isinstance(results, list):
+            return articles
         for item in results:
             title = clean_text(item.get("title", ""))
             url = ensure_absolute_url(item.get("url", ""))
             if title and url:
-                articles.append({"title": title, "url": url, "source": "Euronews"})
-        sleep(delay)
-    print(f"scrape_euronews: {len(articles)} articles")
-    return articles
+                articles.append(Article(title, url, "Euronews"))
+        return articles
+
+    page_urls = [f"{api_url}?{urlencode({'query': query, 'page': page, 'size': 10})}" for page in range(1, max_pages + 1)]
+    return paginate(get_http_session(), page_urls, parse_page, "scrape_euronews")
 
 def scrape_guardian():
     try:
         session = get_http_session()
         url = "https://www.theguardian.com/environment"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         for tag in soup.select('a[aria-label]'):
@@ -249,15 +252,15 @@ def scrape_guardian():
             href = tag.get("href", "")
             if title and href and "/202" in href and title not in seen_titles:
                 full_url = href if href.startswith("http") else "https://www.theguardian.com" + href
-                articles.append({"title": title, "url": full_url, "source": "The Guardian"})
+                articles.append(Article(title, full_url, "The Guardian"))
                 seen_titles.add(title)
-        print(f"scrape_guardian: {len(articles)} articles")
+        logger.debug("scrape_guardian: %s articles", len(articles))
         return articles
     except Exception:
         return []
 
 
-def scrape_environment_news(region="India", sources=None):
+def scrape_environment_news(region="India", sources=None, exclude=()):
     india_source_map = {
         "deccan_herald": scrape_deccan_herald,
         "indian_express": scrape_indian_express,
@@ -277,15 +280,16 @@ def scrape_environment_news(region="India", sources=None):
     if sources is None:
         sources = list(source_map.keys())
     all_articles = []
+    sources = [src for src in sources if src not in exclude]
+
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                # euronews takes a query, others do not
-                src_articles = func() if src != "euronews" else func()
+                src_articles = run_source("environment", region, src, func)
                 all_articles.extend(src_articles)
             except Exception as e:
-                print(f"Error in scrape_environment_news for source {src}: {e}")
+                logger.warning("Error in scrape_environment_news for source %s: %s", src, e)
     return all_articles
 
 if __name__ == "__main__":
@@ -1,5 +1,13 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
+from article_record import Article
+from http_client import NewsSession, parse_html
+from news_sitemaps import scrape_news_sitemap
+from pagination import paginate
+from source_runner import run_source
+from keywords import KeywordMatcher
+from text_normalization import clean_text
+
+logger = logging.getLogger(__name__)
 
 health_keywords = [
     "health", "mental health", "public health", "healthcare", "medicine", "doctor",
@@ -9,61 +17,56 @@ health_keywords = [
     "diabetes", "neurology", "orthopedic", "psychiatry", "nutrition", "therapy",
     "ayurveda", "homeopathy", "pharma", "pharmaceutical", "biotech", "AIIMS", "MBBS"
 ]
+health_matcher = KeywordMatcher(health_keywords)
 
 def get_session():
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     return session
 
-def clean_title(text):
-    return ' '.join(text.strip().split())
-
 def scrape_hindustan_times_health():
-    articles = []
     seen_titles = set()
     session = get_session()
 
+    def parse_page(response):
+        articles = []
+        soup = parse_html(response)
+
+        # Select articles based on the updated expected structure
+        for div in soup.select('div.cartHolder.listView.track'):
+            a_tag = div.find("a", class_="storyLink articleClick", href=True)
+            h3_tag = div.find("h3", class_="hdg3")
+            if a_tag and h3_tag:
+                title = clean_text(h3_tag.get_text())
+                href = a_tag["href"]
+
+                if href.startswith('/'):
+                    href = "https://www.hindustantimes.com" + href
+
+                if title and title not in seen_titles:
+                    articles.append(Article(title, href, "Hindustan Times"))
+                    seen_titles.add(title)
+        return articles
+
     try:
         # Scraping pages 1 to 4
-        for page in range(1, 5):
-            url = f"https://www.hindustantimes.com/lifestyle/health/page-{page}"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Select articles based on the updated expected structure
-            for div in soup.select('div.cartHolder.listView.track'):
-                a_tag = div.find("a", class_="storyLink articleClick", href=True)
-                h3_tag = div.find("h3", class_="hdg3")
-                if a_tag and h3_tag:
-                    title = clean_title(h3_tag.get_text())
-                    href = a_tag["href"]
-
-                    if href.startswith('/'):
-                        href = "https://www.hindustantimes.com" + href
-
-                    if title and title not in seen_titles:
-                        articles.append({
-                            "title": title,
-                            "url": href,
-                            "source": "Hindustan Times"
-                        })
-                        seen_titles.add(title)
+        page_urls = [f"https://www.hindustantimes.com/lifestyle/health/page-{page}" for page in range(1, 5)]
+        articles = paginate(session, page_urls, parse_page, "scrape_hindustan_times_health")
 
         if not articles:
-            print("No articles found for Hindustan Times in the health section.")
+            logger.warning("No articles found for Hindustan Times in the health section.")
 
-        print(f"scrape_hindustan_times_health: {len(articles)} articles")
         return articles
 
     except Exception as e:
-        print(f"Error scraping Hindustan Times Health: {e}")
+        logger.warning("Error scraping Hindustan Times Health: %s", e)
         return []
 def scrape_times_of_india_health():
     try:
         session = get_session()
         url = "https://timesofindia.indiatimes.com/life-style/health-fitness/health-news"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
 
         articles = []
         seen_titles = set()
@@ -71,32 +74,28 @@ def scrape_times_of_india_health():
         for box in soup.select("div.md_news_box"):
             a_tag = box.find("a", href=True, title=True)
             if a_tag:
-                title = clean_title(a_tag.get_text())
+                title = clean_text(a_tag.get_text())
                 href = a_tag["href"]
                 if href.startswith("/"):
                     href = "https://timesofindia.indiatimes.com" + href
                 if title and title not in seen_titles:
-                    articles.append({
-                        "title": title,
-                        "url": href,
-                        "source": "Times of India"
-                    })
+                    articles.append(Article(title, href, "Times of India"))
                     seen_titles.add(title)
-        print(f"scrape_times_of_india_health: {len(articles)} articles")
+        logger.debug("scrape_times_of_india_health: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping Times of India Health News: {e}")
+        logger.warning("Error scraping Times of India Health News: %s", e)
         return []
 
 def scrape_times_now_health():
     articles = []
     seen_titles = set()
-    session = requests.Session()  # Use session for persistent connections
+    session = NewsSession()  # Use session for persistent connections
     url = "https://www.timesnownews.com/health"  # Base URL for Times Now health news
     try:
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         # Find articles in the provided HTML structure
         for item in soup.find_all('li', class_="_2LXp"):
             a_tag = item.find('a', href=True)
@@ -106,12 +105,12 @@ def scrape_times_now_health():
             title = a_tag.find('h3', class_="_3p7u").get_text(strip=True)
             href = a_tag['href']
             if title and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "Times Now"})
+                articles.append(Article(title, href, "Times Now"))
                 seen_titles.add(title)
-        print(f"scrape_times_now_health: {len(articles)} articles")
+        logger.debug("scrape_times_now_health: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Times Now health articles: {e}")
+        logger.warning("Error scraping Times Now health articles: %s", e)
         return []
 
 def indian_express_health():
@@ -119,7 +118,7 @@ def indian_express_health():
         session = get_session()
         url = "https://indianexpress.com/section/lifestyle/health/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
 
         articles = []
         seen_titles = set()
@@ -129,24 +128,20 @@ def indian_express_health():
             if not title_tag:
                 continue
 
-            title = clean_title(title_tag.get_text())
+            title = clean_text(title_tag.get_text())
             href = title_tag.get("href")
 
             if not href.startswith("http"):
                 href = "https://indianexpress.com" + href
 
             if title and href and title not in seen_titles:
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Indian Express"
-                })
+                articles.append(Article(title, href, "Indian Express"))
                 seen_titles.add(title)
-        print(f"indian_express_health: {len(articles)} articles")
+        logger.debug("indian_express_health: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping Indian Express Health: {e}")
+        logger.warning("Error scraping Indian Express Health: %s", e)
         return []
 
 def scrape_bbc_health():
@@ -154,7 +149,7 @@ def scrape_bbc_health():
         session = get_session()
         url = "https://www.bbc.com/news/health"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
 
         articles = []
         seen_titles = set()
@@ -164,11 +159,11 @@ def scrape_bbc_health():
             if not title_tag:
                 continue
 
-            title = clean_title(title_tag.get_text())
+            title = clean_text(title_tag.get_text())
             href = a_tag.get("href")
 
             # Skip if title is not health-related
-            if not any(kw in title.lower() for kw in health_keywords):
+            if not health_matcher.matches(title):
                 continue
 
             # Add prefix if href is relative
@@ -176,17 +171,13 @@ def scrape_bbc_health():
                 href = "https://www.bbc.com" + href
 
             if title and href and title not in seen_titles:
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "BBC"
-                })
+                articles.append(Article(title, href, "BBC"))
                 seen_titles.add(title)
-        print(f"scrape_bbc_health: {len(articles)} articles")
+        logger.debug("scrape_bbc_health: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping BBC Health: {e}")
+        logger.warning("Error scraping BBC Health: %s", e)
         return []
 
 def scrape_guardian_health():
@@ -194,7 +185,7 @@ def scrape_guardian_health():
         session = get_session()
         url = "https://www.theguardian.com/society/health"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
 
         articles = []
         seen_titles = set()
@@ -207,7 +198,7 @@ def scrape_guardian_health():
                 continue
 
             # Filter by keyword
-            if not any(kw in title.lower() for kw in health_keywords):
+            if not health_matcher.matches(title):
                 continue
 
             # Fix relative links
@@ -215,17 +206,13 @@ def scrape_guardian_health():
                 href = "https://www.theguardian.com" + href
 
             if title not in seen_titles:
-                articles.append({
-                    "title": clean_title(title),
-                    "url": href,
-                    "source": "The Guardian"
-                })
+                articles.append(Article(clean_text(title), href, "The Guardian"))
                 seen_titles.add(title)
-        print(f"scrape_guardian_health: {len(articles)} articles")
+        logger.debug("scrape_guardian_health: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping The Guardian Health: {e}")
+        logger.warning("Error scraping The Guardian Health: %s", e)
         return []
 
 def scrape_nytimes_health():
@@ -233,7 +220,7 @@ def scrape_nytimes_health():
         session = get_session()
         url = "https://www.nytimes.com/international/section/health"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
 
         articles = []
         seen_titles = set()
@@ -243,19 +230,15 @@ def scrape_nytimes_health():
             a_tag = h3_tag.find("a", href=True)
             if not a_tag:
                 continue
-            title = clean_title(a_tag.get_text())
+            title = clean_text(a_tag.get_text())
             href = a_tag["href"]
 
-            if not any(kw in title.lower() for kw in health_keywords):
+            if not health_matcher.matches(title):
                 continue
             if href.startswith("/"):
                 href = "https://www.nytimes.com" + href
             if title and href and title not in seen_titles:
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "New York Times"
-                })
+                articles.append(Article(title, href, "New York Times"))
                 seen_titles.add(title)
 
         # Pattern 2
@@ -263,34 +246,36 @@ def scrape_nytimes_health():
             h3_tag = a_tag.find("h3")
             if not h3_tag:
                 continue
-            title = clean_title(h3_tag.get_text())
+            title = clean_text(h3_tag.get_text())
             href = a_tag["href"]
 
-            if not any(kw in title.lower() for kw in health_keywords):
+            if not health_matcher.matches(title):
                 continue
             if href.startswith("/"):
                 href = "https://www.nytimes.com" + href
             if title and href and title not in seen_titles:
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "New York Times"
-                })
+                articles.append(Article(title, href, "New York Times"))
                 seen_titles.add(title)
-        print(f"scrape_nytimes_health: {len(articles)} articles")
+        logger.debug("scrape_nytimes_health: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping New York Times Health: {e}")
+        logger.warning("Error scraping New York Times Health: %s", e)
         return []
 
 
+def scrape_nytimes_health_sitemap():
+    return scrape_news_sitemap(
+        "https://www.nytimes.com/sitemaps/new/news.xml.gz", "New York Times", path_filter="/health/"
+    )
+
+
 def scrape_bloomberg_health():
     try:
         session = get_session()
         url = "https://www.bloomberg.com/industries/health"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
 
         articles = []
         seen_titles = set()
@@ -300,20 +285,16 @@ def scrape_bloomberg_health():
             title_tag = a_tag.select_one("[data-testid='headline'] span")
             if not title_tag:
                 continue
-            title = clean_title(title_tag.get_text())
+            title = clean_text(title_tag.get_text())
             href = a_tag.get("href", "")
             if not href.startswith("http"):
                 href = "https://www.bloomberg.com" + href
 
-            if not any(kw in title.lower() for kw in health_keywords):
+            if not health_matcher.matches(title):
                 continue
 
             if title not in seen_titles:
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Bloomberg"
-                })
+                articles.append(Article(title, href, "Bloomberg"))
                 seen_titles.add(title)
 
         # Pattern 2 — anchor with class `StoryBlock_storyLink__5nXw8`
@@ -321,30 +302,26 @@ def scrape_bloomberg_health():
             title_tag = a_tag.select_one("div[data-testid='headline'] span")
             if not title_tag:
                 continue
-            title = clean_title(title_tag.get_text())
+            title = clean_text(title_tag.get_text())
             href = a_tag.get("href", "")
             if not href.startswith("http"):
                 href = "https://www.bloomberg.com" + href
 
-            if not any(kw in title.lower() for kw in health_keywords):
+            if not health_matcher.matches(title):
                 continue
 
             if title not in seen_titles:
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Bloomberg"
-                })
+                articles.append(Article(title, href, "Bloomberg"))
                 seen_titles.add(title)
-        print(f"scrape_bloomberg_health: {len(articles)} articles")
+        logger.debug("scrape_bloomberg_health: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping Bloomberg Health: {e}")
+        logger.warning("Error scraping Bloomberg Health: %s", e)
         return []
 
 
-def scrape_health_news(region="India", sources=None):
+def scrape_health_news(region="India", sources=None, exclude=()):
     all_articles = []
 
     india_source_map = {
@@ -359,6 +336,7 @@ def scrape_health_news(region="India", sources=None):
         "bbc": scrape_bbc_health,
         "guardian": scrape_guardian_health,
         "nyt": scrape_nytimes_health,
+        "nyt_sitemap": scrape_nytimes_health_sitemap,
         "bloomberg": scrape_bloomberg_health
     }
 
@@ -367,15 +345,17 @@ def scrape_health_news(region="India", sources=None):
     if sources is None:
         sources = list(source_map.keys())
 
+    sources = [src for src in sources if src not in exclude]
+
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                src_articles = func()
-                print(f"Health News ({region} - {src}): {len(src_articles)} articles")
+                src_articles = run_source("health", region, src, func)
+                logger.info("Health News (%s - %s): %s articles", region, src, len(src_articles))
                 all_articles.extend(src_articles)
             except Exception as e:
-                print(f"Error in scrape_health_news for source {src}: {e}")
+                logger.warning("Error in scrape_health_news for source %s: %s", src, e)
 
     return all_articles 
 
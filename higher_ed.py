@@ -1,9 +1,15 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
+from article_record import Article
+from http_client import NewsSession, parse_html
 from bs4.element import Tag as Bs4Tag  # ✅ Pyright-compatible Tag
 
-from typing import List, Dict, Optional, Any
-import time
+from typing import List, Optional, Any
+from pagination import paginate
+from source_runner import run_source
+from keywords import KeywordMatcher
+from text_normalization import clean_text
+
+logger = logging.getLogger(__name__)
 
 higher_ed_keywords = [
     "university", "universities", "college", "higher education", "phd",
@@ -14,10 +20,11 @@ higher_ed_keywords = [
     "resume", "placement", "internship", "gate", "cat", "mat", "xat", "ugc",
     "net", "cuet", "nift", "nlu", "nlsiu", "scholarship", "fellowship"
 ]
+higher_ed_matcher = KeywordMatcher(higher_ed_keywords)
 
 
 def get_session():
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({
         "User-Agent":
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/114.0.0.0 Safari/537.36"
@@ -25,12 +32,8 @@ def get_session():
     return session
 
 
-def clean_title(title: Optional[Any]) -> str:
-    return str(title or "").strip().replace("\n", "").replace("\r", "")
-
-
 def is_valid_keyword(text: Optional[str]) -> bool:
-    return isinstance(text, str) and any(kw in text.lower() for kw in higher_ed_keywords)
+    return isinstance(text, str) and higher_ed_matcher.matches(text)
 
 
 def safe_href(href: Any) -> str:
@@ -50,15 +53,15 @@ def extract_text(tag: Any) -> str:
     return ""
 
 
-def scrape_toi_links() -> List[Dict[str, str]]:
+def scrape_toi_links() -> List[Article]:
     try:
         session = get_session()
         response = session.get("https://timesofindia.indiatimes.com/topic/education", timeout=15)
         if response.status_code != 200:
-            print("Failed to fetch TOI page. Status:", response.status_code)
+            logger.warning("Failed to fetch TOI page. Status: %s", response.status_code)
             return []
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         for div in soup.find_all("div", class_="uwU81"):
@@ -76,59 +79,50 @@ def scrape_toi_links() -> List[Dict[str, str]]:
 
             classification = "Higher Education" if is_valid_keyword(title) else "Other"
 
-            articles.append({
-                "title": title,
-                "url": full_url,
-                "source": "TOI",
-                "classification": classification
-            })
-        print(f"scrape_toi_links: {len(articles)} articles")
+            articles.append(Article(title, full_url, "TOI", classification=classification))
+        logger.debug("scrape_toi_links: %s articles", len(articles))
         return articles
 
     
     except Exception as e:
-        print(f"Error scraping TOI: {e}")
+        logger.warning("Error scraping TOI: %s", e)
         return []
 
 
-def scrape_deccan_herald_higher_ed() -> List[Dict]:
+def scrape_deccan_herald_higher_ed() -> List[Article]:
     try:
         session = get_session()
         url = "https://www.deccanherald.com/tags/higher-education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         seen = set()
         articles = []
 
         for tag in soup.select('a .headline, .article-title a, h2 a, h3 a'):
             a_tag = tag.find_parent('a') if isinstance(tag, Bs4Tag) and tag.name != 'a' else tag
-            title = clean_title(extract_text(tag))
+            title = clean_text(extract_text(tag))
             href = extract_href(a_tag)
             if is_valid_keyword(title) and title not in seen:
                 if href.startswith("/"):
                     href = "https://www.deccanherald.com" + href
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Deccan Herald"
-                })
+                articles.append(Article(title, href, "Deccan Herald"))
                 seen.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping DH: {e}")
+        logger.warning("Error scraping DH: %s", e)
         return []
 
 
-def scrape_financial_express_higher_ed() -> List[Dict[str, str]]:
+def scrape_financial_express_higher_ed() -> List[Article]:
     try:
         session = get_session()
         url = "https://www.financialexpress.com/about/higher-education/"
         response = session.get(url, timeout=15)
         if response.status_code != 200:
-            print("Failed to fetch Financial Express page. Status:", response.status_code)
+            logger.warning("Failed to fetch Financial Express page. Status: %s", response.status_code)
             return []
 
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen = set()
 
@@ -136,141 +130,121 @@ def scrape_financial_express_higher_ed() -> List[Dict[str, str]]:
             if not isinstance(tag, Bs4Tag):
                 continue
 
-            title = clean_title(tag.get_text())
+            title = clean_text(tag.get_text())
             href = tag.get("href", "")
 
             if not isinstance(href, str) or not href.startswith("http"):
                 continue
 
             if is_valid_keyword(title) and title not in seen:
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Financial Express"
-                })
+                articles.append(Article(title, href, "Financial Express"))
                 seen.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Financial Express: {e}")
+        logger.warning("Error scraping Financial Express: %s", e)
         return []
 
 
-def scrape_indian_express_higher_ed() -> List[Dict]:
+def scrape_indian_express_higher_ed() -> List[Article]:
     try:
         session = get_session()
         url = "https://indianexpress.com/about/higher-education/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         seen = set()
         articles = []
 
         for tag in soup.select('h3 a, h2 a'):
-            title = clean_title(extract_text(tag))
+            title = clean_text(extract_text(tag))
             href = extract_href(tag)
             if is_valid_keyword(title) and title not in seen:
                 if href.startswith("/"):
                     href = "https://indianexpress.com" + href
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Indian Express"
-                })
+                articles.append(Article(title, href, "Indian Express"))
                 seen.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping IE: {e}")
+        logger.warning("Error scraping IE: %s", e)
         return []
 
 
-def scrape_times_higher_education_global() -> List[Dict]:
+def scrape_times_higher_education_global() -> List[Article]:
     try:
         session = get_session()
         url = "https://www.timeshighereducation.com/academic/news"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         seen = set()
         articles = []
 
         for tag in soup.select('a[data-position="teaser-card"]'):
             h3 = tag.find('h3', class_='teaser-card__title') if isinstance(tag, Bs4Tag) else None
-            title = clean_title(extract_text(h3))
+            title = clean_text(extract_text(h3))
             href = extract_href(tag)
             if title and href and title not in seen:
                 if href.startswith("/"):
                     href = "https://www.timeshighereducation.com" + href
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Times Higher Education"
-                })
+                articles.append(Article(title, href, "Times Higher Education"))
                 seen.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping THE: {e}")
+        logger.warning("Error scraping THE: %s", e)
         return []
 
 
-def scrape_inside_higher_ed_global() -> List[Dict]:
+def scrape_inside_higher_ed_global() -> List[Article]:
     try:
         session = get_session()
         seen = set()
-        articles = []
 
-        for page in range(1, 4):
-            url = f"https://www.insidehighered.com/news?page={page}"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
+        def parse_page(response) -> List[Article]:
+            articles = []
+            soup = parse_html(response)
 
             for h4 in soup.find_all('h4'):
                 a = h4.find('a') if isinstance(h4, Bs4Tag) else None
                 span = a.find('span') if isinstance(a, Bs4Tag) else None
-                title = clean_title(extract_text(span))
+                title = clean_text(extract_text(span))
                 href = extract_href(a)
                 if title and href and title not in seen:
                     if href.startswith("/"):
                         href = "https://www.insidehighered.com" + href
-                    articles.append({
-                        "title": title,
-                        "url": href,
-                        "source": "Inside Higher Ed"
-                    })
+                    articles.append(Article(title, href, "Inside Higher Ed"))
                     seen.add(title)
-            time.sleep(1)
-        return articles
+            return articles
+
+        page_urls = [f"https://www.insidehighered.com/news?page={page}" for page in range(1, 4)]
+        return paginate(session, page_urls, parse_page, "scrape_inside_higher_ed_global")
     except Exception as e:
-        print(f"Error scraping IHE: {e}")
+        logger.warning("Error scraping IHE: %s", e)
         return []
 
 
-def scrape_guardian_higher_ed_global() -> List[Dict]:
+def scrape_guardian_higher_ed_global() -> List[Article]:
     try:
         session = get_session()
         url = "https://www.theguardian.com/education/higher-education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         seen = set()
         articles = []
 
         for tag in soup.select('a[aria-label]'):
-            title = clean_title(tag.get("aria-label", ""))
+            title = clean_text(tag.get("aria-label", ""))
             href = extract_href(tag)
             if title and href and '/202' in href and title not in seen:
                 if not href.startswith("http"):
                     href = "https://www.theguardian.com" + href
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "The Guardian"
-                })
+                articles.append(Article(title, href, "The Guardian"))
                 seen.add(title)
         return articles
     except Exception as e:
-        print(f"Error scraping Guardian: {e}")
+        logger.warning("Error scraping Guardian: %s", e)
         return []
 
 
-def scrape_higher_ed_news(region="India", sources=None):
+def scrape_higher_ed_news(region="India", sources=None, exclude=()):
     all_articles = []
 
     india_sources = {
@@ -289,15 +263,17 @@ def scrape_higher_ed_news(region="India", sources=None):
     source_map = india_sources if region == "India" else global_sources
     sources = sources or list(source_map.keys())
 
+    sources = [src for src in sources if src not in exclude]
+
     for key in sources:
         func = source_map.get(key)
         if func:
             try:
-                items = func()
-                print(f"{region} - {key}: {len(items)} articles")
+                items = run_source("higher_ed", region, key, func)
+                logger.info("%s - %s: %s articles", region, key, len(items))
                 all_articles.extend(items)
             except Exception as e:
-                print(f"Error in {key}: {e}")
+                logger.warning("Error in %s: %s", key, e)
 
     return all_articles
 
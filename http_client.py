@@ -0,0 +1,290 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.structures import CaseInsensitiveDict
+
+import cassettes
+from metrics import HTML_PARSE_SECONDS, HTTP_ERRORS, HTTP_REQUEST_SECONDS
+from profiling import attach_current_thread
+from singleflight import SingleFlight
+
+# Upper bound on concurrent requests to one publisher host, shared by every session in the process
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("MAX_CONNECTIONS_PER_HOST", "4"))
+# Seconds a finished fetch keeps being shared with callers asking for the same URL
+SINGLE_FLIGHT_LINGER = float(os.getenv("SINGLE_FLIGHT_LINGER", "5"))
+
+# Timeout used until a host has enough latency samples, and the ceiling afterwards
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "15"))
+MIN_TIMEOUT = float(os.getenv("HTTP_MIN_TIMEOUT", "2"))
+# Adaptive timeout = observed p99 * multiplier, clamped to [MIN_TIMEOUT, requested timeout]
+TIMEOUT_P99_MULTIPLIER = float(os.getenv("HTTP_TIMEOUT_P99_MULTIPLIER", "2"))
+MIN_LATENCY_SAMPLES = int(os.getenv("HTTP_MIN_LATENCY_SAMPLES", "20"))
+# Hosts whose p95 is at least this slow get a hedged duplicate once p95 has passed
+HEDGE_MIN_P95 = float(os.getenv("HTTP_HEDGE_MIN_P95", "2"))
+
+# Load tests: send every request to this base URL instead, with the original host as the first path segment
+UPSTREAM_OVERRIDE = os.getenv("HTTP_UPSTREAM_OVERRIDE", "").rstrip("/")
+
+# Histogram bucket upper bounds in seconds (roughly log spaced)
+LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1, 1.5, 2, 3, 4, 6, 8, 10, 15, 20, 30)
+# Counts are halved once a host has this many samples so the histogram follows recent behaviour
+LATENCY_DECAY_AT = 1000
+
+_url_flights = SingleFlight(linger=SINGLE_FLIGHT_LINGER)
+_hedge_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+_host_latencies = {}
+_host_latencies_lock = threading.Lock()
+
+_deadline = contextvars.ContextVar("http_deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    pass
+
+
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+
+def upstream_url(url):
+    if not UPSTREAM_OVERRIDE:
+        return url
+    parts = urlparse(url)
+    rewritten = f"{UPSTREAM_OVERRIDE}/{parts.netloc}{parts.path or '/'}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+def _host_semaphore(host):
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+
+@contextmanager
+def host_slot(url):
+    semaphore = _host_semaphore(host_of(url))
+    with semaphore:
+        yield
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+        self.timeouts = 0
+        self.hedged = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, timed_out=False):
+        with self._lock:
+            self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.total += 1
+            if timed_out:
+                self.timeouts += 1
+            if self.total >= LATENCY_DECAY_AT:
+                self.counts = [count // 2 for count in self.counts]
+                self.total = sum(self.counts)
+
+    def record_hedge(self):
+        with self._lock:
+            self.hedged += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile, or None without enough samples."""
+        with self._lock:
+            if self.total < MIN_LATENCY_SAMPLES:
+                return None
+            rank = q * self.total
+            running = 0
+            for index, count in enumerate(self.counts):
+                running += count
+                if running >= rank:
+                    return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else DEFAULT_TIMEOUT * 2
+        return None
+
+
+def host_latency(host):
+    with _host_latencies_lock:
+        histogram = _host_latencies.get(host)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            _host_latencies[host] = histogram
+        return histogram
+
+
+def latency_snapshot():
+    with _host_latencies_lock:
+        items = list(_host_latencies.items())
+    return {
+        host: {
+            "samples": histogram.total,
+            "p50": histogram.quantile(0.5),
+            "p95": histogram.quantile(0.95),
+            "p99": histogram.quantile(0.99),
+            "timeouts": histogram.timeouts,
+            "hedged": histogram.hedged,
+        }
+        for host, histogram in items
+    }
+
+
+@contextmanager
+def request_deadline(seconds):
+    """Caps every request made inside the block (including worker threads that copy the context) to one overall budget."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def deadline_remaining():
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def submit_with_context(pool, fn, *args, **kwargs):
+    """ThreadPoolExecutor.submit that carries the caller's context (deadline and friends) into the worker."""
+    return pool.submit(contextvars.copy_context().run, _in_worker, fn, *args, **kwargs)
+
+
+def _in_worker(fn, *args, **kwargs):
+    with attach_current_thread():
+        return fn(*args, **kwargs)
+
+
+def _effective_timeout(histogram, timeout):
+    if isinstance(timeout, tuple):
+        return timeout
+    timeout = timeout or DEFAULT_TIMEOUT
+    p99 = histogram.quantile(0.99)
+    if p99 is not None:
+        timeout = min(timeout, max(MIN_TIMEOUT, p99 * TIMEOUT_P99_MULTIPLIER))
+    remaining = deadline_remaining()
+    if remaining is not None:
+        if remaining <= 0:
+            raise DeadlineExceeded("request deadline exceeded")
+        timeout = min(timeout, remaining)
+    return timeout
+
+
+def _flight_key(session, method, url, kwargs):
+    # Only plain, fully-buffered GETs are safe to hand to several callers
+    if method.upper() != "GET" or kwargs.get("stream") or kwargs.get("data") or kwargs.get("json"):
+        return None
+    headers = CaseInsensitiveDict(session.headers)
+    headers.update(kwargs.get("headers") or {})
+    if any(name.lower().startswith("if-") for name in headers):
+        return None
+    if kwargs.get("params"):
+        url = requests.Request("GET", url, params=kwargs["params"]).prepare().url
+    # Callers share a response only if they would have sent the same request: scraper
+    # modules differ in User-Agent and Accept, and cookies can change what a page says
+    cookies = dict(session.cookies.items())
+    cookies.update(kwargs.get("cookies") or {})
+    return (
+        url,
+        tuple(sorted((name.lower(), value) for name, value in headers.items() if value is not None)),
+        tuple(sorted(cookies.items())),
+        tuple(sorted((name, repr(value)) for name, value in kwargs.items() if name not in ("headers", "params", "cookies"))),
+    )
+
+
+class NewsSession(requests.Session):
+    """
+    requests.Session used by every scraper. Requests to the same host are capped at
+    MAX_CONNECTIONS_PER_HOST in flight across all sessions and threads, and concurrent
+    identical GETs (same URL, headers, cookies and options) share a single upstream fetch. Timeouts adapt to each host's
+    observed latency, slow hosts get a hedged duplicate GET, and an enclosing
+    request_deadline() bounds the total time spent.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        key = None if args else _flight_key(self, method, url, kwargs)
+        if key is None:
+            return self._send_request(method, url, *args, **kwargs)
+        return _url_flights.do(key, lambda: self._hedged_request(method, url, **kwargs))
+
+    def _send_request(self, method, url, *args, **kwargs):
+        host = host_of(url)
+        histogram = host_latency(host)
+        kwargs["timeout"] = _effective_timeout(histogram, kwargs.get("timeout"))
+        with host_slot(url):
+            start = time.monotonic()
+            try:
+                if cassettes.config.mode == cassettes.REPLAY:
+                    response = cassettes.replay(self, method, url, kwargs)
+                else:
+                    response = super().request(method, upstream_url(url), *args, **kwargs)
+                    if cassettes.config.mode == cassettes.RECORD:
+                        cassettes.record(method, url, kwargs, response)
+            except requests.exceptions.Timeout:
+                elapsed = time.monotonic() - start
+                histogram.observe(elapsed, timed_out=True)
+                HTTP_REQUEST_SECONDS.observe(elapsed, host=host)
+                HTTP_ERRORS.inc(host=host, kind="timeout")
+                raise
+            except requests.exceptions.RequestException:
+                HTTP_REQUEST_SECONDS.observe(time.monotonic() - start, host=host)
+                HTTP_ERRORS.inc(host=host, kind="connection")
+                raise
+        elapsed = time.monotonic() - start
+        histogram.observe(elapsed)
+        HTTP_REQUEST_SECONDS.observe(elapsed, host=host)
+        if response.status_code >= 400:
+            HTTP_ERRORS.inc(host=host, kind=str(response.status_code))
+        return response
+
+    def _hedged_request(self, method, url, **kwargs):
+        histogram = host_latency(host_of(url))
+        p95 = histogram.quantile(0.95)
+        if p95 is None or p95 < HEDGE_MIN_P95:
+            return self._send_request(method, url, **kwargs)
+
+        primary = submit_with_context(_hedge_pool, self._send_request, method, url, **kwargs)
+        try:
+            return primary.result(timeout=p95)
+        except FutureTimeout:
+            pass
+
+        histogram.record_hedge()
+        hedge = submit_with_context(_hedge_pool, self._send_request, method, url, **kwargs)
+        done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+        # The first one to finish failed; the other is our last chance
+        for future in pending:
+            return future.result()
+        return primary.result()
+
+
+def parse_html(response):
+    """BeautifulSoup tree for a fetched page, timed per host for /metrics."""
+    start = time.perf_counter()
+    soup = BeautifulSoup(response.content, "html.parser")
+    HTML_PARSE_SECONDS.observe(time.perf_counter() - start, host=host_of(response.url or ""))
+    return soup
+
+
+def get_session(user_agent="Mozilla/5.0"):
+    session = NewsSession()
+    session.headers.update({"User-Agent": user_agent})
+    return session
@@ -1,90 +1,106 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import logging
+from article_record import Article
+from http_client import NewsSession, parse_html
+from pagination import paginate
+from source_runner import run_source
+from keywords import KeywordMatcher
+from text_normalization import clean_text
 
-def clean_text(text):
-    return ' '.join(text.strip().split())
+logger = logging.getLogger(__name__)
+
+industry_keywords = [
+    "industry", "industrial", "manufacturing", "manufacturer", "factory", "plant",
+    "production", "steel", "cement", "automobile", "automaker", "textile", "msme",
+    "supply chain", "semiconductor", "pli", "make in india", "capex", "mining",
+    "chemicals", "refinery", "shipbuilding", "aerospace", "electronics", "output"
+]
+industry_matcher = KeywordMatcher(industry_keywords)
 
 def scrape_the_hindu_industry():
-    articles = []
     seen_titles = set()
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
+
+    def parse_page(response):
+        page_articles = []
+        soup = parse_html(response)
+        for h3 in soup.find_all('h3', class_='title big'):
+            a_tag = h3.find('a', href=True)
+            if not a_tag:
+                continue
+            title = clean_text(a_tag.get_text())
+            href = a_tag['href']
+            if title and title not in seen_titles:
+                page_articles.append(Article(title, href, "The Hindu"))
+                seen_titles.add(title)
+        return page_articles
+
     try:
-        for page in range(1, 3):
-            url = f"https://www.thehindu.com/business/Industry/?page={page}"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
-            for h3 in soup.find_all('h3', class_='title big'):
-                a_tag = h3.find('a', href=True)
-                if not a_tag:
-                    continue
-                title = clean_text(a_tag.get_text())
-                href = a_tag['href']
-                if title and title not in seen_titles:
-                    articles.append({"title": title, "url": href, "source": "The Hindu"})
-                    seen_titles.add(title)
-        print(f"scrape_the_hindu_industry: {len(articles)} articles")
-        return articles
+        page_urls = [f"https://www.thehindu.com/business/Industry/?page={page}" for page in range(1, 3)]
+        return paginate(session, page_urls, parse_page, "scrape_the_hindu_industry")
     except Exception as e:
-        print(f"Error scraping The Hindu Industry: {e}")
+        logger.warning("Error scraping The Hindu Industry: %s", e)
         return []
 
 def scrape_financial_express_industry():
-    articles = []
     seen_titles = set()
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
+
+    def parse_page(response):
+        page_articles = []
+        soup = parse_html(response)
+        for h2 in soup.find_all('h2', class_='entry-title'):
+            a_tag = h2.find('a', href=True)
+            if not a_tag:
+                continue
+            title = clean_text(a_tag.get_text())
+            href = a_tag['href']
+            if title and title not in seen_titles:
+                page_articles.append(Article(title, href, "Financial Express"))
+                seen_titles.add(title)
+        return page_articles
+
     try:
-        for page in range(1, 3):
-            url = f"https://www.financialexpress.com/business/industry/page/{page}/" if page > 1 else "https://www.financialexpress.com/business/industry/"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
-            for h2 in soup.find_all('h2', class_='entry-title'):
-                a_tag = h2.find('a', href=True)
-                if not a_tag:
-                    continue
-                title = clean_text(a_tag.get_text())
-                href = a_tag['href']
-                if title and title not in seen_titles:
-                    articles.append({"title": title, "url": href, "source": "Financial Express"})
-                    seen_titles.add(title)
-        print(f"scrape_financial_express_industry: {len(articles)} articles")
-        return articles
+        page_urls = [
+            f"https://www.financialexpress.com/business/industry/page/{page}/" if page > 1 else "https://www.financialexpress.com/business/industry/"
+            for page in range(1, 3)
+        ]
+        return paginate(session, page_urls, parse_page, "scrape_financial_express_industry")
     except Exception as e:
-        print(f"Error scraping Financial Express Industry: {e}")
+        logger.warning("Error scraping Financial Express Industry: %s", e)
         return []
 
 def scrape_manufacturing_today_india():
     articles = []
     seen_titles = set()
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     try:
         url = "https://www.manufacturingtodayindia.com/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         for a_tag in soup.find_all('a', rel='bookmark', href=True):
             title = clean_text(a_tag.get_text())
             href = a_tag['href']
             if title and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "Manufacturing Today India"})
+                articles.append(Article(title, href, "Manufacturing Today India"))
                 seen_titles.add(title)
-        print(f"scrape_manufacturing_today_india: {len(articles)} articles")
+        logger.debug("scrape_manufacturing_today_india: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Manufacturing Today India: {e}")
+        logger.warning("Error scraping Manufacturing Today India: %s", e)
         return []
 
 def scrape_bbc_industry():
     articles = []
     seen_titles = set()
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     try:
         url = "https://www.bbc.com/news/topics/c0repy5vn95t"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         for a_tag in soup.find_all('a', attrs={"data-testid": "internal-link"}, href=True):
             href = a_tag['href']
             if not href.startswith('http'):
@@ -97,23 +113,23 @@ def scrape_bbc_industry():
             summary = clean_text(p.get_text()) if p else ''
             title = headline + (f" — {summary}" if summary else "")
             if title and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "BBC"})
+                articles.append(Article(title, href, "BBC"))
                 seen_titles.add(title)
-        print(f"scrape_bbc_industry: {len(articles)} articles")
+        logger.debug("scrape_bbc_industry: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping BBC Industry: {e}")
+        logger.warning("Error scraping BBC Industry: %s", e)
         return []
 
 def scrape_nytimes_industry():
     articles = []
     seen_titles = set()
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     try:
         url = "https://www.nytimes.com/topic/subject/factories-and-manufacturing"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         for a_tag in soup.find_all('a', class_='css-8hzhxf', href=True):
             h3 = a_tag.find('h3')
             if not h3:
@@ -123,24 +139,24 @@ def scrape_nytimes_industry():
             if not href.startswith('http'):
                 href = "https://www.nytimes.com" + href
             if title and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "NY Times"})
+                articles.append(Article(title, href, "NY Times"))
                 seen_titles.add(title)
-        print(f"scrape_nytimes_industry: {len(articles)} articles")
+        logger.debug("scrape_nytimes_industry: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping NY Times Industry: {e}")
+        logger.warning("Error scraping NY Times Industry: %s", e)
         return []
 
 def scrape_guardian_industry():
     articles = []
     seen_titles = set()
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     try:
         # Updated URL to the manufacturing sector page
         url = "https://www.theguardian.com/business/manufacturing-sector"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         
         # Primary selector: Look for articles with aria-label and dcr-2yd10d class
         for a_tag in soup.select('a.dcr-2yd10d[aria-label]'):
@@ -153,7 +169,7 @@ def scrape_guardian_industry():
                 elif not href.startswith('http'):
                     continue
                     
-                articles.append({"title": title, "url": href, "source": "The Guardian"})
+                articles.append(Article(title, href, "The Guardian"))
                 seen_titles.add(title)
         
         # Fallback selector: General aria-label links
@@ -168,25 +184,25 @@ def scrape_guardian_industry():
                     elif not href.startswith('http'):
                         continue
                         
-                    articles.append({"title": title, "url": href, "source": "The Guardian"})
+                    articles.append(Article(title, href, "The Guardian"))
                     seen_titles.add(title)
         
         
-        print(f"scrape_guardian_industry: {len(articles)} articles")
+        logger.debug("scrape_guardian_industry: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Guardian Industry: {e}")
+        logger.warning("Error scraping Guardian Industry: %s", e)
         return []
 
 def scrape_bloomberg_industry():
     articles = []
     seen_titles = set()
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     try:
         url = "https://www.bloomberg.com/industries"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         for a_tag in soup.find_all('a', class_='StoryBlock_storyLink__5nXw8', href=True):
             headline_div = a_tag.find('div', attrs={"data-testid": "headline"})
             span = headline_div.find('span') if headline_div else None
@@ -195,15 +211,15 @@ def scrape_bloomberg_industry():
             if not href.startswith('http'):
                 href = "https://www.bloomberg.com" + href
             if title and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "Bloomberg"})
+                articles.append(Article(title, href, "Bloomberg"))
                 seen_titles.add(title)
-        print(f"scrape_bloomberg_industry: {len(articles)} articles")
+        logger.debug("scrape_bloomberg_industry: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Bloomberg Industry: {e}")
+        logger.warning("Error scraping Bloomberg Industry: %s", e)
         return []
 
-def scrape_industry_news(region="India", sources=None):
+def scrape_industry_news(region="India", sources=None, exclude=()):
     india_source_map = {
         "the_hindu": scrape_the_hindu_industry,
         "financial_express": scrape_financial_express_industry,
@@ -222,14 +238,16 @@ def scrape_industry_news(region="India", sources=None):
     if sources is None:
         sources = list(source_map.keys())
     all_articles = []
+    sources = [src for src in sources if src not in exclude]
+
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                src_articles = func()
+                src_articles = run_source("industry", region, src, func)
                 all_articles.extend(src_articles)
             except Exception as e:
-                print(f"Error in scrape_industry_news for source {src}: {e}")
+                logger.warning("Error in scrape_industry_news for source %s: %s", src, e)
     return all_articles
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+"""
+Category relevance matching: every term of a category's keyword list found in
+one left-to-right pass over the text, on whole tokens only ("ma" does not match
+"market", "mutual fund" matches "Mutual  Fund").
+"""
+import re
+from collections import deque
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Simple plurals, so "vaccine" still matches "vaccines" now that substrings don't count
+_PLURAL_SUFFIXES = ("s", "es")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over tokens rather than characters, which gives token
+    boundaries for free and makes a scan one dict lookup per word of the text.
+    weights maps a term to its relevance weight (default 1.0); match() sums the
+    weights of the distinct terms found.
+    """
+
+    def __init__(self, terms, weights=None):
+        weights = weights or {}
+        self.terms = []
+        self.weights = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for term in dict.fromkeys(terms):
+            tokens = tokenize(term)
+            if not tokens:
+                continue
+            index = len(self.terms)
+            self.terms.append(term)
+            self.weights.append(float(weights.get(term, 1.0)))
+            self._add(tokens, index)
+            for suffix in _PLURAL_SUFFIXES:
+                self._add(tokens[:-1] + [tokens[-1] + suffix], index)
+        self._link()
+
+    def _add(self, tokens, index):
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+        if index not in self._output[node]:
+            self._output[node] += (index,)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                # A term ending here also ends every shorter term on the fail chain
+                self._output[child] += tuple(
+                    index for index in self._output[self._fail[child]] if index not in self._output[child]
+                )
+
+    def _scan(self, text):
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for token in _TOKEN_RE.findall(text.lower()):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if output[node]:
+                yield from output[node]
+
+    def matches(self, text):
+        """True if any term occurs in text; stops at the first one."""
+        if not text:
+            return False
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def match(self, text):
+        """(matched terms in order of first occurrence, summed weight of those terms)."""
+        if not text:
+            return [], 0.0
+        found = dict.fromkeys(self._scan(text))
+        return [self.terms[index] for index in found], sum(self.weights[index] for index in found)
@@ -0,0 +1,197 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+REGISTRY = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, key)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_items(items))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def totals(self):
+        with self._lock:
+            return dict(self._values)
+
+    def _render_items(self, items):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def _render_items(self, items):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def totals(self):
+        """{label values: (count, sum)} for every series, used by the benchmarks to diff runs."""
+        with self._lock:
+            return {key: (series["count"], series["sum"]) for key, series in self._values.items()}
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_items(self, items):
+        lines = []
+        for key, series in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                running += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{float(bound)!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {running}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {series['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series['count']}")
+        return lines
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- Digest pipeline metrics ---
+
+STAGE_SECONDS = Histogram(
+    "news_stage_seconds", "Wall time of each digest pipeline stage.", ["stage"]
+)
+SOURCE_SCRAPE_SECONDS = Histogram(
+    "news_source_scrape_seconds", "Wall time of one source scraper run.", ["category", "region", "source"]
+)
+SOURCE_ARTICLES = Counter(
+    "news_source_articles_total", "Articles returned by each source.", ["category", "region", "source"]
+)
+SOURCE_ERRORS = Counter(
+    "news_source_errors_total", "Source runs that raised or returned no articles.", ["category", "region", "source", "reason"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "news_http_request_seconds", "Upstream HTTP fetch latency per publisher host.", ["host"]
+)
+HTTP_ERRORS = Counter(
+    "news_http_errors_total", "Upstream HTTP requests that failed or returned an error status.", ["host", "kind"]
+)
+HTML_PARSE_SECONDS = Histogram(
+    "news_html_parse_seconds", "Time spent building the BeautifulSoup tree for one page.", ["host"]
+)
+SMTP_SEND_SECONDS = Histogram(
+    "news_smtp_send_seconds", "Time to deliver one digest email over SMTP.", ["status"]
+)
+EMAILS = Counter(
+    "news_emails_total", "Digest emails attempted, by outcome.", ["status"]
+)
+STORE_WRITE_SECONDS = Histogram(
+    "news_store_write_seconds", "Time to apply one batch of queued article store writes."
+)
+STORE_ARTICLES_WRITTEN = Counter(
+    "news_store_articles_written_total", "Article rows inserted or refreshed in the article store."
+)
+STORE_PARTITIONS = Gauge(
+    "news_store_partitions", "Partition files in the article store (daily and weekly)."
+)
+STORE_MAINTENANCE_SECONDS = Histogram(
+    "news_store_maintenance_seconds", "Time for one article store compaction and retention pass."
+)
+SEARCH_SECONDS = Histogram(
+    "news_search_seconds", "Latency of one full-text search over the article store."
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "news_requests_in_flight", "Flask requests currently being handled by this process."
+)
+DIGEST_REQUESTS = Counter(
+    "news_digest_requests_total", "Digest form submissions, by outcome.", ["outcome"]
+)
+SCRAPE_BATCH_SIZE = Histogram(
+    "news_scrape_batch_size", "Interactive submissions served by one batched scrape.", buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+SCHEDULED_SUBSCRIPTIONS = Counter(
+    "news_scheduled_subscriptions_total", "Due subscriptions claimed by the scheduler."
+)
+SCHEDULED_DIGESTS = Counter(
+    "news_scheduled_digests_total", "Digests the scheduler ran, one per group of identical subscriptions, by outcome.", ["outcome"]
+)
+DIGEST_ARTICLES_ALREADY_SENT = Counter(
+    "news_digest_articles_already_sent_total",
+    "Scraped articles left out before ranking because every recipient had been sent them.",
+)
+
+
+def time_stage(stage):
+    return STAGE_SECONDS.time(stage=stage)
@@ -1,27 +1,59 @@
+import logging
 import os
 from langchain_core.messages import HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
-from emailer import send_email, build_html_email
+from emailer import send_email, build_html_email, build_text_email
 from higher_ed import scrape_higher_ed_news
 from entertainment import scrape_entertainment_news
 from sports import scrape_sports_news
 from business_and_finance import scrape_business_finance_news
 from dotenv import load_dotenv
 from technology import scrape_technology_news
-from news_sources import scrape_news
+from news_sources import dedupe_articles, scrape_news
+from article_record import Article
 from environment import scrape_environment_news
 from industry import scrape_industry_news
 from health import scrape_health_news
+from crawl import crawled_articles
+from http_client import request_deadline, submit_with_context
+from metrics import DIGEST_ARTICLES_ALREADY_SENT, time_stage
+from news_logging import correlated, correlation_id
+from profiling import maybe_profile
+from scrape_batching import batched_scrape
+from source_runner import REGIONS
+from sent_history import record_sent, unsent_articles
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+import hashlib
 import re
+import time
+
+logger = logging.getLogger(__name__)
 
 load_dotenv(dotenv_path="scratch.env")
 GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
+# "gemini", or "mock" for a deterministic offline ranker (benchmarks and load tests)
+RANKING_BACKEND = os.getenv("RANKING_BACKEND", "gemini").lower()
+# Simulated LLM round trip for the mock backend, in seconds
+RANKING_MOCK_LATENCY = float(os.getenv("RANKING_MOCK_LATENCY", "0"))
+# Overall budget for scraping all selected sources of one digest
+SCRAPE_DEADLINE_SECONDS = float(os.getenv("SCRAPE_DEADLINE_SECONDS", "30"))
+# "sources" runs every selected source scraper; "crawl" serves the outlets in crawl.OUTLETS
+# from one shared crawl per cycle and scrapes only the remaining sources
+SCRAPE_MODE = os.getenv("SCRAPE_MODE", "sources").lower()
+# Categories scrape_articles dispatches on; anything else gets general education news
+CATEGORIES = (
+    "general", "higher_ed", "entertainment", "sports", "business_and_finance", "tech", "environment", "industry", "health",
+)
+# Sections one combined digest may ask for, and how many of them are scraped or ranked at once
+MAX_DIGEST_SECTIONS = int(os.getenv("MAX_DIGEST_SECTIONS", str(len(CATEGORIES))))
+DIGEST_SECTION_WORKERS = int(os.getenv("DIGEST_SECTION_WORKERS", "4"))
 
 def select_top_news_with_gemini(articles, top_n=10, return_scores=False):
-    print(f"[Gemini] Preparing to call Gemini LLM with {len(articles)} articles, requesting top {top_n}.")
+    logger.info("[Gemini] Preparing to call Gemini LLM with %s articles, requesting top %s.", len(articles), top_n)
     if not GEMINI_API_KEY:
-        print("Gemini API key not found.")
+        logger.warning("Gemini API key not found.")
         return (articles[:top_n] if not return_scores else [(art, None) for art in articles[:top_n]]), True
 
     llm = ChatGoogleGenerativeAI(
@@ -41,14 +73,14 @@ def select_top_news_with_gemini(articles, top_n=10, return_scores=False):
         title = article["title"]
         url = article["url"]
         prompt += f"{idx}. {source}, {title}\n{url}\n"
-    print("[Gemini] Calling Gemini LLM API...")
+    logger.debug("[Gemini] Calling Gemini LLM API...")
     try:
         response = llm.invoke([HumanMessage(content=prompt)])
     except Exception as e:
-        print(f"[Gemini] API call failed: {e}")
+        logger.warning("[Gemini] API call failed: %s", e)
         return (articles[:top_n] if not return_scores else [(art, None) for art in articles[:top_n]]), True
-    print("[Gemini] Gemini LLM API call completed.")
-    print("Gemini raw output:\n", response.content)
+    logger.debug("[Gemini] Gemini LLM API call completed.")
+    logger.debug("Gemini raw output:\n%s", response.content)
     def normalize_source_name(name):
         mapping = {
             "toi": "times of india",
@@ -86,6 +118,23 @@ def select_top_news_with_gemini(articles, top_n=10, return_scores=False):
     return (scored_articles[:top_n] if return_scores else [art for art, score in scored_articles[:top_n]]), False
 
 
+def select_top_news_mock(articles, top_n=10, return_scores=False):
+    """Stand-in for Gemini: scores each article 1-10 from a hash of its title, so runs are repeatable."""
+    if RANKING_MOCK_LATENCY:
+        time.sleep(RANKING_MOCK_LATENCY)
+    scored_articles = [
+        (art, int(hashlib.md5(art["title"].encode("utf-8")).hexdigest(), 16) % 10 + 1) for art in articles
+    ]
+    scored_articles.sort(key=lambda x: x[1], reverse=True)
+    return (scored_articles[:top_n] if return_scores else [art for art, score in scored_articles[:top_n]]), False
+
+
+def select_top_news(articles, top_n=10, return_scores=False):
+    if RANKING_BACKEND == "mock":
+        return select_top_news_mock(articles, top_n=top_n, return_scores=return_scores)
+    return select_top_news_with_gemini(articles, top_n=top_n, return_scores=return_scores)
+
+
 def create_display_url(url, max_length=50):
     if len(url) <= max_length:
         return url
@@ -105,106 +154,300 @@ def create_display_url(url, max_length=50):
         half = (max_length - 5) // 2
         return f"{url[:half]} ... {url[-half:]}"
 
-def format_email(articles):
-    if not articles:
-        return "No education news articles found for your preferences today.\n\nPlease try again later."
+def format_email(articles, sections=None, unsubscribe_url=None):
+    return build_text_email(articles, sections, unsubscribe_url)
 
-    body = "🎓 Your Education News Digest 🎓\n"
-    body += "=" * 50 + "\n\n"
+@correlated
+def process_and_send(emails, category, region, top_n=10, sources=None, profile=False):
+    with maybe_profile(category, region, force=profile, correlation_id=correlation_id()):
+        return _process_and_send(emails, category, region, top_n, sources)
 
-    for i, article in enumerate(articles, 1):
-        display_url = create_display_url(article["url"])
-        body += f"{i}. {article['title']}\n"
-        body += f"   🔗 Full link: {article['url']}\n\n"
 
-    body += "\n" + "=" * 50 + "\n"
-    body += "This digest was automatically generated.\n"
-    body += "Stay informed, stay educated! 🌟"
+def _process_and_send(emails, category, region, top_n=10, sources=None):
+    logger.info("[process_and_send] Function Called with category=%s, region=%s, top_n=%s, sources=%s", category, region, top_n, sources)
+    email_list, problem = parse_recipients(emails)
+    if problem:
+        return problem
+    articles, topic, errors = batched_scrape(scrape_articles, category, region, sources)
+    return deliver_digest(email_list, articles, topic, top_n, errors)
 
-    return body
 
-def process_and_send(emails, category, region, top_n=10, sources=None):
-    print(f"[process_and_send] Function Called with category={category}, region={region}, top_n={top_n}, sources={sources}")
-    errors = []
-    articles = []
-    topic = ""
+@correlated
+def process_and_send_combined(emails, selections, top_n=10, rank_together=False, profile=False):
+    """
+    One digest email per recipient covering several (category, region, sources)
+    selections, each as its own section. See deliver_sections for rank_together.
+    """
+    with maybe_profile("combined", "+".join(sorted({region or "" for _, region, _ in selections})), force=profile, correlation_id=correlation_id()):
+        logger.info("[process_and_send] Combined digest for %s, top_n=%s, rank_together=%s", selections, top_n, rank_together)
+        email_list, problem = parse_recipients(emails)
+        if problem:
+            return problem
+        if not selections:
+            return "\u274c Please choose at least one category"
+        if len(selections) > MAX_DIGEST_SECTIONS:
+            return f"\u274c A digest can have at most {MAX_DIGEST_SECTIONS} sections"
+        sections, errors = scrape_sections(selections)
+        return deliver_sections(email_list, sections, top_n, errors, rank_together=rank_together)
 
-    # Scraping
-    if category == "higher_ed":
-        articles = scrape_higher_ed_news(region=region, sources=sources)
-        topic = f"{region} Higher Education"
-    elif category == "entertainment":
-        articles = scrape_entertainment_news(region=region, sources=sources)
-        topic = f"{region} Entertainment"
-    elif category == "sports":
-        articles = scrape_sports_news(region=region, sources=sources)
-        topic = f"{region} Sports"
-    elif category == "business_and_finance":
-        articles = scrape_business_finance_news(region=region, sources=sources)
-        topic = f"{region} Business & Finance"
-    elif category == "tech":
-        articles = scrape_technology_news(region=region, sources=sources)
-        topic = f"{region} Technology"
-    elif category == "environment":
-        articles = scrape_environment_news(region=region, sources=sources)
-        topic = f"{region} Environment"
-    elif category == "industry":
-        articles = scrape_industry_news(region=region, sources=sources)
-        topic = f"{region} Industry"
-    elif category == "health":
-        articles = scrape_health_news(region=region, sources=sources)
-        topic = f"{region} Health"
-    else:
-        articles, errors = scrape_news(region, sources)
-        topic = f"{region} Education" if region else "Education"
 
-    print(f"[process_and_send] Scraping complete. Found {len(articles)} articles.")
+def scrape_sections(selections):
+    """
+    ([(topic, articles)], errors) for each (category, region, sources) selection, scraped
+    concurrently. A story that turns up under several selections stays in the first only.
+    """
+    with ThreadPoolExecutor(max_workers=min(len(selections), DIGEST_SECTION_WORKERS)) as pool:
+        futures = [
+            submit_with_context(pool, batched_scrape, scrape_articles, category, region, sources)
+            for category, region, sources in selections
+        ]
+        scraped = [future.result() for future in futures]
+    sections = [(topic, [Article.of(article) for article in articles]) for articles, topic, _ in scraped]
+    unique = {id(article) for article in dedupe_articles([article for _, articles in sections for article in articles])}
+    sections = [(topic, [article for article in articles if id(article) in unique]) for topic, articles in sections]
+    errors = [error for _, _, section_errors in scraped for error in section_errors]
+    return sections, errors
 
-    if not emails:
-        return "\u274c Please enter at least one email address"
 
+def parse_recipients(emails):
+    """(addresses, None) from a comma or semicolon separated string, or (None, status message) if it's unusable."""
+    if not emails or not isinstance(emails, str):
+        return None, "\u274c Please enter at least one email address"
     email_list = [e.strip() for e in re.split(r"[;,]", emails) if e.strip()]
     invalids = [e for e in email_list if "@" not in e]
     if not email_list or invalids:
-        return f"\u274c Invalid email(s): {', '.join(invalids)}"
+        return None, f"\u274c Invalid email(s): {', '.join(invalids)}"
+    return email_list, None
+
 
-    if not articles:
+def parse_region(region):
+    """
+    (region, None) for one of REGIONS, matched case-insensitively, or (None, status
+    message). Regions name circuit breakers and metric series, so only these get through.
+    """
+    if isinstance(region, str):
+        for known in REGIONS:
+            if region.strip().lower() == known.lower():
+                return known, None
+    return None, f"\u274c Please choose a region: {' or '.join(REGIONS)}"
+
+
+def parse_sources(sources):
+    """(sources, None) for None or a list of source names, or (None, status message)."""
+    if sources is None or (isinstance(sources, list) and all(isinstance(source, str) for source in sources)):
+        return sources, None
+    return None, "\u274c Sources must be a list of source names"
+
+
+def parse_sections(sections):
+    """
+    ([(category, region, sources)], None) from a combined digest request's sections, a
+    list of {"category", "region", "sources"} objects, or (None, status message).
+    """
+    if not isinstance(sections, list) or not sections:
+        return None, "\u274c Please choose at least one category"
+    if len(sections) > MAX_DIGEST_SECTIONS:
+        return None, f"\u274c A digest can have at most {MAX_DIGEST_SECTIONS} sections"
+    selections = []
+    for section in sections:
+        if not isinstance(section, dict):
+            return None, "\u274c Each section must be an object with a category, region and sources"
+        category = section.get("category", "general")
+        if not isinstance(category, str):
+            return None, "\u274c Please choose a category"
+        region, error = parse_region(section.get("region"))
+        if error:
+            return None, error
+        sources, error = parse_sources(section.get("sources"))
+        if error:
+            return None, error
+        selections.append((category, region, sources))
+    return selections, None
+
+
+def digest_outcome(status):
+    """The outcome label a process_and_send()/deliver_digest() status message counts under."""
+    if status.startswith("\u2705"):
+        return "sent"
+    return "failed" if status.startswith("\u274c") else "no_articles"
+
+
+def scrape_articles(category, region, sources=None):
+    """(articles, digest topic, source errors) for one category/region/source selection, within the scrape deadline."""
+    errors = []
+    articles = []
+    topic = ""
+    with request_deadline(SCRAPE_DEADLINE_SECONDS), time_stage("scrape"):
+        crawled, covered = crawled_articles(category, region, sources) if SCRAPE_MODE == "crawl" else ([], ())
+        if category == "higher_ed":
+            articles = scrape_higher_ed_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Higher Education"
+        elif category == "entertainment":
+            articles = scrape_entertainment_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Entertainment"
+        elif category == "sports":
+            articles = scrape_sports_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Sports"
+        elif category == "business_and_finance":
+            articles = scrape_business_finance_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Business & Finance"
+        elif category == "tech":
+            articles = scrape_technology_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Technology"
+        elif category == "environment":
+            articles = scrape_environment_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Environment"
+        elif category == "industry":
+            articles = scrape_industry_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Industry"
+        elif category == "health":
+            articles = scrape_health_news(region=region, sources=sources, exclude=covered)
+            topic = f"{region} Health"
+        else:
+            articles, errors = scrape_news(region, sources, exclude=covered)
+            topic = f"{region} Education" if region else "Education"
+
+        articles = crawled + articles
+
+    logger.info("[process_and_send] Scraping complete. Found %s articles.", len(articles))
+    return articles, topic, errors
+
+
+def deliver_digest(email_list, articles, topic, top_n=10, errors=(), unsubscribe_urls=None):
+    """
+    Ranks the scraped articles and emails the top_n to every address in email_list,
+    leaving out what each recipient was already sent. unsubscribe_urls maps subscribers'
+    addresses to their own unsubscribe links. Returns the status message.
+    """
+    return deliver_sections(email_list, [(topic, articles)], top_n, errors, unsubscribe_urls=unsubscribe_urls)
+
+
+def _rank(articles, top_n, shared):
+    # Recipients with different histories share one ranking, so it has to order everything
+    if len(articles) <= top_n:
+        logger.info("[process_and_send] Fewer articles (%s) than requested (%s). Returning all scraped articles.", len(articles), top_n)
+        return articles, False
+    logger.info("Calling select_top_news_with_gemini with %s articles.", len(articles))
+    with time_stage("rank"):
+        ranked, gemini_failed = select_top_news(articles, top_n=top_n if shared else len(articles))
+    logger.info("Gemini selection complete. %s articles selected.", len(ranked))
+    return ranked, gemini_failed
+
+
+def _interleave(sections):
+    """The sections' articles round-robin, so a cap on the total takes from every section."""
+    columns = [articles for _, articles in sections]
+    return [article for row in zip_longest(*columns) for article in row if article is not None]
+
+
+def deliver_sections(email_list, sections, top_n=10, errors=(), rank_together=False, unsubscribe_urls=None):
+    """
+    deliver_digest for a list of (topic, articles) sections sent as one email per
+    recipient. Each section is ranked on its own and contributes up to top_n articles,
+    unless rank_together, in which case one ranking over all of them picks top_n in total.
+    """
+    if not any(articles for _, articles in sections):
         msg = "\u26a0\ufe0f No articles found for the selected region. Please try again later."
         if errors:
             msg += "\n\n\u26a0\ufe0f Some sources failed to scrape:\n" + "\n".join(errors)
         return msg
 
-    gemini_failed = False
+    # Drop what every recipient already got before it costs ranking time
+    scraped = [article for _, articles in sections for article in articles]
+    with time_stage("history"):
+        unsent = unsent_articles(email_list, scraped)
+    unsent_ids = {email: {id(article) for article in fresh} for email, fresh in unsent.items()}
+    wanted = set().union(*unsent_ids.values())
+    DIGEST_ARTICLES_ALREADY_SENT.inc(len(scraped) - len(wanted))
+    sections = [(topic, [article for article in articles if id(article) in wanted]) for topic, articles in sections]
+    if not any(articles for _, articles in sections):
+        return "\u26a0\ufe0f No new articles since your last digest. Please try again later."
+
     MAX_GEMINI_ARTICLES = 55
-    if len(articles) > MAX_GEMINI_ARTICLES:
-        print(f"Limiting articles sent to Gemini from {len(articles)} to {MAX_GEMINI_ARTICLES}")
-        articles = articles[:MAX_GEMINI_ARTICLES]
+    shared = len({frozenset(ids) for ids in unsent_ids.values()}) == 1
+    gemini_failed = False
+    if rank_together or len(sections) == 1:
+        section_of = {id(article): index for index, (_, articles) in enumerate(sections) for article in articles}
+        articles = _interleave(sections)
+        if len(articles) > MAX_GEMINI_ARTICLES:
+            logger.info("Limiting articles sent to Gemini from %s to %s", len(articles), MAX_GEMINI_ARTICLES)
+            articles = articles[:MAX_GEMINI_ARTICLES]
+        ranked, gemini_failed = _rank(articles, top_n, shared)
 
-    if len(articles) <= top_n:
-        print(f"[process_and_send] Fewer articles ({len(articles)}) than requested ({top_n}). Returning all scraped articles.")
-        top_articles = articles
+        def pick(email):
+            top_articles = [article for article in ranked if id(article) in unsent_ids[email]][:top_n]
+            return [
+                (topic, [article for article in top_articles if section_of[id(article)] == index])
+                for index, (topic, _) in enumerate(sections)
+            ]
     else:
-        print(f"Calling select_top_news_with_gemini with {len(articles)} articles.")
-        top_articles, gemini_failed = select_top_news_with_gemini(articles, top_n=top_n)
-        print(f"Gemini selection complete. {len(top_articles)} articles selected.")
-
-    email_body = format_email(top_articles)
-    html_body = build_html_email(top_articles, topic=topic)
-    subject = f"{topic} News Digest - (Top {top_n} articles)"
-
-    success, failed = [], []
-    print("Sources in top_articles:", [a['source'] for a in top_articles])
-    for email in email_list:
-        if send_email(email, subject, email_body, html_body, gemini_failed=gemini_failed):
-            success.append(email)
-        else:
-            failed.append(email)
+        with ThreadPoolExecutor(max_workers=min(len(sections), DIGEST_SECTION_WORKERS)) as pool:
+            futures = [
+                submit_with_context(pool, _rank, articles[:MAX_GEMINI_ARTICLES], top_n, shared)
+                for _, articles in sections
+            ]
+            rankings = [future.result() for future in futures]
+        gemini_failed = any(failed for _, failed in rankings)
+
+        def pick(email):
+            return [
+                (topic, [article for article in ranked if id(article) in unsent_ids[email]][:top_n])
+                for (topic, _), (ranked, _) in zip(sections, rankings)
+            ]
+
+    # One rendering per distinct digest; usually every recipient gets the same one, short
+    # of a subscriber's own unsubscribe link, and the article rows are cached across those
+    unsubscribe_urls = unsubscribe_urls or {}
+    digests, rendered = {}, {}
+    with time_stage("render"):
+        for email in email_list:
+            picked = [(topic, articles) for topic, articles in pick(email) if articles]
+            top_articles = [article for _, articles in picked for article in articles]
+            unsubscribe_url = unsubscribe_urls.get(email)
+            key = (tuple(map(id, top_articles)), unsubscribe_url)
+            if key not in rendered:
+                if len(sections) == 1:
+                    topic = sections[0][0]
+                    rendered[key] = (
+                        top_articles,
+                        format_email(top_articles, unsubscribe_url=unsubscribe_url),
+                        build_html_email(top_articles, topic=topic, unsubscribe_url=unsubscribe_url),
+                    )
+                else:
+                    rendered[key] = (
+                        top_articles,
+                        format_email(top_articles, sections=picked, unsubscribe_url=unsubscribe_url),
+                        build_html_email(top_articles, sections=picked, unsubscribe_url=unsubscribe_url),
+                    )
+            digests[email] = rendered[key]
+    if len(sections) == 1:
+        subject = f"{sections[0][0]} News Digest - (Top {top_n} articles)"
+    else:
+        per = "articles" if rank_together else "per section"
+        subject = f"{' + '.join(topic for topic, _ in sections)} News Digest - (Top {top_n} {per})"
+
+    success, failed, up_to_date = [], [], []
+    with time_stage("send"):
+        for email in email_list:
+            top_articles, email_body, html_body = digests[email]
+            if not top_articles:
+                up_to_date.append(email)
+                continue
+            if send_email(
+                email, subject, email_body, html_body, gemini_failed=gemini_failed, unsubscribe_url=unsubscribe_urls.get(email)
+            ):
+                success.append(email)
+                record_sent(email, top_articles)
+            else:
+                failed.append(email)
 
     msg = ""
     if success:
         msg += f"\u2705 Email sent successfully to: {', '.join(success)}\n"
     if failed:
         msg += f"\u274c Failed to send email to: {', '.join(failed)}"
+    if up_to_date:
+        msg += f"\n\u26a0\ufe0f No new articles since the last digest for: {', '.join(up_to_date)}"
     if errors:
         msg += "\n\n\u26a0\ufe0f Some sources failed to scrape:\n" + "\n".join(errors)
     if gemini_failed:
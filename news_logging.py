@@ -0,0 +1,131 @@
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" for one JSON object per line, "text" for a human readable line
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+_correlation_id = contextvars.ContextVar("correlation_id", default=None)
+_listener = None
+_configure_lock = threading.Lock()
+
+# Attributes every LogRecord has; anything else was passed through extra= and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "correlation_id"}
+
+
+def new_correlation_id():
+    return uuid.uuid4().hex[:12]
+
+
+def correlation_id():
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(cid=None):
+    """Tags every log record emitted inside the block (and in workers that copy the context) with one job ID."""
+    token = _correlation_id.set(cid or new_correlation_id())
+    try:
+        yield _correlation_id.get()
+    finally:
+        _correlation_id.reset(token)
+
+
+def correlated(func):
+    """Runs func inside a new correlation scope unless the caller already opened one."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _correlation_id.get() is not None:
+            return func(*args, **kwargs)
+        with correlation_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class CorrelationFilter(logging.Filter):
+    # Runs on the calling thread, before the record is queued, so the contextvar is still visible
+    def filter(self, record):
+        record.correlation_id = _correlation_id.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops all but one in every N records for messages logged with extra={"sample_every": N}.
+    Counts are kept per (logger, message template); the first occurrence always passes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, "sample_every", None)
+        if not every or every <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "correlation_id": getattr(record, "correlation_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRS and name not in entry:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def _build_formatter():
+    if LOG_FORMAT == "text":
+        return logging.Formatter("%(asctime)s %(levelname)s [%(correlation_id)s] %(name)s: %(message)s")
+    return JsonFormatter()
+
+
+def configure_logging(level=None, stream=None):
+    """
+    Routes the root logger through a QueueHandler so request threads only enqueue records;
+    a background QueueListener formats and writes them. Safe to call more than once.
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(CorrelationFilter())
+        queue_handler.addFilter(SamplingFilter())
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(_build_formatter())
+
+        root = logging.getLogger()
+        root.handlers = [queue_handler]
+        root.setLevel(level or LOG_LEVEL)
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
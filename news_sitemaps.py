@@ -0,0 +1,187 @@
+import logging
+import threading
+import zlib
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+
+from article_record import Article
+from http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+NEWS_NS = "{http://www.google.com/schemas/sitemap-news/0.9}"
+
+CHUNK_SIZE = 64 * 1024
+
+# sitemap/shard url -> {"lastmod", "etag", "last_modified", "articles"}
+# Lets a refresh skip shards whose <lastmod> (or HTTP validators) did not change.
+_sitemap_cache = {}
+_sitemap_cache_lock = threading.Lock()
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+ACCEPT = "application/xml,text/xml;q=0.9,*/*;q=0.8"
+
+
+def parse_sitemap_date(value):
+    if not value:
+        return None
+    value = value.strip().replace("Z", "+00:00")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _iter_chunks(response):
+    # .xml.gz sitemaps are served as gzip bodies (not Content-Encoding), so inflate them incrementally
+    decompressor = None
+    first = True
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if not chunk:
+            continue
+        if first:
+            first = False
+            if chunk[:2] == b"\x1f\x8b":
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        yield decompressor.decompress(chunk) if decompressor else chunk
+    if decompressor:
+        yield decompressor.flush()
+
+
+def _child_text(elem, tag):
+    child = elem.find(tag)
+    return child.text.strip() if child is not None and child.text else ""
+
+
+def iter_sitemap_entries(response):
+    """
+    Streams a sitemap or sitemap index and yields ("sitemap", loc, lastmod) for index
+    entries and ("url", entry_dict) for <url> entries. Each element is dropped from the
+    tree as soon as it is handled, so memory stays bounded by one entry plus one chunk.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    for chunk in _iter_chunks(response):
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag == SITEMAP_NS + "sitemap":
+                yield "sitemap", _child_text(elem, SITEMAP_NS + "loc"), _child_text(elem, SITEMAP_NS + "lastmod")
+                root.clear()
+            elif elem.tag == SITEMAP_NS + "url":
+                news = elem.find(NEWS_NS + "news")
+                yield "url", {
+                    "loc": _child_text(elem, SITEMAP_NS + "loc"),
+                    "lastmod": _child_text(elem, SITEMAP_NS + "lastmod"),
+                    "title": _child_text(news, NEWS_NS + "title") if news is not None else "",
+                    "publication_date": _child_text(news, NEWS_NS + "publication_date") if news is not None else "",
+                }
+                root.clear()
+    parser.close()
+
+
+def _fetch_sitemap(session, url, source, lastmod=""):
+    """
+    Returns (index_entries, articles) for one sitemap document. A shard whose lastmod
+    (from the parent index) or HTTP validators are unchanged is served from the cache.
+    """
+    with _sitemap_cache_lock:
+        cached = _sitemap_cache.get(url)
+    if cached and lastmod and cached["lastmod"] == lastmod:
+        return cached["index_entries"], cached["articles"]
+
+    headers = {"Accept": ACCEPT}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = session.get(url, headers=headers, timeout=15, stream=True)
+    try:
+        if response.status_code == 304 and cached:
+            return cached["index_entries"], cached["articles"]
+        response.raise_for_status()
+
+        index_entries = []
+        articles = []
+        for kind, *payload in iter_sitemap_entries(response):
+            if kind == "sitemap":
+                index_entries.append((payload[0], payload[1]))
+                continue
+            entry = payload[0]
+            if not entry["loc"] or not entry["title"]:
+                continue
+            articles.append(Article(
+                " ".join(entry["title"].split()),
+                entry["loc"],
+                source,
+                published=entry["publication_date"] or entry["lastmod"],
+            ))
+    finally:
+        response.close()
+
+    with _sitemap_cache_lock:
+        _sitemap_cache[url] = {
+            "lastmod": lastmod,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "index_entries": index_entries,
+            "articles": articles,
+        }
+    return index_entries, articles
+
+
+def scrape_news_sitemap(sitemap_url, source, path_filter=None, max_age_hours=48, max_articles=60, max_shards=10):
+    """
+    Reads a Google News sitemap (or a sitemap index pointing at news shards) and returns
+    article dicts built from the <news:title> and <news:publication_date> entries.
+    """
+    try:
+        session = get_session(USER_AGENT)
+        index_entries, articles = _fetch_sitemap(session, sitemap_url, source)
+
+        # Newest shards first; most publishers list them in that order already
+        index_entries = sorted(index_entries, key=lambda e: e[1], reverse=True)[:max_shards]
+        articles = list(articles)
+        for shard_url, shard_lastmod in index_entries:
+            if not shard_url:
+                continue
+            try:
+                _, shard_articles = _fetch_sitemap(session, shard_url, source, lastmod=shard_lastmod)
+                articles.extend(shard_articles)
+            except Exception as e:
+                logger.warning("Error reading sitemap shard %s: %s", shard_url, e)
+
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours) if max_age_hours else None
+        results = []
+        seen_urls = set()
+        for article in articles:
+            if path_filter and path_filter not in article["url"]:
+                continue
+            published = parse_sitemap_date(article["published"])
+            if cutoff and published and published < cutoff:
+                continue
+            if article["url"] in seen_urls:
+                continue
+            results.append(article)
+            seen_urls.add(article["url"])
+
+        results.sort(key=lambda a: a["published"], reverse=True)
+        logger.debug("scrape_news_sitemap (%s): %s articles", source, len(results[:max_articles]))
+        return results[:max_articles]
+    except Exception as e:
+        logger.warning("Error scraping news sitemap for %s: %s", source, e)
+        return []
+
+
+if __name__ == "__main__":
+    for art in scrape_news_sitemap("https://www.nytimes.com/sitemaps/new/news.xml.gz", "NY Times"):
+        print(f"- {art['title']} ({art['published']})\n   {art['url']}")
@@ -1,12 +1,27 @@
 # news_sources.py
-import requests
-from bs4 import BeautifulSoup
-import time
-import re
+import logging
+from article_record import Article
+from http_client import NewsSession, parse_html
+from keywords import KeywordMatcher
+from news_sitemaps import scrape_news_sitemap
+from metrics import time_stage
+from pagination import paginate
+from source_runner import run_source
+from text_normalization import clean_title
+
+logger = logging.getLogger(__name__)
+
+education_keywords = [
+    "education", "school", "student", "teacher", "pupil", "exam", "board exam", "cbse",
+    "icse", "ncert", "neet", "jee", "cuet", "ugc", "nep", "university", "college",
+    "admission", "syllabus", "curriculum", "scholarship", "classroom", "campus", "degree",
+    "graduate", "tuition", "literacy", "ofsted", "gcse", "edtech"
+]
+education_matcher = KeywordMatcher(education_keywords)
 
 
 def get_session():
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -17,20 +32,6 @@ def get_session():
     return session
 
 
-def clean_title(title):
-    if not title:
-        return None
-    title = re.sub(r'\s+', ' ', title.strip())
-    if len(title) < 10 or len(title) > 200:
-        return None
-    # Filter out navigation items and ads
-    skip_words = ['subscribe', 'login', 'register', 'advertisement', 'menu', 'search', 'newsletter']
-    if any(word in title.lower() for word in skip_words):
-        return None
-    return title
-
-
-
 def scrape_flipboard(region="India"):
     try:
         session = get_session()
@@ -47,7 +48,7 @@ def scrape_flipboard(region="India"):
             url = "https://flipboard.com/topic/education"
 
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         # Try multiple selectors for Flipboard's evolving structure
@@ -65,15 +66,11 @@ def scrape_flipboard(region="India"):
             if not href.startswith('http'):
                 href = "https://flipboard.com" + href
 
-            articles.append({
-                "title": title,
-                "url": href,
-                "source": "Flipboard"
-            })
+            articles.append(Article(title, href, "Flipboard"))
 
         return articles
     except Exception as e:
-        print(f"Error scraping Flipboard: {e}")
+        logger.warning("Error scraping Flipboard: %s", e)
         return []
 
 def scrape_scoopit(region="India"):
@@ -95,7 +92,7 @@ def scrape_scoopit(region="India"):
         for topic in topics:
             url = f"https://www.scoop.it/topic/{topic}"
             response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = parse_html(response)
 
             # More robust selector
             for item in soup.select('[class*="postItem"]'):
@@ -115,15 +112,11 @@ def scrape_scoopit(region="India"):
                 if href.startswith('/'):
                     href = "https://www.scoop.it" + href
 
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Scoop.it"
-                })
+                articles.append(Article(title, href, "Scoop.it"))
 
         return articles[:15]
     except Exception as e:
-        print(f"Error scraping Scoop.it: {e}")
+        logger.warning("Error scraping Scoop.it: %s", e)
         return []
         #Indian News Sources
 def scrape_hindustan_times():
@@ -131,7 +124,7 @@ def scrape_hindustan_times():
         session = get_session()
         url = "https://www.hindustantimes.com/education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.story-box a', '.listView a', '.story-title a']
@@ -148,29 +141,36 @@ def scrape_hindustan_times():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "Hindustan Times"})
+                    articles.append(Article(title, href, "Hindustan Times"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Hindustan Times: {e}")
+        logger.warning("Error scraping Hindustan Times: %s", e)
         return []
 
 # ...existing code...
 
-def scrape_times_of_india(sources=None):
+# Times of India articles a selection keeps: more when it is the only source chosen.
+# Dispatchers scrape the larger number and cut each selection's share afterwards, since
+# run_source shares one scrape between every selection that includes the source
+TIMES_OF_INDIA_MAX_ARTICLES = 40
+TIMES_OF_INDIA_ONLY_MAX_ARTICLES = 60
+
+
+def times_of_india_cap(sources, cap=TIMES_OF_INDIA_MAX_ARTICLES):
+    return TIMES_OF_INDIA_ONLY_MAX_ARTICLES if list(sources or ()) == ["times_of_india"] else cap
+
+
+def scrape_times_of_india(max_articles=TIMES_OF_INDIA_MAX_ARTICLES):
     try:
         session = get_session()
         url = "https://timesofindia.indiatimes.com/education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
-        # Determine the max articles based on sources
-        if sources and isinstance(sources, list) and len(sources) == 1 and sources[0] == "times_of_india":
-            MAX_ARTICLES = 60
-        else:
-            MAX_ARTICLES = 40
+        MAX_ARTICLES = max_articles
 
         # Primary pattern: Articles in div with class "lSIdy col_l_6 col_m_6"
         for div in soup.select('div.lSIdy.col_l_6.col_m_6'):
@@ -186,16 +186,16 @@ def scrape_times_of_india(sources=None):
                             href = "https://timesofindia.indiatimes.com" + href
                         elif not href.startswith('http'):
                             continue
-                        articles.append({"title": title, "url": href, "source": "Times of India"})
+                        articles.append(Article(title, href, "Times of India"))
                         seen_titles.add(title)
                         if len(articles) >= MAX_ARTICLES:
-                            print(f"Times of India scraper found {len(articles)} articles (limit reached)")
+                            logger.debug("Times of India scraper found %s articles (limit reached)", len(articles))
                             return articles
 
         # Secondary pattern: Articles with figcaption and p tags
         for a_tag in soup.find_all('a', href=True):
             if len(articles) >= MAX_ARTICLES:
-                print(f"Times of India scraper found {len(articles)} articles (limit reached)")
+                logger.debug("Times of India scraper found %s articles (limit reached)", len(articles))
                 return articles
             figcaption = a_tag.find('figcaption')
             if figcaption:
@@ -207,13 +207,13 @@ def scrape_times_of_india(sources=None):
                         href = "https://timesofindia.indiatimes.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Times of India"})
+                    articles.append(Article(title, href, "Times of India"))
                     seen_titles.add(title)
 
         # Alternative pattern: Look for general education section links with class "linktype1"
         for a_tag in soup.select('a.linktype1[href*="education"]'):
             if len(articles) >= MAX_ARTICLES:
-                print(f"Times of India scraper found {len(articles)} articles (limit reached)")
+                logger.debug("Times of India scraper found %s articles (limit reached)", len(articles))
                 return articles
             span_tag = a_tag.find('span')
             if span_tag:
@@ -225,14 +225,14 @@ def scrape_times_of_india(sources=None):
                         href = "https://timesofindia.indiatimes.com" + href
                     elif not href.startswith('http'):
                         continue
-                    articles.append({"title": title, "url": href, "source": "Times of India"})
+                    articles.append(Article(title, href, "Times of India"))
                     seen_titles.add(title)
 
-        print(f"Times of India scraper found {len(articles)} articles")
+        logger.debug("Times of India scraper found %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping Times of India: {e}")
+        logger.warning("Error scraping Times of India: %s", e)
         return []
 
 def scrape_indian_express_education():
@@ -240,7 +240,7 @@ def scrape_indian_express_education():
         session = get_session()
         url = "https://indianexpress.com/section/education/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['.title a', 'h2 a', '.articles a', '.entry-title a']
@@ -257,12 +257,12 @@ def scrape_indian_express_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "Indian Express"})
+                    articles.append(Article(title, href, "Indian Express"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Indian Express: {e}")
+        logger.warning("Error scraping Indian Express: %s", e)
         return []
 
 def scrape_the_hindu_education():
@@ -270,7 +270,7 @@ def scrape_the_hindu_education():
         session = get_session()
         url = "https://www.thehindu.com/education/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['.title a', 'h2 a', 'h3 a', '.story-card-news a']
@@ -287,12 +287,12 @@ def scrape_the_hindu_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "The Hindu"})
+                    articles.append(Article(title, href, "The Hindu"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping The Hindu: {e}")
+        logger.warning("Error scraping The Hindu: %s", e)
         return []
 
 def scrape_deccan_herald_education():
@@ -300,7 +300,7 @@ def scrape_deccan_herald_education():
         session = get_session()
         url = "https://www.deccanherald.com/education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['.article-title a', 'h2 a', 'h3 a', '.story-title a']
@@ -317,12 +317,12 @@ def scrape_deccan_herald_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "Deccan Herald"})
+                    articles.append(Article(title, href, "Deccan Herald"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Deccan Herald: {e}")
+        logger.warning("Error scraping Deccan Herald: %s", e)
         return []
 
 def scrape_ndtv_education():
@@ -330,7 +330,7 @@ def scrape_ndtv_education():
         session = get_session()
         url = "https://www.ndtv.com/education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['.newsHdng a', 'h2 a', 'h1 a', '.news-title a']
@@ -347,47 +347,41 @@ def scrape_ndtv_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "NDTV"})
+                    articles.append(Article(title, href, "NDTV"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping NDTV: {e}")
+        logger.warning("Error scraping NDTV: %s", e)
         return []
 
 def scrape_financial_express_education(max_pages=5):
     try:
         session = get_session()
-        articles = []
         seen_titles = set()
         MAX_ARTICLES = 30
 
-        for page in range(1, max_pages + 1):
-            if len(articles) >= MAX_ARTICLES:
-                print(f"Financial Express scraper found {len(articles)} articles (limit reached)")
-                return articles
-            if page == 1:
-                url = "https://www.financialexpress.com/about/education/"
-            else:
-                url = f"https://www.financialexpress.com/about/education/page/{page}/"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
+        page_urls = ["https://www.financialexpress.com/about/education/"] + [
+            f"https://www.financialexpress.com/about/education/page/{page}/" for page in range(2, max_pages + 1)
+        ]
+
+        def parse_page(response):
+            articles = []
+            soup = parse_html(response)
             for entry in soup.select('div.entry-wrapper'):
-                if len(articles) >= MAX_ARTICLES:
-                    print(f"Financial Express scraper found {len(articles)} articles (limit reached)")
-                    return articles
                 title_tag = entry.select_one('div.entry-title a')
                 if not title_tag:
                     continue
                 title = clean_title(title_tag.get_text())
                 href = title_tag.get('href', '')
                 if title and title not in seen_titles and href:
-                    articles.append({"title": title, "url": href, "source": "Financial Express"})
+                    articles.append(Article(title, href, "Financial Express"))
                     seen_titles.add(title)
-        print(f"Financial Express scraper found {len(articles)} articles")
-        return articles
+            return articles
+
+        return paginate(session, page_urls, parse_page, "scrape_financial_express_education", max_articles=MAX_ARTICLES)
     except Exception as e:
-        print(f"Error scraping Financial Express: {e}")
+        logger.warning("Error scraping Financial Express: %s", e)
         return []
 
 def scrape_bbc_education():
@@ -395,7 +389,7 @@ def scrape_bbc_education():
         session = get_session()
         url = "https://www.bbc.com/news/education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.gel-layout__item a', '.media__content a']
@@ -412,12 +406,12 @@ def scrape_bbc_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "BBC"})
+                    articles.append(Article(title, href, "BBC"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping BBC: {e}")
+        logger.warning("Error scraping BBC: %s", e)
         return []
 
 def scrape_guardian_education():
@@ -425,7 +419,7 @@ def scrape_guardian_education():
         session = get_session()
         url = "https://www.theguardian.com/education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['.fc-item__title a', '.u-faux-block-link__overlay', 'h3 a']
@@ -442,12 +436,12 @@ def scrape_guardian_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "The Guardian"})
+                    articles.append(Article(title, href, "The Guardian"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Guardian: {e}")
+        logger.warning("Error scraping Guardian: %s", e)
         return []
 
 def scrape_nytimes_education():
@@ -455,7 +449,7 @@ def scrape_nytimes_education():
         session = get_session()
         url = "https://www.nytimes.com/section/education"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.css-1l4spti a']
@@ -472,12 +466,12 @@ def scrape_nytimes_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "NY Times"})
+                    articles.append(Article(title, href, "NY Times"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping NY Times: {e}")
+        logger.warning("Error scraping NY Times: %s", e)
         return []
 
 def scrape_washington_post_education():
@@ -485,7 +479,7 @@ def scrape_washington_post_education():
         session = get_session()
         url = "https://www.washingtonpost.com/education/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.headline a', '.title a']
@@ -502,20 +496,30 @@ def scrape_washington_post_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "Washington Post"})
+                    articles.append(Article(title, href, "Washington Post"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Washington Post: {e}")
+        logger.warning("Error scraping Washington Post: %s", e)
         return []
 
+def scrape_nytimes_education_sitemap():
+    return scrape_news_sitemap(
+        "https://www.nytimes.com/sitemaps/new/news.xml.gz", "NY Times", path_filter="/education/"
+    )
+
+def scrape_washington_post_education_sitemap():
+    return scrape_news_sitemap(
+        "https://www.washingtonpost.com/arcio/news-sitemap/", "Washington Post", path_filter="/education/"
+    )
+
 def scrape_telegraph_education():
     try:
         session = get_session()
         url = "https://www.telegraph.co.uk/education/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.list-headline a', '.card__heading a']
@@ -532,12 +536,12 @@ def scrape_telegraph_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "The Telegraph"})
+                    articles.append(Article(title, href, "The Telegraph"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Telegraph: {e}")
+        logger.warning("Error scraping Telegraph: %s", e)
         return []
 
 def scrape_times_higher_education():
@@ -545,7 +549,7 @@ def scrape_times_higher_education():
         session = get_session()
         url = "https://www.timeshighereducation.com/news"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.views-field-title a', '.article-title a']
@@ -562,12 +566,12 @@ def scrape_times_higher_education():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "Times Higher Education"})
+                    articles.append(Article(title, href, "Times Higher Education"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Times Higher Education: {e}")
+        logger.warning("Error scraping Times Higher Education: %s", e)
         return []
 
 def scrape_inside_higher_ed():
@@ -575,7 +579,7 @@ def scrape_inside_higher_ed():
         session = get_session()
         url = "https://www.insidehighered.com/news"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.views-field-title a', '.article-title a']
@@ -592,12 +596,12 @@ def scrape_inside_higher_ed():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "Inside Higher Ed"})
+                    articles.append(Article(title, href, "Inside Higher Ed"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Inside Higher Ed: {e}")
+        logger.warning("Error scraping Inside Higher Ed: %s", e)
         return []
 
 def scrape_edweek():
@@ -605,7 +609,7 @@ def scrape_edweek():
         session = get_session()
         url = "https://www.edweek.org/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.article-title a', '.headline a']
@@ -622,12 +626,12 @@ def scrape_edweek():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "EdWeek"})
+                    articles.append(Article(title, href, "EdWeek"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping EdWeek: {e}")
+        logger.warning("Error scraping EdWeek: %s", e)
         return []
 
 def scrape_chronicle():
@@ -635,7 +639,7 @@ def scrape_chronicle():
         session = get_session()
         url = "https://www.chronicle.com/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         selectors = ['h3 a', 'h2 a', '.hed a', '.title a']
@@ -652,12 +656,12 @@ def scrape_chronicle():
                     elif not href.startswith('http'):
                         continue
 
-                    articles.append({"title": title, "url": href, "source": "The Chronicle"})
+                    articles.append(Article(title, href, "The Chronicle"))
                     seen_titles.add(title)
 
         return articles
     except Exception as e:
-        print(f"Error scraping Chronicle: {e}")
+        logger.warning("Error scraping Chronicle: %s", e)
         return []
 
 
@@ -666,7 +670,7 @@ def scrape_india_today_education():
         session = get_session()
         url = "https://www.indiatoday.in/education-today/news"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
 
         # Each article is inside a div with class 'B1S3_content__wrap__9mSB6'
@@ -679,14 +683,34 @@ def scrape_india_today_education():
             if href.startswith('/'):
                 href = "https://www.indiatoday.in" + href
 
-            articles.append({"title": title, "url": href, "source": "India Today" })
+            articles.append(Article(title, href, "India Today"))
 
         return articles
     except Exception as e:
-        print(f"Error scraping India Today: {e}")
+        logger.warning("Error scraping India Today: %s", e)
         return []
 
-def scrape_news(region, sources=None):
+def dedupe_articles(articles):
+    """Drops articles whose normalized URL or title prefix was already seen, keeping the first, as Article records."""
+    seen_urls = set()
+    seen_titles = set()
+    unique_articles = []
+
+    with time_stage("dedupe"):
+        for article in articles:
+            article = Article.of(article)
+            url = article.url_hash
+            title = article.title_fingerprint
+
+            if url not in seen_urls and title not in seen_titles:
+                unique_articles.append(article)
+                seen_urls.add(url)
+                seen_titles.add(title)
+
+    return unique_articles
+
+
+def scrape_news(region, sources=None, exclude=()):
     articles = []
     errors = []
 
@@ -695,7 +719,7 @@ def scrape_news(region, sources=None):
         "flipboard": lambda: scrape_flipboard(region),
         "scoopit": lambda: scrape_scoopit(region),
         "hindustan_times": scrape_hindustan_times,
-        "times_of_india": (lambda: scrape_times_of_india(sources)),
+        "times_of_india": (lambda: scrape_times_of_india(TIMES_OF_INDIA_ONLY_MAX_ARTICLES)),
         "indian_express": scrape_indian_express_education,
         "the_hindu": scrape_the_hindu_education,
         "deccan_herald": scrape_deccan_herald_education,
@@ -711,6 +735,8 @@ def scrape_news(region, sources=None):
         "guardian": scrape_guardian_education,
         "nytimes": scrape_nytimes_education,
         "washington_post": scrape_washington_post_education,
+        "nytimes_sitemap": scrape_nytimes_education_sitemap,
+        "washington_post_sitemap": scrape_washington_post_education_sitemap,
         "telegraph": scrape_telegraph_education,
         "times_higher_education": scrape_times_higher_education,
         "inside_higher_ed": scrape_inside_higher_ed,
@@ -726,40 +752,28 @@ def scrape_news(region, sources=None):
     if sources is None:
         sources = list(source_map.keys())
 
-    print(f"Scraping selected sources: {sources} for region: {region}")
+    logger.info("Scraping selected sources: %s for region: %s", sources, region)
+
+    sources = [src for src in sources if src not in exclude]
 
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                src_articles = func()
-                print(f"General Education ({region} - {src}): {len(src_articles)} articles")
+                src_articles = run_source("general", region, src, func)
+                if src == "times_of_india":
+                    src_articles = src_articles[:times_of_india_cap(sources)]
+                logger.info("General Education (%s - %s): %s articles", region, src, len(src_articles))
                 articles.extend(src_articles)
-                time.sleep(2)
             except Exception as e:
                 error_msg = f"Error scraping {src}: {e}"
-                print(error_msg)
+                logger.warning("%s", error_msg)
                 errors.append(error_msg)
 
 
-    # Enhanced duplicate removal
-    seen_urls = set()
-    seen_titles = set()
-    unique_articles = []
-
-    for article in articles:
-        # Normalize URL
-        url = article['url'].split('?')[0].split('#')[0].lower()
-
-        # Normalize title
-        title = re.sub(r'[^a-zA-Z0-9]', '', article['title'].lower())[:60]
-
-        if url not in seen_urls and title not in seen_titles:
-            unique_articles.append(article)
-            seen_urls.add(url)
-            seen_titles.add(title)
+    unique_articles = dedupe_articles(articles)
 
-    print(f"Total unique articles found: {len(unique_articles)}")
+    logger.info("Total unique articles found: %s", len(unique_articles))
     return unique_articles, errors
 
 # ---------- Entry Point ----------
@@ -0,0 +1,90 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import MAX_CONNECTIONS_PER_HOST, submit_with_context
+
+logger = logging.getLogger(__name__)
+
+# name -> {"runs", "pages_fetched", "pages_wasted", "last_run"}
+PAGINATION_STATS = {}
+_stats_lock = threading.Lock()
+
+
+def _fetch_page(session, url, timeout):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+
+def _record_run(name, articles, fetched, wasted):
+    with _stats_lock:
+        stats = PAGINATION_STATS.setdefault(name, {"runs": 0, "pages_fetched": 0, "pages_wasted": 0})
+        stats["runs"] += 1
+        stats["pages_fetched"] += fetched
+        stats["pages_wasted"] += wasted
+        stats["last_run"] = {"articles": articles, "pages_fetched": fetched, "pages_wasted": wasted}
+    logger.debug("%s: %s articles, %s pages fetched, %s pages wasted", name, articles, fetched, wasted)
+
+
+def paginate(session, page_urls, parse_page, name, max_articles=None, timeout=15):
+    """
+    Fetches page_urls (page 1 first) with up to MAX_CONNECTIONS_PER_HOST requests in
+    flight and hands each response, in page order, to parse_page(response), which returns
+    the page's article dicts. Deeper pages are no longer requested once a page yields no
+    new URLs or max_articles is reached; pages fetched but not used count as wasted.
+    """
+    articles = []
+    seen_urls = set()
+    fetched = wasted = 0
+    futures = {}
+    next_page = 0
+    concurrency = max(1, min(MAX_CONNECTIONS_PER_HOST, len(page_urls)))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        def submit_next():
+            nonlocal next_page
+            if next_page < len(page_urls):
+                futures[next_page] = submit_with_context(pool, _fetch_page, session, page_urls[next_page], timeout)
+                next_page += 1
+
+        for _ in range(concurrency):
+            submit_next()
+
+        index = 0
+        while index in futures:
+            future = futures.pop(index)
+            try:
+                response = future.result()
+            except Exception as e:
+                logger.warning("%s: page %s failed: %s", name, index + 1, e)
+                break
+            fetched += 1
+
+            new_articles = [a for a in parse_page(response) if a["url"] not in seen_urls]
+            if not new_articles:
+                wasted += 1
+                break
+            for article in new_articles:
+                seen_urls.add(article["url"])
+            articles.extend(new_articles)
+            if max_articles and len(articles) >= max_articles:
+                articles = articles[:max_articles]
+                break
+
+            submit_next()
+            index += 1
+
+        # Deeper pages already in flight when we stopped
+        for future in futures.values():
+            if future.cancel():
+                continue
+            try:
+                future.result()
+                fetched += 1
+                wasted += 1
+            except Exception:
+                pass
+
+    _record_run(name, len(articles), fetched, wasted)
+    return articles
@@ -0,0 +1,176 @@
+import contextvars
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# "*" profiles every request; otherwise a comma separated list of category/region pairs, e.g. "sports/India,tech/Global"
+PROFILE_REQUESTS = os.getenv("PROFILE_REQUESTS", "")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+# Oldest profiles beyond this many are deleted
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+_active_profile = contextvars.ContextVar("active_profile", default=None)
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of the threads attached to one request every PROFILE_SAMPLE_INTERVAL
+    seconds from a background thread, and aggregates them as collapsed stacks
+    ("root;caller;callee count"), the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def attach(self, ident, name):
+        with self._lock:
+            self._threads[ident] = name
+
+    def detach(self, ident):
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, name in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(name)
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def should_profile(category, region):
+    if not PROFILE_REQUESTS:
+        return False
+    if PROFILE_REQUESTS.strip() == "*":
+        return True
+    wanted = {item.strip().lower() for item in PROFILE_REQUESTS.split(",")}
+    return f"{category}/{region}".lower() in wanted
+
+
+@contextmanager
+def attach_current_thread():
+    """Adds the calling worker thread to the request's profile, if one is running in this context."""
+    profiler = _active_profile.get()
+    if profiler is None:
+        yield
+        return
+    ident = threading.get_ident()
+    profiler.attach(ident, threading.current_thread().name)
+    try:
+        yield
+    finally:
+        profiler.detach(ident)
+
+
+def _safe_name(value):
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", str(value)).strip("-") or "none"
+
+
+def _prune(keep=PROFILE_KEEP):
+    profiles = list_profiles()
+    for entry in profiles[keep:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, entry["name"]))
+        except OSError:
+            pass
+
+
+@contextmanager
+def maybe_profile(category, region, force=False, correlation_id=None):
+    """
+    Profiles the block when forced (admin request flag) or when PROFILE_REQUESTS matches
+    category/region, writing a .collapsed file to PROFILE_DIR. Otherwise it does nothing.
+    """
+    if not force and not should_profile(category, region):
+        yield None
+        return
+
+    profiler = SamplingProfiler()
+    token = _active_profile.set(profiler)
+    profiler.attach(threading.get_ident(), threading.current_thread().name)
+    started = time.time()
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active_profile.reset(token)
+        elapsed = time.time() - started
+        name = "{}.{}.{}.{}.collapsed".format(
+            time.strftime("%Y%m%dT%H%M%S", time.gmtime(started)),
+            _safe_name(category), _safe_name(region), _safe_name(correlation_id),
+        )
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(os.path.join(PROFILE_DIR, name), "w", encoding="utf-8") as f:
+                f.write(profiler.collapsed())
+            _prune()
+            logger.info("Profile written: %s (%s samples, %.2fs)", name, profiler.samples, elapsed)
+        except OSError as e:
+            logger.warning("Could not write profile %s: %s", name, e)
+
+
+def list_profiles():
+    """Profiles in PROFILE_DIR, newest first."""
+    try:
+        names = [n for n in os.listdir(PROFILE_DIR) if n.endswith(".collapsed")]
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names:
+        path = os.path.join(PROFILE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        parts = name[: -len(".collapsed")].split(".")
+        profiles.append({
+            "name": name,
+            "started": parts[0],
+            "category": parts[1] if len(parts) > 1 else "",
+            "region": parts[2] if len(parts) > 2 else "",
+            "correlation_id": parts[3] if len(parts) > 3 else "",
+            "bytes": stat.st_size,
+            "modified": stat.st_mtime,
+        })
+    profiles.sort(key=lambda p: p["modified"], reverse=True)
+    return profiles
@@ -0,0 +1,120 @@
+"""
+Sends the subscriptions that are due. Subscriptions wanting the same digest
+(category, region, sources, top_n) form one group, which is scraped and ranked once
+and then mailed to every member, so scrape and LLM cost follow the number of
+distinct digests rather than the number of subscribers.
+
+Runs inside the app when SCHEDULER_ENABLED is set, or on its own with
+SCHEDULER_ENABLED=external in the app's environment:
+
+    python -m scheduler
+
+With neither, the app turns subscriptions away, since nothing would send them.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import SCHEDULED_DIGESTS, SCHEDULED_SUBSCRIPTIONS
+from news_ai_agent import deliver_digest, digest_outcome, scrape_articles
+from news_logging import correlation_scope
+from subscriptions import get_subscriptions, unsubscribe_url
+
+logger = logging.getLogger(__name__)
+
+# "1"/"true"/"yes" runs the scheduler in the app; "external" means `python -m scheduler` runs it elsewhere
+SCHEDULER_MODE = os.getenv("SCHEDULER_ENABLED", "").lower()
+SCHEDULER_ENABLED = SCHEDULER_MODE in ("1", "true", "yes")
+# How often due subscriptions are claimed, and how many digest groups run at once
+SCHEDULER_INTERVAL_SECONDS = float(os.getenv("SCHEDULER_INTERVAL_SECONDS", "60"))
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+
+
+def group_subscriptions(subscriptions):
+    """{(category, region, sources, top_n): [subscriptions]}; sources are stored sorted, so equal lists group together."""
+    groups = {}
+    for subscription in subscriptions:
+        key = (subscription["category"], subscription["region"], tuple(subscription["sources"]), subscription["top_n"])
+        groups.setdefault(key, []).append(subscription)
+    return groups
+
+
+def run_group(key, members, store):
+    category, region, sources, top_n = key
+    with correlation_scope():
+        logger.info("Scheduled %s/%s digest (top %s) for %s subscribers", category, region, top_n, len(members))
+        try:
+            articles, topic, errors = scrape_articles(category, region, list(sources))
+            status = deliver_digest(
+                [member["email"] for member in members],
+                articles,
+                topic,
+                top_n,
+                errors,
+                unsubscribe_urls={member["email"]: unsubscribe_url(member["token"]) for member in members},
+            )
+        except Exception as e:
+            logger.exception("Scheduled %s/%s digest failed", category, region)
+            status = f"❌ Scheduled digest failed: {e}"
+    SCHEDULED_DIGESTS.inc(outcome=digest_outcome(status))
+    store.record_run([member["id"] for member in members], status)
+    return status
+
+
+def run_due(store=None, now=None):
+    """Claims every due subscription and sends one digest per group. Returns {group key: status message}."""
+    store = store or get_subscriptions()
+    if store is None:
+        return {}
+    due = store.claim_due(now)
+    if not due:
+        return {}
+    SCHEDULED_SUBSCRIPTIONS.inc(len(due))
+    groups = group_subscriptions(due)
+    logger.info("Running %s due subscriptions as %s digests", len(due), len(groups))
+    with ThreadPoolExecutor(max_workers=max(1, min(SCHEDULER_WORKERS, len(groups)))) as pool:
+        futures = {key: pool.submit(run_group, key, members, store) for key, members in groups.items()}
+    return {key: future.result() for key, future in futures.items()}
+
+
+def run_forever(stop=None, interval=SCHEDULER_INTERVAL_SECONDS):
+    stop = stop or threading.Event()
+    while True:
+        try:
+            run_due()
+        except Exception:
+            logger.exception("Scheduler pass failed")
+        if stop.wait(interval):
+            return
+
+
+def subscriptions_enabled():
+    """True if subscriptions can be stored and something will send them."""
+    return (SCHEDULER_ENABLED or SCHEDULER_MODE == "external") and get_subscriptions() is not None
+
+
+_thread = None
+_thread_lock = threading.Lock()
+
+
+def start_scheduler():
+    """Starts the scheduler on a daemon thread, once per process, if SCHEDULER_ENABLED is set."""
+    global _thread
+    if not SCHEDULER_ENABLED or get_subscriptions() is None:
+        return None
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=run_forever, name="scheduler", daemon=True)
+            _thread.start()
+    return _thread
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    from news_logging import configure_logging
+
+    load_dotenv()
+    configure_logging()
+    run_forever()
@@ -0,0 +1,74 @@
+"""
+Batching of concurrent interactive digest scrapes. Submissions for the same
+category/region that overlap in time form one batch and share its per-source results:
+each member runs its own selection straight away, and a source that another member
+has already scraped is answered from the batch while one still being scraped is
+waited on (run_source's single-flight), so a burst fetches each publisher at most
+once however the members' source lists overlap. A submission with nothing else in
+flight scrapes on its own without waiting for company. A batch takes new members
+for at most SCRAPE_BATCH_MAX_AGE_SECONDS, so steady traffic still scrapes afresh.
+"""
+import logging
+import os
+import threading
+import time
+
+from metrics import SCRAPE_BATCH_SIZE
+from source_runner import shared_scrapes
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_BATCHING = os.getenv("SCRAPE_BATCHING", "1") != "0"
+SCRAPE_BATCH_MAX_AGE_SECONDS = float(os.getenv("SCRAPE_BATCH_MAX_AGE_SECONDS", "5"))
+
+
+class _Batch:
+    __slots__ = ("opened", "size", "active", "outcomes")
+
+    def __init__(self):
+        self.opened = time.monotonic()
+        self.size = 0
+        self.active = 0
+        self.outcomes = {}
+
+
+class ScrapeBatcher:
+    def __init__(self, enabled=SCRAPE_BATCHING, max_age=SCRAPE_BATCH_MAX_AGE_SECONDS):
+        self.enabled = enabled
+        self.max_age = max_age
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def scrape(self, scrape, category, region, sources=None):
+        """scrape(category, region, sources) for one submission, sharing source scrapes with the rest of its batch."""
+        if not self.enabled:
+            return scrape(category, region, sources)
+        key = (category, region)
+        with self._lock:
+            batch = self._open.get(key)
+            if batch is None or time.monotonic() - batch.opened > self.max_age:
+                # Too old to join: its remaining members finish on it, newcomers start another
+                batch = self._open[key] = _Batch()
+            elif batch.size == 1:
+                logger.info("Sharing %s/%s source scrapes with an in-flight submission", category, region)
+            batch.size += 1
+            batch.active += 1
+        try:
+            with shared_scrapes(batch.outcomes):
+                return scrape(category, region, sources)
+        finally:
+            # The last member out closes the batch; later submissions scrape afresh
+            with self._lock:
+                batch.active -= 1
+                closed = batch.active == 0
+                if closed and self._open.get(key) is batch:
+                    del self._open[key]
+            if closed:
+                SCRAPE_BATCH_SIZE.observe(batch.size)
+
+
+_batcher = ScrapeBatcher()
+
+
+def batched_scrape(scrape, category, region, sources=None):
+    return _batcher.scrape(scrape, category, region, sources)
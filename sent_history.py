@@ -0,0 +1,212 @@
+"""
+What each recipient has already been sent, so a repeat subscriber's digest only
+holds stories they haven't seen.
+
+A recipient's history is a Bloom filter of article fingerprints (canonical URL and
+title key, so the same story under a new URL counts too): about 6 KB for
+SENT_HISTORY_CAPACITY fingerprints at a 1% false-positive rate, however long the URLs.
+A false positive only leaves one story out of one digest. When the current filter
+is full it becomes the previous one and an empty one takes over, so a history covers
+the last one to two capacities' worth of fingerprints and never saturates.
+"""
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from text_normalization import canonical_url, title_key
+
+logger = logging.getLogger(__name__)
+
+# Empty disables sent history: every digest ranks everything scraped
+SENT_HISTORY_PATH = os.getenv("SENT_HISTORY_PATH", os.path.join("data", "sent_history.sqlite3"))
+# Fingerprints (two per story) per filter generation, and the false-positive rate at that fill
+SENT_HISTORY_CAPACITY = int(os.getenv("SENT_HISTORY_CAPACITY", "5000"))
+SENT_HISTORY_ERROR_RATE = float(os.getenv("SENT_HISTORY_ERROR_RATE", "0.01"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent_history (
+    recipient TEXT PRIMARY KEY,
+    bits INTEGER NOT NULL,
+    hashes INTEGER NOT NULL,
+    current BLOB NOT NULL,
+    current_count INTEGER NOT NULL,
+    previous BLOB,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_LOAD = "SELECT bits, hashes, current, current_count, previous FROM sent_history WHERE recipient = ?"
+_SAVE = """
+INSERT OR REPLACE INTO sent_history (recipient, bits, hashes, current, current_count, previous, updated)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def fingerprints(article):
+    """The keys an article is remembered by: its canonical URL and, if it has letters or digits, its title key."""
+    keys = []
+    if article.get("url"):
+        keys.append("u:" + canonical_url(article["url"]))
+    key = title_key(article.get("title") or "")
+    if key:
+        keys.append("t:" + key)
+    return keys
+
+
+class BloomFilter:
+    """Fixed-size bit array probed at `hashes` positions per key (double hashing over one blake2b digest)."""
+
+    def __init__(self, bits, hashes, data=None, count=0):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = bytearray(data) if data is not None else bytearray((bits + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate):
+        bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        return cls(bits, max(1, round(bits / capacity * math.log(2))))
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        # Odd, so the probes never collapse onto one position
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key):
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def add(self, key):
+        """Sets key's bits; True if any was unset, i.e. the key is new."""
+        added = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self.data[position >> 3] & mask:
+                self.data[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+
+class RecipientHistory:
+    def __init__(self, current, previous=None, capacity=SENT_HISTORY_CAPACITY):
+        self.current = current
+        self.previous = previous
+        self.capacity = capacity
+
+    def sent(self, article):
+        """True if this article (or one with the same URL or title) was sent before."""
+        filters = [f for f in (self.current, self.previous) if f is not None]
+        return any(key in f for key in fingerprints(article) for f in filters)
+
+    def add(self, articles):
+        for article in articles:
+            for key in fingerprints(article):
+                self.current.add(key)
+            if self.current.count >= self.capacity:
+                self.previous = self.current
+                self.current = BloomFilter(self.current.bits, self.current.hashes)
+
+
+class SentHistory:
+    def __init__(self, path, capacity=SENT_HISTORY_CAPACITY, error_rate=SENT_HISTORY_ERROR_RATE):
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        """This thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def load(self, recipient, conn=None):
+        row = (conn or self.connection()).execute(_LOAD, (recipient,)).fetchone()
+        if row is None:
+            return RecipientHistory(BloomFilter.for_capacity(self.capacity, self.error_rate), capacity=self.capacity)
+        bits, hashes, current, count, previous = row
+        return RecipientHistory(
+            BloomFilter(bits, hashes, current, count),
+            BloomFilter(bits, hashes, previous) if previous is not None else None,
+            capacity=self.capacity,
+        )
+
+    def record(self, recipient, articles):
+        """Adds articles to the recipient's history; read-modify-write in one transaction."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            history = self.load(recipient, conn)
+            history.add(articles)
+            previous = history.previous
+            conn.execute(_SAVE, (
+                recipient,
+                history.current.bits,
+                history.current.hashes,
+                bytes(history.current.data),
+                history.current.count,
+                bytes(previous.data) if previous is not None else None,
+                time.time(),
+            ))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _recipient(email):
+    return email.strip().lower()
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    """The process-wide sent history, or None when SENT_HISTORY_PATH is empty."""
+    global _history
+    if _history is None and SENT_HISTORY_PATH:
+        with _history_lock:
+            if _history is None:
+                _history = SentHistory(SENT_HISTORY_PATH)
+    return _history
+
+
+def unsent_articles(recipients, articles):
+    """{recipient: the articles not sent to them before, in order}. Everything if history is off or unreadable."""
+    try:
+        history = get_history()
+        if history is None:
+            return {recipient: list(articles) for recipient in recipients}
+        unsent = {}
+        for recipient in recipients:
+            seen = history.load(_recipient(recipient))
+            unsent[recipient] = [article for article in articles if not seen.sent(article)]
+        return unsent
+    except (OSError, sqlite3.Error) as e:
+        # A repeat story is better than no digest
+        logger.warning("Sent history unavailable: %s", e, extra={"sample_every": 100})
+        return {recipient: list(articles) for recipient in recipients}
+
+
+def record_sent(recipient, articles):
+    try:
+        history = get_history()
+        if history is not None:
+            history.record(_recipient(recipient), articles)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Could not record sent articles for a recipient: %s", e, extra={"sample_every": 100})
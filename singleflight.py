@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "finished_at")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs fn, everyone who
+    arrives while it is in flight waits and gets the same result (or exception). With
+    linger > 0 a finished result keeps being shared for that many seconds, which also
+    collapses back-to-back duplicates inside one request.
+    """
+
+    def __init__(self, linger=0.0):
+        self.linger = linger
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, call, now):
+        return call.finished_at is not None and now - call.finished_at >= self.linger
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and self._expired(call, time.monotonic()):
+                call = None
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.finished_at = time.monotonic()
+            call.event.set()
+            with self._lock:
+                if self.linger <= 0 or call.error is not None:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                else:
+                    self._purge_expired()
+        return call.result
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        for key in [k for k, c in self._calls.items() if self._expired(c, now)]:
+            del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return sum(1 for c in self._calls.values() if c.finished_at is None)
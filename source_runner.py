@@ -0,0 +1,98 @@
+import contextvars
+import logging
+from contextlib import contextmanager
+from article_store import store_articles
+from circuit_breaker import get_breaker
+from http_client import SINGLE_FLIGHT_LINGER, deadline_remaining
+from metrics import SOURCE_ARTICLES, SOURCE_ERRORS, SOURCE_SCRAPE_SECONDS
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Every dispatcher has India sources and treats any other region as Global
+REGIONS = ("India", "Global")
+
+_source_flights = SingleFlight(linger=SINGLE_FLIGHT_LINGER)
+_shared_scrapes = contextvars.ContextVar("shared_scrapes", default=None)
+
+
+@contextmanager
+def shared_scrapes(outcomes):
+    """
+    Within this block run_source answers from outcomes, a dict of (category, region,
+    source) -> articles, and records into it whatever it scrapes successfully. Failed,
+    skipped and empty runs are not recorded, so the next member tries the source again.
+    A scrape batch passes one dict to all of its members.
+    """
+    token = _shared_scrapes.set(outcomes)
+    try:
+        yield outcomes
+    finally:
+        _shared_scrapes.reset(token)
+
+
+def region_label(region):
+    """region for metric labels, or "other" for one not in REGIONS, so a region that slips past request validation can't add series."""
+    return region if region in REGIONS else "other"
+
+
+def _scrape(breaker, func, labels, region):
+    try:
+        with SOURCE_SCRAPE_SECONDS.time(**labels):
+            articles = func()
+    except Exception as e:
+        breaker.record_failure(str(e))
+        SOURCE_ERRORS.inc(reason="exception", **labels)
+        raise
+    SOURCE_ARTICLES.inc(len(articles or []), **labels)
+    if articles:
+        breaker.record_success(len(articles))
+        # The crawl stores its articles per routed category instead
+        if labels["category"] != "crawl":
+            store_articles(articles, labels["category"], region)
+    elif deadline_remaining() != 0:
+        # An empty run cut short by the request deadline says nothing about the source
+        breaker.record_failure("no articles")
+        SOURCE_ERRORS.inc(reason="empty", **labels)
+    return articles
+
+
+def _probe(breaker, func, labels, region):
+    try:
+        _scrape(breaker, func, labels, region)
+    except Exception:
+        pass
+
+
+def run_source(category, region, source, func):
+    """
+    Runs one source scraper for a category dispatcher. Concurrent requests for the same
+    (category, region, source) wait on a single scrape and share its articles. A source
+    whose circuit breaker is open, or that starts after the request deadline, is skipped.
+    """
+    key = (category, region, source)
+    outcomes = _shared_scrapes.get()
+    if outcomes is None:
+        return _run_source(key, func)
+    if key in outcomes:
+        return list(outcomes[key])
+    articles = _run_source(key, func)
+    if articles:
+        outcomes[key] = articles
+    return list(articles)
+
+
+def _run_source(key, func):
+    category, region, source = key
+    labels = {"category": category, "region": region_label(region), "source": source}
+    if deadline_remaining() == 0:
+        logger.info("Skipping %s/%s/%s: request deadline exceeded", category, region, source)
+        SOURCE_ERRORS.inc(reason="deadline", **labels)
+        return []
+    breaker = get_breaker("/".join(str(part) for part in key))
+    if not breaker.allow():
+        breaker.maybe_probe(lambda: _probe(breaker, func, labels, region))
+        logger.info("Skipping %s: circuit open", breaker.name, extra={"sample_every": 20})
+        SOURCE_ERRORS.inc(reason="circuit_open", **labels)
+        return []
+    return list(_source_flights.do(key, lambda: _scrape(breaker, func, labels, region)))
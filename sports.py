@@ -1,6 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import logging
+from article_record import Article
+from http_client import NewsSession, parse_html
+from pagination import paginate
+from source_runner import run_source
+from keywords import KeywordMatcher
+from text_normalization import clean_text
+
+logger = logging.getLogger(__name__)
 
 # Define keywords related to sports (used for filtering if needed)
 sports_keywords = [
@@ -10,6 +16,7 @@ sports_keywords = [
     "championship", "sports", "final", "semifinal", "quarterfinal",
     "test", "odi", "t20"
 ]
+sports_matcher = KeywordMatcher(sports_keywords)
 
 # Add this mapping at the top of your file
 SPORTS_SOURCE_MAP = {
@@ -22,12 +29,9 @@ SPORTS_SOURCE_MAP = {
     "espn_global": "ESPN"
 }
 
-# Helper functions to clean titles and initialize sessions
-def clean_title(title):
-    return title.strip().replace("\n", " ").replace("  ", " ")
 
 def get_session():
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/90.0.4430.85 Safari/537.36"
     })
@@ -38,21 +42,15 @@ def get_session():
 def scrape_espncricinfo():
     try:
         session = get_session()
-        articles = []
         seen_titles = set()
 
-        for page_num in range(1, 5):  # Loop through pages 1 to 4
-            if page_num == 1:
-                url = "https://www.espncricinfo.com/genre/news-1"
-            else:
-                url = f"https://www.espncricinfo.com/genre/news-1?page={page_num}"
-
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
+        def parse_page(response):
+            articles = []
+            soup = parse_html(response)
             headlines = soup.select("h2.ds-text-title-s")
 
             for headline in headlines:
-                title = clean_title(headline.text)
+                title = clean_text(headline.text)
                 link_tag = headline.find_parent("a")
                 
                 if title and link_tag:
@@ -61,38 +59,39 @@ def scrape_espncricinfo():
                         href = "https://www.espncricinfo.com" + href
 
                     if href and title not in seen_titles:
-                        articles.append({"title": title, "url": href, "source": "ESPN Cricinfo"})
+                        articles.append(Article(title, href, "ESPN Cricinfo"))
                         seen_titles.add(title)
-            
-            time.sleep(1)  # Be polite to the server
-        print(f"scrape_espncricinfo: {len(articles)} articles")
-        return articles
+            return articles
+
+        # Pages 1 to 4
+        page_urls = ["https://www.espncricinfo.com/genre/news-1"] + [
+            f"https://www.espncricinfo.com/genre/news-1?page={page_num}" for page_num in range(2, 5)
+        ]
+        return paginate(session, page_urls, parse_page, "scrape_espncricinfo")
     except Exception as e:
         return []
 
 def scrape_indian_express_sports():
     try:
         session = get_session()
-        articles = []
         seen_titles = set()
-        for page_num in range(1, 3):  # Pages 1 to 4
-            if page_num == 1:
-                url = "https://indianexpress.com/section/sports/"
-            else:
-                url = f"https://indianexpress.com/section/sports/page/{page_num}/"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
+
+        def parse_page(response):
+            articles = []
+            soup = parse_html(response)
             for tag in soup.select(".articles a"):
-                title = clean_title(tag.text)
+                title = clean_text(tag.text)
                 href = tag.get("href", "")
                 if not href.startswith("http"):
                     href = "https://indianexpress.com" + href
                 if title and title not in seen_titles:
-                    articles.append({"title": title, "url": href, "source": "Indian Express"})
+                    articles.append(Article(title, href, "Indian Express"))
                     seen_titles.add(title)
-            time.sleep(1)
-            print(f"scrape_indian_express_sports: {len(articles)} articles")
-        return articles
+            return articles
+
+        # Pages 1 to 2
+        page_urls = ["https://indianexpress.com/section/sports/", "https://indianexpress.com/section/sports/page/2/"]
+        return paginate(session, page_urls, parse_page, "scrape_indian_express_sports")
     except Exception as e:
         return []
 
@@ -101,7 +100,7 @@ def scrape_ndtv_sports():
         session = get_session()
         url = "https://sports.ndtv.com/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -117,20 +116,20 @@ def scrape_ndtv_sports():
                 link_tag = story
                 img = story.find('img')
                 if img and img.has_attr('alt'):
-                    title = clean_title(img['alt'])
+                    title = clean_text(img['alt'])
             else: # Handle text-based links (structures 1, 3, 4)
                 link_tag = story.find('a')
 
             if link_tag:
                 if not title:  # If title wasn't found in an image alt text
-                    title = clean_title(link_tag.get_text())
+                    title = clean_text(link_tag.get_text())
                 href = link_tag.get('href', '')
 
             if title and href and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "NDTV Sports"})
+                articles.append(Article(title, href, "NDTV Sports"))
                 seen_titles.add(title)
 
-        print(f"scrape_ndtv_sports: {len(articles)} articles")
+        logger.debug("scrape_ndtv_sports: %s articles", len(articles))
                 
         return articles
     except Exception as e:
@@ -139,42 +138,43 @@ def scrape_ndtv_sports():
 def scrape_the_hindu_sports():
     try:
         session = get_session()
-        articles = []
         seen_titles = set()
-        for page_num in range(1, 7):  # Pages 1 to 6
-            url = f"https://www.thehindu.com/sport/other-sports/?page={page_num}"
-            response = session.get(url, timeout=15)
-            soup = BeautifulSoup(response.content, "html.parser")
+
+        def parse_page(response):
+            articles = []
+            soup = parse_html(response)
             for h3 in soup.find_all("h3", class_=["title", "title big"]):
                 a_tag = h3.find("a", href=True)
                 if a_tag:
-                    title = clean_title(a_tag.get_text())
+                    title = clean_text(a_tag.get_text())
                     href = a_tag["href"]
                     if not href.startswith("http"):
                         href = "https://www.thehindu.com" + href
                     if title and href and title not in seen_titles:
-                        articles.append({"title": title, "url": href, "source": "The Hindu"})
+                        articles.append(Article(title, href, "The Hindu"))
                         seen_titles.add(title)
-            time.sleep(1)
-        print(f"scrape_the_hindu_sports: {len(articles)} articles")
-        return articles
+            return articles
+
+        # Pages 1 to 6
+        page_urls = [f"https://www.thehindu.com/sport/other-sports/?page={page_num}" for page_num in range(1, 7)]
+        return paginate(session, page_urls, parse_page, "scrape_the_hindu_sports")
     except Exception as e:
         return []
 
 def scrape_times_of_india_sports():
-    print("TOI Sports Scraper CALLED")
+    logger.debug("TOI Sports Scraper CALLED")
     try:
-        session = requests.Session()
+        session = NewsSession()
         session.headers.update({"User-Agent": "Mozilla/5.0"})
         url = "https://timesofindia.indiatimes.com/sports"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         MAX_ARTICLES = 50
 
         main_divs = soup.select('div.vertical_12.w_1.left_spacing.right_spacing.bottom_v_spacing.b_brdr.brdr_2')
-        print("Found", len(main_divs), "main divs")
+        logger.debug("Found %s main divs", len(main_divs))
         for main_div in main_divs:
             for in5cr in main_div.select('div.iN5CR'):
                 a_tag = in5cr.find('a', class_='lfn2e', href=True)
@@ -186,16 +186,16 @@ def scrape_times_of_india_sports():
                         if title and title not in seen_titles and href:
                             if href.startswith('/'):
                                 href = "https://timesofindia.indiatimes.com" + href
-                            articles.append({"title": title, "url": href, "source": "Times of India"})
+                            articles.append(Article(title, href, "Times of India"))
                             seen_titles.add(title)
                             if len(articles) >= MAX_ARTICLES:
-                                print("Reached max articles in Structure 1")
-                                print(f"scrape_times_of_india_sports: {len(articles)} articles")
+                                logger.debug("Reached max articles in Structure 1")
+                                logger.debug("scrape_times_of_india_sports: %s articles", len(articles))
                                 return articles
-        print("Checked Structure 1")
+        logger.debug("Checked Structure 1")
 
         in5cr_divs = soup.select('div.iN5CR')
-        print("Found", len(in5cr_divs), "iN5CR divs")
+        logger.debug("Found %s iN5CR divs", len(in5cr_divs))
         for in5cr in in5cr_divs:
             a_tag = in5cr.find('a', class_='lfn2e', href=True)
             if a_tag:
@@ -206,17 +206,17 @@ def scrape_times_of_india_sports():
                     if title and title not in seen_titles and href:
                         if href.startswith('/'):
                             href = "https://timesofindia.indiatimes.com" + href
-                        articles.append({"title": title, "url": href, "source": "Times of India"})
+                        articles.append(Article(title, href, "Times of India"))
                         seen_titles.add(title)
                         if len(articles) >= MAX_ARTICLES:
-                            print("Reached max articles in Structure 2")
-                            print(f"scrape_times_of_india_sports: {len(articles)} articles")
+                            logger.debug("Reached max articles in Structure 2")
+                            logger.debug("scrape_times_of_india_sports: %s articles", len(articles))
                             return articles
-        print("Checked Structure 2")
-        print(f"scrape_times_of_india_sports: {len(articles)} articles")
+        logger.debug("Checked Structure 2")
+        logger.debug("scrape_times_of_india_sports: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Times of India Sports: {e}")
+        logger.warning("Error scraping Times of India Sports: %s", e)
         return []
 
 
@@ -228,20 +228,20 @@ def scrape_espn():
         session = get_session()
         url = "https://www.espn.com/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
         for tag in soup.select("section.headlineStack li a"):
-            title = clean_title(tag.text)
+            title = clean_text(tag.text)
             href = tag.get("href", "")
             if not href.startswith("http"):
                 href = "https://www.espn.com" + href
 
             if title and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "ESPN"})
+                articles.append(Article(title, href, "ESPN"))
                 seen_titles.add(title)
-        print(f"scrape_espn: {len(articles)} articles")
+        logger.debug("scrape_espn: %s articles", len(articles))
         return articles
     except Exception as e:
         return []
@@ -251,18 +251,18 @@ def scrape_guardian_sports():
         session = get_session()
         url = "https://www.theguardian.com/sport"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
         for tag in soup.select("a[aria-label]"):
-            title = clean_title(tag.get("aria-label"))
+            title = clean_text(tag.get("aria-label"))
             href = tag.get("href", "")
 
             if title and href and "/202" in href and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "The Guardian"})
+                articles.append(Article(title, href, "The Guardian"))
                 seen_titles.add(title)
-        print(f"scrape_guardian_sports: {len(articles)} articles")     
+        logger.debug("scrape_guardian_sports: %s articles", len(articles))     
         return articles
     except Exception as e:
         return []
@@ -272,7 +272,7 @@ def scrape_bbc_sport():
         session = get_session()
         url = "https://www.bbc.com/sport"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
@@ -282,23 +282,23 @@ def scrape_bbc_sport():
                 # Headline is inside <span aria-hidden="false"> if present
                 headline_tag = a_tag.find("span", attrs={"aria-hidden": "false"})
                 if headline_tag:
-                    title = clean_title(headline_tag.get_text())
+                    title = clean_text(headline_tag.get_text())
                 else:
-                    title = clean_title(a_tag.get_text())
+                    title = clean_text(a_tag.get_text())
                 href = a_tag["href"]
                 if href.startswith("/"):
                     href = "https://www.bbc.com" + href
                 if title and href and title not in seen_titles:
-                    articles.append({"title": title, "url": href, "source": "BBC Sport"})
+                    articles.append(Article(title, href, "BBC Sport"))
                     seen_titles.add(title)
-        print(f"scrape_bbc_sport: {len(articles)} articles")
+        logger.debug("scrape_bbc_sport: %s articles", len(articles))
         return articles
     except Exception as e:
         return []
 
 
 # Controller function
-def scrape_sports_news(region="India", sources=None):
+def scrape_sports_news(region="India", sources=None, exclude=()):
     all_articles = []
 
     india_source_map = {
@@ -318,11 +318,13 @@ def scrape_sports_news(region="India", sources=None):
     if sources is None:
         sources = list(source_map.keys())
 
+    sources = [src for src in sources if src not in exclude]
+
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                result = func()
+                result = run_source("sports", region, src, func)
                 all_articles.extend(result)
             except Exception as e:
                 pass
@@ -0,0 +1,261 @@
+"""
+Stored digest subscriptions: an address, the digest it wants (category, region,
+sources, top_n) and a schedule. The scheduler claims the ones that are due and
+sends each distinct digest once to all of its subscribers.
+
+Schedules, all in UTC:
+    "hourly", "daily", "weekly", "every 30m", "every 6h", "every 2d"
+    "daily at 07:30", "weekly on mon at 07:30"
+Anchored schedules ("at", "on") run at the next matching time; the others run as
+soon as the scheduler next looks, then once per period. Runs missed while nothing
+was running are skipped, not replayed.
+
+A new subscription, or a change to an existing one's top_n or schedule, is pending
+until the address follows the confirmation link mailed to it; only confirmed
+subscriptions are ever claimed.
+"""
+import json
+import logging
+import math
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Empty disables subscriptions
+SUBSCRIPTIONS_PATH = os.getenv("SUBSCRIPTIONS_PATH", os.path.join("data", "subscriptions.sqlite3"))
+# Where recipients reach the app; confirmation and unsubscribe links in emails start with it
+PUBLIC_URL = os.getenv("PUBLIC_URL", "http://localhost:5000").rstrip("/")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    category TEXT NOT NULL,
+    region TEXT NOT NULL,
+    -- JSON array, sorted, so identical selections compare equal
+    sources TEXT NOT NULL,
+    top_n INTEGER NOT NULL,
+    schedule TEXT NOT NULL,
+    next_run REAL NOT NULL,
+    last_run REAL,
+    last_status TEXT,
+    -- Unsubscribe links carry this rather than the guessable id
+    token TEXT NOT NULL UNIQUE,
+    -- Set while the subscription waits for its address to confirm it, NULL once confirmed
+    confirm_token TEXT UNIQUE,
+    created REAL NOT NULL,
+    UNIQUE (email, category, region, sources)
+);
+CREATE INDEX IF NOT EXISTS subscriptions_due ON subscriptions (next_run);
+"""
+
+_SUBSCRIBE = """
+INSERT INTO subscriptions (email, category, region, sources, top_n, schedule, next_run, token, confirm_token, created)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (email, category, region, sources) DO UPDATE SET
+    top_n = excluded.top_n,
+    schedule = excluded.schedule,
+    -- Resubmitting the same settings changes nothing; new ones need confirming again
+    next_run = CASE
+        WHEN top_n = excluded.top_n AND schedule = excluded.schedule THEN next_run
+        ELSE excluded.next_run
+    END,
+    confirm_token = CASE
+        WHEN top_n = excluded.top_n AND schedule = excluded.schedule THEN confirm_token
+        ELSE coalesce(confirm_token, excluded.confirm_token)
+    END
+RETURNING id, token, confirm_token, next_run
+"""
+_FIELDS = ("id", "email", "category", "region", "sources", "top_n", "schedule", "next_run", "last_run", "last_status", "confirmed")
+_COLUMNS = ", ".join(_FIELDS[:-1]) + ", confirm_token IS NULL"
+
+_MINUTE, _HOUR, _DAY = 60, 3600, 86400
+_UNITS = {"m": _MINUTE, "h": _HOUR, "d": _DAY}
+_WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+# 1970-01-05, the first Monday after the epoch: weekly anchors count from it
+_FIRST_MONDAY = 4 * _DAY
+_SCHEDULE_RE = re.compile(
+    r"^(?:(?P<named>hourly|daily|weekly)|every\s+(?P<count>\d+)\s*(?P<unit>[mhd]))"
+    r"(?:\s+on\s+(?P<weekday>[a-z]{3})[a-z]*)?"
+    r"(?:\s+at\s+(?P<hour>\d{1,2}):(?P<minute>\d{2}))?$"
+)
+
+
+class Schedule:
+    """A period and, for anchored schedules, the offset from the epoch its runs line up on."""
+
+    def __init__(self, text, period, anchor=None):
+        self.text = text
+        self.period = period
+        self.anchor = anchor
+
+    @classmethod
+    def parse(cls, text):
+        """Raises ValueError for anything that isn't one of the forms in the module docstring."""
+        text = " ".join((text or "").lower().split())
+        match = _SCHEDULE_RE.match(text)
+        if not match:
+            raise ValueError(f"Unrecognised schedule: {text!r}")
+        named, weekday, hour = match.group("named"), match.group("weekday"), match.group("hour")
+        if named:
+            period = {"hourly": _HOUR, "daily": _DAY, "weekly": 7 * _DAY}[named]
+        else:
+            period = int(match.group("count")) * _UNITS[match.group("unit")]
+            if period < _MINUTE * 5:
+                raise ValueError("Schedules must be at least 5 minutes apart")
+        if weekday and named != "weekly":
+            raise ValueError("Only weekly schedules take a weekday")
+        if hour and period not in (_DAY, 7 * _DAY):
+            raise ValueError("Only daily and weekly schedules take a time of day")
+        if not weekday and not hour:
+            return cls(text, period)
+        anchor = int(hour or 0) * _HOUR + int(match.group("minute") or 0) * _MINUTE
+        if not 0 <= anchor < _DAY or int(match.group("minute") or 0) >= 60:
+            raise ValueError(f"Invalid time of day in schedule: {text!r}")
+        if period == 7 * _DAY:
+            if weekday and weekday not in _WEEKDAYS:
+                raise ValueError(f"Unrecognised weekday in schedule: {text!r}")
+            anchor += _FIRST_MONDAY + _WEEKDAYS.index(weekday or "mon") * _DAY
+        return cls(text, period, anchor)
+
+    def first_run(self, now):
+        return now if self.anchor is None else self._next_anchored(now - 1)
+
+    def next_run(self, previous, now):
+        """When to run after the run due at previous, skipping any that have already passed by now."""
+        if self.anchor is not None:
+            return self._next_anchored(now)
+        following = previous + self.period
+        return following if following > now else now + self.period
+
+    def _next_anchored(self, after):
+        following = self.anchor + math.ceil((after - self.anchor) / self.period) * self.period
+        return following if following > after else following + self.period
+
+
+def _subscription(row, fields=_FIELDS):
+    subscription = dict(zip(fields, row))
+    subscription["sources"] = json.loads(subscription["sources"])
+    subscription["confirmed"] = bool(subscription["confirmed"])
+    return subscription
+
+
+def unsubscribe_url(token):
+    return f"{PUBLIC_URL}/unsubscribe/{token}"
+
+
+def confirm_url(confirm_token):
+    return f"{PUBLIC_URL}/subscriptions/confirm/{confirm_token}"
+
+
+class SubscriptionStore:
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        """This thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def subscribe(self, email, category, region, sources, top_n, schedule, now=None):
+        """
+        Adds a subscription, or updates top_n and schedule of the address's existing one
+        for the same digest. Returns {id, token, confirm_token, next_run}, confirm_token
+        being None if the subscription is already confirmed as it now stands. Raises ValueError for a
+        missing category or region or a bad schedule.
+        """
+        if not category or not region:
+            raise ValueError("Please choose a category and a region")
+        now = time.time() if now is None else now
+        parsed = Schedule.parse(schedule)
+        row = self.connection().execute(_SUBSCRIBE, (
+            email.strip().lower(),
+            category,
+            region,
+            json.dumps(sorted(set(sources or ()))),
+            int(top_n),
+            parsed.text,
+            parsed.first_run(now),
+            secrets.token_urlsafe(16),
+            secrets.token_urlsafe(16),
+            now,
+        )).fetchone()
+        return {"id": row[0], "token": row[1], "confirm_token": row[2], "next_run": row[3]}
+
+    def confirm(self, confirm_token):
+        """True if confirm_token belonged to a pending subscription, which is now confirmed."""
+        return self.connection().execute(
+            "UPDATE subscriptions SET confirm_token = NULL WHERE confirm_token = ?", (confirm_token,)
+        ).rowcount > 0
+
+    def unsubscribe(self, token):
+        """True if token belonged to a subscription, which is now gone."""
+        return self.connection().execute("DELETE FROM subscriptions WHERE token = ?", (token,)).rowcount > 0
+
+    def subscriptions(self, email=None):
+        sql = f"SELECT {_COLUMNS} FROM subscriptions"
+        params = ()
+        if email:
+            sql += " WHERE email = ?"
+            params = (email.strip().lower(),)
+        return [_subscription(row) for row in self.connection().execute(sql + " ORDER BY id", params)]
+
+    def claim_due(self, now=None):
+        """
+        Confirmed subscriptions due by now, with their unsubscribe tokens and with
+        next_run already moved past them in the same transaction, so schedulers in
+        several processes never claim one twice.
+        """
+        now = time.time() if now is None else now
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            due = [_subscription(row, _FIELDS + ("token",)) for row in conn.execute(
+                f"SELECT {_COLUMNS}, token FROM subscriptions"
+                " WHERE next_run <= ? AND confirm_token IS NULL ORDER BY next_run",
+                (now,),
+            )]
+            updates = [
+                (Schedule.parse(subscription["schedule"]).next_run(subscription["next_run"], now), subscription["id"])
+                for subscription in due
+            ]
+            conn.executemany("UPDATE subscriptions SET next_run = ? WHERE id = ?", updates)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return due
+
+    def record_run(self, ids, status, ran_at=None):
+        ran_at = time.time() if ran_at is None else ran_at
+        self.connection().executemany(
+            "UPDATE subscriptions SET last_run = ?, last_status = ? WHERE id = ?", [(ran_at, status, i) for i in ids]
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_subscriptions():
+    """The process-wide subscription store, or None when SUBSCRIPTIONS_PATH is empty."""
+    global _store
+    if _store is None and SUBSCRIPTIONS_PATH:
+        with _store_lock:
+            if _store is None:
+                _store = SubscriptionStore(SUBSCRIPTIONS_PATH)
+    return _store
@@ -1,23 +1,24 @@
-import requests
-from bs4 import BeautifulSoup, Tag
-from time import sleep
+import logging
+from article_record import Article
+from http_client import NewsSession, parse_html
+from bs4 import Tag
 from typing import cast
+from urllib.parse import urlencode
+from pagination import paginate
+from source_runner import run_source
+from keywords import KeywordMatcher
+from news_sources import TIMES_OF_INDIA_ONLY_MAX_ARTICLES, times_of_india_cap
+from text_normalization import clean_text
 
-
-def clean_text(text):
-    return ' '.join(text.strip().split())
+logger = logging.getLogger(__name__)
 
 
 def get_session():
-    session = requests.Session()
+    session = NewsSession()
     session.headers.update({"User-Agent": "Mozilla/5.0"})
     return session
 
 
-def clean_title(text):
-    return clean_text(text.replace("\n", " ").replace("\xa0", " "))
-
-
 def ensure_absolute(url: str) -> str:
     if url.startswith(('http://', 'https://')):
         return url
@@ -31,30 +32,27 @@ technology_keywords = [
     "internet", "app", "programming", "coding", "developer", "python", "javascript",
     "meta", "google", "microsoft", "apple", "openai", "chatgpt", "elon", "tesla", "neuralink"
 ]
+technology_matcher = KeywordMatcher(technology_keywords)
 
 
 # --- INDIA SOURCES ---
 
-def scrape_times_of_india_tech(sources=None):
+def scrape_times_of_india_tech(max_articles=30):
     try:
         session = get_session()
         url = "https://timesofindia.indiatimes.com/technology"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
-        # Determine max articles
-        if sources and isinstance(sources, list) and len(sources) == 1 and sources[0] == "times_of_india":
-            MAX_ARTICLES = 60
-        else:
-            MAX_ARTICLES = 30
+        MAX_ARTICLES = max_articles
 
         # Structure 1: div.lSIdy.col_l_6.col_m_6 with multiple a.linktype1 links
         for div in soup.select('div.lSIdy.col_l_6.col_m_6'):
             for a_tag in div.find_all('a', class_='linktype1', href=True):
                 span_tag = a_tag.find('span')
                 if span_tag:
-                    title = clean_title(span_tag.get_text())
+                    title = clean_text(span_tag.get_text())
                     href = a_tag.get('href', '')
 
                     if title and title not in seen_titles and href:
@@ -66,22 +64,22 @@ def scrape_times_of_india_tech(sources=None):
                         elif not href.startswith('http'):
                             continue
 
-                        articles.append({"title": title, "url": href, "source": "Times of India"})
+                        articles.append(Article(title, href, "Times of India"))
                         seen_titles.add(title)
                         if len(articles) >= MAX_ARTICLES:
-                            print(f"scrape_times_of_india_tech: {len(articles)} articles (limit reached)")
+                            logger.debug("scrape_times_of_india_tech: %s articles (limit reached)", len(articles))
                             return articles
 
         # Structure 2: div.GLeza with h5 title
         for div in soup.select('div.GLeza'):
             if len(articles) >= MAX_ARTICLES:
-                print(f"scrape_times_of_india_tech: {len(articles)} articles (limit reached)")
+                logger.debug("scrape_times_of_india_tech: %s articles (limit reached)", len(articles))
                 return articles
             a_tag = div.find('a', href=True)
             if a_tag:
                 h5_tag = a_tag.find('h5')
                 if h5_tag:
-                    title = clean_title(h5_tag.get_text())
+                    title = clean_text(h5_tag.get_text())
                     href = a_tag.get('href', '')
 
                     if title and title not in seen_titles and href:
@@ -93,17 +91,17 @@ def scrape_times_of_india_tech(sources=None):
                         elif not href.startswith('http'):
                             continue
 
-                        articles.append({"title": title, "url": href, "source": "Times of India"})
+                        articles.append(Article(title, href, "Times of India"))
                         seen_titles.add(title)
                         if len(articles) >= MAX_ARTICLES:
-                            print(f"scrape_times_of_india_tech: {len(articles)} articles (limit reached)")
+                            logger.debug("scrape_times_of_india_tech: %s articles (limit reached)", len(articles))
                             return articles
 
-        print(f"scrape_times_of_india_tech: {len(articles)} articles")
+        logger.debug("scrape_times_of_india_tech: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error scraping Times of India Technology: {e}")
+        logger.warning("Error scraping Times of India Technology: %s", e)
         return []
 
 
@@ -116,16 +114,16 @@ def scrape_hindustan_times_tech():
                           "Chrome/114.0.0.0 Safari/537.36"
         }
 
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = parse_html(response)
 
         articles = []
         seen_titles = set()
 
         divs = soup.select('div.cartHolder')
-        print(f"Found {len(divs)} article blocks")
+        logger.debug("Found %s article blocks", len(divs))
 
         for div in divs:
             if not isinstance(div, Tag):
@@ -141,7 +139,7 @@ def scrape_hindustan_times_tech():
             if not isinstance(title, str) or not title:
                 continue
 
-            if not any(kw in title.lower() for kw in technology_keywords):
+            if not technology_matcher.matches(title):
                 continue
 
             if title not in seen_titles:
@@ -149,25 +147,21 @@ def scrape_hindustan_times_tech():
                     href = "https://www.hindustantimes.com" + href
                 elif not isinstance(href, str):
                     continue
-                articles.append({
-                    "title": title,
-                    "url": href,
-                    "source": "Hindustan Times"
-                })
+                articles.append(Article(title, href, "Hindustan Times"))
                 seen_titles.add(title)
-        print(f"scrape_hindustan_times_tech: {len(articles)} articles")
+        logger.debug("scrape_hindustan_times_tech: %s articles", len(articles))
         return articles
 
     except Exception as e:
-        print(f"Error: {e}")
+        logger.warning("Error: %s", e)
         return []
 
 def scrape_financial_express_tech():
     url = "https://www.financialexpress.com/about/technology-news/"
     headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, "html.parser")
+        response = get_session().get(url, headers=headers, timeout=10)
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         for article in soup.find_all("article"):
@@ -182,12 +176,12 @@ def scrape_financial_express_tech():
             if not title or not isinstance(href, str):
                 continue
             if title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "Financial Express"})
+                articles.append(Article(title, href, "Financial Express"))
                 seen_titles.add(title)
-        print(f"scrape_financial_express_tech: {len(articles)} articles")
+        logger.debug("scrape_financial_express_tech: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Financial Express: {e}")
+        logger.warning("Error scraping Financial Express: %s", e)
         return []
 
 
@@ -196,27 +190,27 @@ def scrape_indian_express_tech():
         session = get_session()
         url = "https://indianexpress.com/section/technology/"
         response = session.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         for tag in soup.select('h3 a, h2 a'):
             if not isinstance(tag, Tag):
                 continue
-            title = clean_title(tag.get_text())
+            title = clean_text(tag.get_text())
             href = tag.get("href")
             if not isinstance(href, str):
                 continue
-            if not any(kw in title.lower() for kw in technology_keywords):
+            if not technology_matcher.matches(title):
                 continue
             if title and title not in seen_titles:
                 if href.startswith('/'):
                     href = "https://indianexpress.com" + href
-                articles.append({"title": title, "url": href, "source": "Indian Express"})
+                articles.append(Article(title, href, "Indian Express"))
                 seen_titles.add(title)
-        print(f"scrape_indian_express_tech: {len(articles)} articles")
+        logger.debug("scrape_indian_express_tech: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Indian Express: {e}")
+        logger.warning("Error scraping Indian Express: %s", e)
         return []
 
 
@@ -224,48 +218,38 @@ def scrape_indian_express_tech():
 def scrape_guardian_tech():
     try:
         url = "https://www.theguardian.com/technology"
-        response = requests.get(url, timeout=15)
-        soup = BeautifulSoup(response.content, "html.parser")
+        response = get_session().get(url, timeout=15)
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
 
         for tag in soup.select('a[aria-label]'):
             if not isinstance(tag, Tag):
                 continue
-            title = clean_title(tag.get('aria-label') or '')
+            title = clean_text(tag.get('aria-label') or '')
             href = tag.get('href')
             if not title or not isinstance(href, str):
                 continue
             if href.startswith('/'):
                 href = "https://www.theguardian.com" + href
-            if not any(kw in title.lower() for kw in technology_keywords):
+            if not technology_matcher.matches(title):
                 continue
             if '/202' in href and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "The Guardian"})
+                articles.append(Article(title, href, "The Guardian"))
                 seen_titles.add(title)
-        print(f"scrape_guardian_tech: {len(articles)} articles")
+        logger.debug("scrape_guardian_tech: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping Guardian Tech: {e}")
+        logger.warning("Error scraping Guardian Tech: %s", e)
         return []
 
 
-def scrape_euronews(query="technology", max_pages=1, delay=0.5):
+def scrape_euronews(query="technology", max_pages=1):
     base_url = "https://www.euronews.com/search"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    articles = []
-
-    for page in range(1, max_pages + 1):
-        print(f"🔎 Scraping page {page}...")
-        params = {"query": query, "p": page}
-        try:
-            res = requests.get(base_url, headers=headers, params=params, timeout=15)
-            res.raise_for_status()
-        except Exception as exc:
-            print(f"❌ Request failed on page {page}: {exc}")
-            break
 
-        soup = BeautifulSoup(res.text, "html.parser")
+    def parse_page(res):
+        articles = []
+        soup = parse_html(res)
         for a in soup.select("article a.the-media-object__link"):
             if not isinstance(a, Tag):
                 continue
@@ -274,19 +258,20 @@ def scrape_euronews(query="technology", max_pages=1, delay=0.5):
             if isinstance(url, str) and title:
                 if not url.startswith("http"):
                     url = "https://www.euronews.com" + url
-                articles.append({"title": title, "url": url, "source": "Euronews"})
-        sleep(delay)
-    print(f"scrape_euronews: {len(articles)} articles")
-    return articles
+                articles.append(Article(title, url, "Euronews"))
+        return articles
+
+    page_urls = [f"{base_url}?{urlencode({'query': query, 'p': page})}" for page in range(1, max_pages + 1)]
+    return paginate(get_session(), page_urls, parse_page, "scrape_euronews")
 
 
 def scrape_cnbc_tech():
     url = "https://www.cnbc.com/technology/"
     headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = parse_html(response)
         articles = []
         seen_titles = set()
         cards = soup.find_all("div", attrs={"data-test": "Card"})
@@ -299,12 +284,12 @@ def scrape_cnbc_tech():
             title = clean_text(title_tag.text)
             href = title_tag.get("href")
             if title and isinstance(href, str) and title not in seen_titles:
-                articles.append({"title": title, "url": href, "source": "CNBC"})
+                articles.append(Article(title, href, "CNBC"))
                 seen_titles.add(title)
-        print(f"scrape_cnbc_tech: {len(articles)} articles")
+        logger.debug("scrape_cnbc_tech: %s articles", len(articles))
         return articles
     except Exception as e:
-        print(f"Error scraping CNBC: {e}")
+        logger.warning("Error scraping CNBC: %s", e)
         return []
 
 
@@ -313,7 +298,7 @@ def scrape_cnbc_tech():
 # --- WRAPPER FUNCTIONS ---
 def scrape_india_tech_news():
     all_articles = []
-    print("\n--- Scraping India Technology News ---")
+    logger.info("Scraping India Technology News")
     for src_func in [
         scrape_hindustan_times_tech,
         scrape_financial_express_tech,
@@ -322,31 +307,31 @@ def scrape_india_tech_news():
         try:
             src_articles = src_func()
             if src_articles:
-                print(f"Fetched {len(src_articles)} from {src_articles[0]['source']}")
+                logger.debug("Fetched %s from %s", len(src_articles), src_articles[0]['source'])
             all_articles.extend(src_articles)
         except Exception as e:
-            print(f"Error during Indian scraping: {e}")
+            logger.warning("Error during Indian scraping: %s", e)
     return all_articles
 
 
 def scrape_global_tech_news():
     all_articles = []
-    print("\n--- Scraping Global Technology News ---")
+    logger.info("Scraping Global Technology News")
     for src_func in [scrape_guardian_tech, scrape_euronews, scrape_cnbc_tech]:
         try:
             src_articles = src_func()
             if src_articles:
-                print(f"Fetched {len(src_articles)} from {src_articles[0]['source']}")
+                logger.debug("Fetched %s from %s", len(src_articles), src_articles[0]['source'])
             all_articles.extend(src_articles)
         except Exception as e:
-            print(f"Error during Global scraping: {e}")
+            logger.warning("Error during Global scraping: %s", e)
     return all_articles
 
 
-def scrape_technology_news(region="India", sources=None):
+def scrape_technology_news(region="India", sources=None, exclude=()):
     india_source_map = {
         "hindustan_times": scrape_hindustan_times_tech,
-        "times_of_india": lambda: scrape_times_of_india_tech(sources),
+        "times_of_india": lambda: scrape_times_of_india_tech(TIMES_OF_INDIA_ONLY_MAX_ARTICLES),
         "financial_express": scrape_financial_express_tech,
         "indian_express": scrape_indian_express_tech,
     }
@@ -359,15 +344,19 @@ def scrape_technology_news(region="India", sources=None):
     if sources is None:
         sources = list(source_map.keys())
     all_articles = []
+    sources = [src for src in sources if src not in exclude]
+
     for src in sources:
         func = source_map.get(src)
         if func:
             try:
-                src_articles = func()
-                print(f"Technology News ({region} - {src}): {len(src_articles)} articles")
+                src_articles = run_source("tech", region, src, func)
+                if src == "times_of_india":
+                    src_articles = src_articles[:times_of_india_cap(sources, 30)]
+                logger.info("Technology News (%s - %s): %s articles", region, src, len(src_articles))
                 all_articles.extend(src_articles)
             except Exception as e:
-                print(f"Error in scrape_technology_news for source {src}: {e}")
+                logger.warning("Error in scrape_technology_news for source %s: %s", src, e)
     return all_articles
 
 
@@ -0,0 +1,22 @@
+import crawl
+from article_record import Article
+
+
+def test_story_on_two_section_pages_belongs_to_both(monkeypatch):
+    pages = [("https://example.com/", None), ("https://example.com/sports", "sports"), ("https://example.com/business", "business_and_finance")]
+    monkeypatch.setitem(crawl.OUTLETS, "example", ("Example", "India", "example.com", pages))
+
+    def crawl_page(session, outlet, url, section):
+        if section is None:
+            return []
+        return [
+            Article("Cricket board signs record broadcast deal", "https://example.com/story", "Example", categories={section}),
+            Article(f"Only on the {section} page today", f"https://example.com/{section}-only", "Example", categories={section}),
+        ]
+
+    monkeypatch.setattr(crawl, "_crawl_page", crawl_page)
+    articles = {article.url: article for article in crawl._crawl_outlet("example")}
+
+    assert articles["https://example.com/story"]["categories"] == {"sports", "business_and_finance"}
+    assert articles["https://example.com/sports-only"]["categories"] == {"sports"}
+    assert articles["https://example.com/business_and_finance-only"]["categories"] == {"business_and_finance"}
@@ -0,0 +1,108 @@
+"""
+Title and text normalization shared by every scraper and the emailer.
+
+The tables and patterns are compiled once at import. clean_titles() handles a
+whole batch with one pass of each over the joined text instead of one per title.
+"""
+import bisect
+import re
+import unicodedata
+from itertools import accumulate
+
+MIN_TITLE_LENGTH = 10
+MAX_TITLE_LENGTH = 200
+
+# Navigation items and ads that scrapers pick up alongside headlines
+SKIP_WORDS = ("subscribe", "login", "register", "advertisement", "menu", "search", "newsletter")
+
+# Matched against lower-cased text: cheaper than re.IGNORECASE
+_SKIP_WORDS_RE = re.compile("|".join(map(re.escape, SKIP_WORDS)))
+# ASCII bytes that aren't letters or digits. Encoding a lower-cased title with errors="ignore"
+# drops everything non-ASCII, and bytes.translate deletes these: together the same result as
+# an [^a-z0-9] substitution, several times faster
+_TITLE_KEY_DELETE = bytes(code for code in range(128) if not chr(code).isalnum())
+
+# Typographic punctuation with a sensible ASCII spelling; NFKD would otherwise drop it.
+# A character class plus lookup beats str.translate, which has no fast path for non-ASCII text.
+_ASCII_PUNCTUATION = {
+    "“": '"',    # left double quotation mark
+    "”": '"',    # right double quotation mark
+    "‘": "'",    # left single quotation mark
+    "’": "'",    # right single quotation mark
+    "—": "-",    # em dash
+    "–": "-",    # en dash
+    "…": "...",  # horizontal ellipsis
+    " ": " ",    # non-breaking space
+    "′": "'",    # prime
+    "″": '"',    # double prime
+}
+_ASCII_PUNCTUATION_RE = re.compile("[" + "".join(_ASCII_PUNCTUATION) + "]")
+
+# Joins a batch; survives NFKD and ASCII encoding, and str.split() treats it as
+# whitespace, so no whitespace-collapsed title can contain it
+_BATCH_SEPARATOR = "\x1f"
+
+
+def _ascii_punctuation(match):
+    return _ASCII_PUNCTUATION[match.group()]
+
+
+def clean_text(text):
+    """Collapses runs of whitespace (newlines and NBSP included) to single spaces; None becomes ""."""
+    if not text:
+        return ""
+    return " ".join(str(text).split())
+
+
+def fold_ascii(text):
+    """Typographic punctuation to ASCII, then accents stripped and anything else non-ASCII dropped."""
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", _ASCII_PUNCTUATION_RE.sub(_ascii_punctuation, text))
+    return text.encode("ascii", "ignore").decode("ascii")
+
+
+def clean_title(title, ascii_only=False, min_length=MIN_TITLE_LENGTH, max_length=MAX_TITLE_LENGTH):
+    """
+    Whitespace-collapsed headline, or None for empty, too short or too long titles
+    and navigation/ad text. ascii_only folds it to ASCII first (for email subjects and bodies).
+    """
+    if not title:
+        return None
+    if ascii_only:
+        title = fold_ascii(title)
+    title = " ".join(title.split())
+    if not min_length <= len(title) <= max_length or _SKIP_WORDS_RE.search(title.lower()):
+        return None
+    return title
+
+
+def clean_titles(titles, ascii_only=False, min_length=MIN_TITLE_LENGTH, max_length=MAX_TITLE_LENGTH):
+    """clean_title() over a list, returned in the same order with None for rejected titles."""
+    titles = [title or "" for title in titles]
+    if ascii_only:
+        folded = fold_ascii(_BATCH_SEPARATOR.join(titles)).split(_BATCH_SEPARATOR)
+        # A title carrying the separator itself would shift the rest of the batch
+        titles = folded if len(folded) == len(titles) else [fold_ascii(title) for title in titles]
+    cleaned = [" ".join(title.split()) for title in titles]
+    # One skip-word scan over the whole batch; lower-cased per title so offsets line up
+    lowered = [title.lower() for title in cleaned]
+    ends = list(accumulate(len(title) + 1 for title in lowered))
+    skipped = {
+        bisect.bisect_right(ends, match.start())
+        for match in _SKIP_WORDS_RE.finditer(_BATCH_SEPARATOR.join(lowered))
+    }
+    return [
+        title if min_length <= len(title) <= max_length and index not in skipped else None
+        for index, title in enumerate(cleaned)
+    ]
+
+
+def canonical_url(url):
+    """Lower-cased URL without query string or fragment, for duplicate detection."""
+    return url.split("?", 1)[0].split("#", 1)[0].lower()
+
+
+def title_key(title, length=60):
+    """Letters and digits of the lower-cased title, truncated, for near-duplicate detection."""
+    return title.lower().encode("ascii", "ignore").translate(None, _TITLE_KEY_DELETE).decode("ascii")[:length]